@@ -32,9 +32,9 @@ class DashboardFrontendView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         if self.request.user.is_authenticated:
-            from apps.orders.models import Order
             from apps.orders.models import Address
-            context['orders_count'] = Order.objects.filter(user=self.request.user).count()
+            from apps.orders.services import OrderHistory
+            context['orders_count'] = OrderHistory.count_for_user(self.request.user)
             context['addresses_count'] = Address.objects.filter(user=self.request.user).count()
         else:
             context['orders_count'] = 0
@@ -8,8 +8,11 @@ revoked via the Redis-based blacklist. This ensures that:
 3. Compromised tokens can be revoked immediately
 """
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
 from .token_blacklist import TokenBlacklist
+from .user_cache import UserCache
+from apps.core import request_context
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,8 +24,8 @@ class BlacklistCheckingJWTAuthentication(JWTAuthentication):
     
     On every authenticated request:
     1. Validates token signature and expiry (parent class)
-    2. Checks if JTI is in Redis blacklist
-    3. Rejects if blacklisted
+    2. Checks if JTI is revoked (local Bloom filter, Redis only on a positive)
+    3. Rejects tokens issued before the user's tokens_valid_after epoch
     """
     
     def authenticate(self, request):
@@ -46,8 +49,47 @@ class BlacklistCheckingJWTAuthentication(JWTAuthentication):
         if raw_token is None:
             return None
 
-        validated_token = self.get_validated_token(raw_token)
-        return self.get_user(validated_token), validated_token
+        return self.authenticate_token(getattr(request, '_request', request), raw_token)
+
+    def authenticate_token(self, http_request, raw_token):
+        """
+        Validate `raw_token` once per request. The (user, token) pair, or the
+        failure, is memoized on the Django request so JWTCookieMiddleware and
+        DRF authentication share one validation and one user lookup.
+        """
+        memo = http_request.__dict__.setdefault('_jwt_auth_memo', {})
+        key = raw_token.decode() if isinstance(raw_token, bytes) else raw_token
+        if key not in memo:
+            try:
+                validated_token = self.get_validated_token(raw_token)
+                memo[key] = (self.get_user(validated_token), validated_token)
+            except (InvalidToken, AuthenticationFailed) as e:
+                memo[key] = e
+
+        result = memo[key]
+        if isinstance(result, Exception):
+            raise result
+        request_context.update(user_id=str(result[0].pk))
+        return result
+
+    def get_user(self, validated_token):
+        """
+        Resolve the token's user from the cached snapshot (see UserCache)
+        instead of querying on every request.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        user = UserCache.get_user(user_id)
+        if user is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        if TokenBlacklist.issued_before_revocation(validated_token, user):
+            raise InvalidToken('Token has been revoked')
+        return user
 
     def get_validated_token(self, raw_token):
         """
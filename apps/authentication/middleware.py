@@ -1,49 +1,74 @@
-
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from .jwt_backend import BlacklistCheckingJWTAuthentication
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.utils.functional import SimpleLazyObject
-from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def _skip_prefixes():
+    """Path prefixes that never read request.user, so the cookie is not even looked at"""
+    prefixes = ['/admin', '/api/v1/admin', '/health', '/favicon.ico']
+    for url in (settings.STATIC_URL, settings.MEDIA_URL):
+        if url:
+            prefixes.append('/' + url.lstrip('/'))
+    prefixes.extend(getattr(settings, 'JWT_COOKIE_SKIP_PATHS', ()))
+    return tuple(prefixes)
+
+
 class JWTCookieMiddleware:
     """
     Middleware to populate request.user from 'access_token' cookie
     if the request is NOT for the Admin panel.
-    
+
     This ensures Template Views (like Customer Dashboard) see the Customer user,
     even if an Admin Session exists (Isolation).
+
+    The cookie is validated lazily, on first access to request.user, through
+    BlacklistCheckingJWTAuthentication (revocation included). The result is
+    memoized on the request, so DRF views reuse it instead of validating
+    again, and requests that never read request.user pay nothing.
     """
     def __init__(self, get_response):
         self.get_response = get_response
+        self.skip_prefixes = _skip_prefixes()
+        self.authenticator = BlacklistCheckingJWTAuthentication()
 
     def __call__(self, request):
-        # Admin Isolation: If accessing Admin Panel OR Admin API, skip JWT logic (Let Session rule)
-        if request.path.startswith('/admin') or request.path.startswith('/api/v1/admin'):
+        # Admin Isolation: If accessing Admin Panel OR Admin API, skip JWT logic (Let Session rule).
+        # Static/media/health paths never look at the user either.
+        if request.path.startswith(self.skip_prefixes):
             return self.get_response(request)
 
-        # Optimization: If already authenticated by Session (and it's not Admin?), 
-        # actually we want JWT to Override if present, to fix the specific bug.
-        # But if Admin is logged in via Session, request.user is Admin.
-        # If we are on `/account/dashboard`, we want Customer.
-        
-        # Check for JWT Cookie
+        # Anonymous visitors carry no cookie: keep Django's session user untouched
         access_token = request.COOKIES.get('access_token')
-        
-        if access_token:
-            try:
-                # Use DRF's mechanism to validate (Reusing logic is safer)
-                auth = JWTAuthentication()
-                validated_token = auth.get_validated_token(access_token)
-                user = auth.get_user(validated_token)
-                
-                if user:
-                    request.user = user
-                    request._cached_user = user
-                    # logger.debug(f"Middleware: Authenticated Customer {user.mobile_number} via JWT Cookie")
-            
-            except Exception as e:
-                # logger.warning(f"Middleware: JWT Cookie Validation Failed: {e}")
-                pass
-        
+        if not access_token:
+            return self.get_response(request)
+
+        session_user = request.user
+
+        def resolve():
+            user = self.get_user(request, access_token)
+            if user is None:
+                return session_user
+            request._cached_user = user
+            return user
+
+        request.user = SimpleLazyObject(resolve)
+
+        async def auser():
+            return await sync_to_async(resolve)()
+
+        request.auser = auser
         return self.get_response(request)
+
+    def get_user(self, request, access_token):
+        """Customer behind the cookie, or None if the token is invalid or revoked"""
+        try:
+            user, _ = self.authenticator.authenticate_token(request, access_token)
+        except (InvalidToken, AuthenticationFailed) as e:
+            logger.debug(f"JWT cookie rejected on {request.path}: {e}")
+            return None
+        return user
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-19 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_user_profile_photo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='tokens_valid_after',
+            field=models.DateTimeField(blank=True, help_text='Tokens issued before this time are rejected (force logout).', null=True),
+        ),
+    ]
@@ -71,6 +71,11 @@ class User(AbstractBaseUser, PermissionsMixin):
         help_text=_('Designates whether this user should be treated as active. Unselect this instead of deleting accounts.'),
     )
     date_joined = models.DateTimeField(_('date joined'), default=timezone.now)
+    tokens_valid_after = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_('Tokens issued before this time are rejected (force logout).'),
+    )
 
     objects = UserManager()
 
@@ -4,6 +4,10 @@ from .services import OTPService
 from .token_blacklist import TokenBlacklist
 from django.db import transaction
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .user_cache import UserCache
 
 User = get_user_model()
 
@@ -58,3 +62,25 @@ class LogoutSerializer(serializers.Serializer):
     
     def save(self):
         TokenBlacklist.blacklist_token(self.token)
+
+
+class RevocationCheckingTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh only with tokens that are not blacklisted (logout), not issued
+    before the user's tokens_valid_after (force logout) and whose user is
+    still active. With rotation on, the used refresh token is blacklisted.
+    """
+
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        if TokenBlacklist.is_blacklisted(refresh['jti']):
+            raise InvalidToken('Token has been revoked')
+
+        user = UserCache.get_user(refresh.get(api_settings.USER_ID_CLAIM))
+        if user is None or not user.is_active or TokenBlacklist.issued_before_revocation(refresh, user):
+            raise InvalidToken('Token has been revoked')
+
+        data = super().validate(attrs)
+        if 'refresh' in data:
+            TokenBlacklist.blacklist_token(attrs['refresh'])
+        return data
@@ -1,6 +1,7 @@
 import random
 import hashlib
 from django.core.cache import cache
+from apps.core.services.redis_service import RedisService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,7 +13,11 @@ class OTPService:
 
     @staticmethod
     def get_rate_limit_key(mobile_number: str) -> str:
-        return f"ecom:auth:limit:{mobile_number}"
+        return f"auth:otp_send:{mobile_number}"
+
+    @staticmethod
+    def get_verify_limit_key(mobile_number: str) -> str:
+        return f"auth:otp_verify:{mobile_number}"
 
     @staticmethod
     def _hash_otp(otp: str) -> str:
@@ -22,14 +27,12 @@ class OTPService:
     def generate_otp(mobile_number: str) -> str:
         """
         Generates a 6-digit OTP, HASHES it, and stores in Redis with 5 min expiry.
-        Strict 3 requests per 10 mins rate limit.
+        Rate limited to 10 requests per sliding 10 minutes (atomic, see RedisService.rate_limit).
         """
-        rate_key = OTPService.get_rate_limit_key(mobile_number)
-        attempts = cache.get(rate_key, 0)
-        
-        if attempts >= 10:
+        limit = RedisService.rate_limit(OTPService.get_rate_limit_key(mobile_number), limit=10, window=600)
+        if not limit.allowed:
             logger.warning(f"OTP Rate Limit Reached for {mobile_number}")
-            raise Exception("Too many OTP requests. Please wait 10 minutes.")
+            raise Exception(f"Too many OTP requests. Please wait {int(limit.retry_after // 60) + 1} minutes.")
         
         if mobile_number == "+919999999999":
             otp = "123456"
@@ -40,13 +43,6 @@ class OTPService:
         # Store Hashed OTP
         cache_key = OTPService.get_otp_key(mobile_number)
         cache.set(cache_key, hashed_otp, timeout=300) # 5 minutes
-        
-        # Increment Rate Limit
-        # Determine TTL for rate limit (reset if new)
-        if attempts == 0:
-            cache.set(rate_key, 1, timeout=600)  # 10 minutes window start
-        else:
-            cache.incr(rate_key)
 
         # Send OTP via SMS (MSG91)
         # Send OTP via SMS (MSG91) - ASYNC
@@ -70,11 +66,12 @@ class OTPService:
         if not stored_hash:
             return False
         
-        # Brute-force protection: Track verification attempts
-        attempts_key = f"ecom:auth:verify_attempts:{mobile_number}"
-        attempts = cache.get(attempts_key, 0)
+        # Brute-force protection: 3 attempts per sliding 10 minutes, consumed atomically
+        # before comparing, so concurrent guesses cannot slip past the limit
+        attempts_key = OTPService.get_verify_limit_key(mobile_number)
+        limit = RedisService.rate_limit(attempts_key, limit=3, window=600)
         
-        if attempts >= 3:
+        if not limit.allowed:
             logger.warning(f"OTP verification locked for {mobile_number} - too many attempts")
             return False
         
@@ -82,14 +79,8 @@ class OTPService:
         
         if stored_hash == hashed_input:
             cache.delete(cache_key)  # Single use
-            cache.delete(attempts_key)  # Clear attempts on success
+            RedisService.reset_rate_limit(attempts_key)  # Clear attempts on success
             return True
         else:
-            # Increment failed attempts
-            if attempts == 0:
-                cache.set(attempts_key, 1, timeout=600)  # 10 minutes lockout window
-            else:
-                cache.incr(attempts_key)
-            
-            logger.warning(f"OTP verification failed for {mobile_number}. Attempts: {attempts + 1}/3")
+            logger.warning(f"OTP verification failed for {mobile_number}. Attempts left: {limit.remaining}")
             return False
@@ -0,0 +1,10 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .user_cache import UserCache
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    # Role changes and disable both go through save(); the second bump after
+    # commit discards snapshots taken from the pre-commit row
+    UserCache.invalidate_on_commit(instance.pk)
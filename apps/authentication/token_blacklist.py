@@ -1,21 +1,96 @@
 """
-JWT Token Blacklist Service using Redis
+JWT Token Revocation
+
+Two tiers, so an ordinary request pays no Redis round trip for revocation:
+
+1. Per-user epoch: `User.tokens_valid_after`. Tokens issued (`iat`) before it
+   are rejected. The user comes from the UserCache snapshot the request
+   resolves anyway, so the check is free. Force-logout sets the epoch.
+2. Revoked JTIs (logout, refresh rotation): a Redis key per JTI plus an
+   append-only stream of revocations. Each process keeps a Bloom filter of
+   the stream; only a filter positive is confirmed in Redis.
+   - Every SYNC_INTERVAL seconds one request reads just the entries added
+     since the last sync (XRANGE from the last seen id). Other requests never
+     wait for it: they keep using the current filter.
+   - The full load (process start, or when the filter is over capacity and
+     holds expired JTIs) runs in a background thread and swaps the new
+     filter in; until the first one is ready, checks go to Redis.
+   Another worker's revocation can take up to SYNC_INTERVAL to be seen there.
 """
 from django.core.cache import cache
 from django.conf import settings
+from django_redis import get_redis_connection
 from rest_framework_simplejwt.tokens import RefreshToken
+import hashlib
+import math
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(1024, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class _FilterState:
+    """Bloom filter plus the stream position it covers"""
+    __slots__ = ('bloom', 'last_id', 'count', 'capacity', 'synced_at')
+
+    def __init__(self, capacity: int):
+        self.bloom = BloomFilter(capacity)
+        self.capacity = capacity
+        self.last_id = '0-0'
+        self.count = 0
+        self.synced_at = time.monotonic()
+
+    def add(self, jti: str):
+        self.bloom.add(jti)
+        self.count += 1
+
+
 class TokenBlacklist:
     PREFIX = "ecom:blacklist:jwt:"
-    
+    STREAM_KEY = "ecom:blacklist:jti_stream"  # entries: {jti, exp}
+
+    # Seconds between incremental filter syncs from the Redis stream
+    SYNC_INTERVAL = 10
+    # Entries read per XRANGE call
+    SYNC_PAGE_SIZE = 5000
+    # Headroom when sizing a rebuilt filter (room for growth before the next rebuild)
+    CAPACITY_FACTOR = 2
+    MIN_CAPACITY = 10000
+
+    _lock = threading.Lock()
+    _state = None
+    _rebuilding = False
+    _rebuild_started_at = -float('inf')
+
     @staticmethod
     def _get_key(jti):
         """Generate Redis key for JWT ID"""
         return f"{TokenBlacklist.PREFIX}{jti}"
-    
+
     @staticmethod
     def blacklist_token(token_string):
         """
@@ -25,22 +100,138 @@ class TokenBlacklist:
         try:
             token = RefreshToken(token_string)
             jti = str(token['jti'])
-            
+
             # Get token expiry
             exp = token['exp']
-            from datetime import datetime
-            ttl = exp - int(datetime.now().timestamp())
-            
+            ttl = exp - int(time.time())
+
             if ttl > 0:
                 cache.set(TokenBlacklist._get_key(jti), "1", timeout=ttl)
+                TokenBlacklist._append(jti, exp)
+                state = TokenBlacklist._state
+                if state is not None:
+                    state.add(jti)
                 logger.info(f"Token blacklisted: {jti}")
                 return True
             return False
         except Exception as e:
             logger.error(f"Failed to blacklist token: {e}")
             return False
-    
+
     @staticmethod
-    def is_blacklisted(jti):
-        """Check if token JTI is blacklisted"""
-        return cache.get(TokenBlacklist._get_key(jti)) is not None
+    def _retention_ms() -> int:
+        """Stream entries older than the longest token lifetime are expired anyway"""
+        lifetime = max(
+            settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'],
+            settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'],
+        )
+        return int(lifetime.total_seconds() * 1000)
+
+    @classmethod
+    def _append(cls, jti, exp):
+        min_id = int(time.time() * 1000) - cls._retention_ms()
+        get_redis_connection("default").xadd(
+            cls.STREAM_KEY, {'jti': jti, 'exp': exp}, minid=min_id, approximate=True
+        )
+
+    @classmethod
+    def _read_into(cls, state, max_pages=None):
+        """Add stream entries after state.last_id to the filter; returns entries read"""
+        con = get_redis_connection("default")
+        now = int(time.time())
+        read = pages = 0
+        while max_pages is None or pages < max_pages:
+            entries = con.xrange(cls.STREAM_KEY, min=f"({state.last_id}", max='+', count=cls.SYNC_PAGE_SIZE)
+            pages += 1
+            for entry_id, fields in entries:
+                jti = fields.get(b'jti') or fields.get('jti')
+                exp = fields.get(b'exp') or fields.get('exp')
+                if jti and (exp is None or int(exp) > now):
+                    state.add(jti.decode() if isinstance(jti, bytes) else jti)
+                state.last_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+            read += len(entries)
+            if len(entries) < cls.SYNC_PAGE_SIZE:
+                # Caught up; otherwise the next request continues from last_id
+                state.synced_at = time.monotonic()
+                break
+        return read
+
+    @classmethod
+    def _rebuild(cls):
+        """Load the whole stream into a fresh filter (background thread) and swap it in"""
+        try:
+            con = get_redis_connection("default")
+            capacity = max(cls.MIN_CAPACITY, con.xlen(cls.STREAM_KEY) * cls.CAPACITY_FACTOR)
+            state = _FilterState(capacity)
+            cls._read_into(state)
+            with cls._lock:
+                cls._read_into(state)  # entries appended while loading
+                cls._state = state
+            logger.info(f"Revoked token filter rebuilt ({state.count} JTIs)")
+        except Exception as e:
+            logger.error(f"Revoked token filter rebuild failed: {e}")
+        finally:
+            cls._rebuilding = False
+
+    @classmethod
+    def _start_rebuild(cls):
+        now = time.monotonic()
+        if cls._rebuilding or now - cls._rebuild_started_at < cls.SYNC_INTERVAL:
+            return
+        cls._rebuilding = True
+        cls._rebuild_started_at = now
+        threading.Thread(target=cls._rebuild, name='token-blacklist-filter', daemon=True).start()
+
+    @classmethod
+    def _may_be_blacklisted(cls, jti) -> bool:
+        state = cls._state
+        if state is None:
+            cls._start_rebuild()
+            return True  # no filter yet: ask Redis
+
+        if time.monotonic() - state.synced_at >= cls.SYNC_INTERVAL and cls._lock.acquire(blocking=False):
+            # One request pulls the few new entries; the rest use the filter as is
+            try:
+                if cls._state is state and time.monotonic() - state.synced_at >= cls.SYNC_INTERVAL:
+                    cls._read_into(state, max_pages=1)
+                    if state.count > state.capacity:
+                        cls._start_rebuild()
+            except Exception as e:
+                logger.error(f"Revoked token filter sync failed: {e}")
+                return True  # fail safe: fall through to Redis
+            finally:
+                cls._lock.release()
+        return jti in state.bloom
+
+    @classmethod
+    def is_blacklisted(cls, jti):
+        """Check if token JTI is blacklisted (Redis is only asked on a filter positive)"""
+        if not cls._may_be_blacklisted(str(jti)):
+            return False
+        return cache.get(cls._get_key(jti)) is not None
+
+    @staticmethod
+    def issued_before_revocation(token, user) -> bool:
+        """
+        True if the token predates the user's tokens_valid_after epoch.
+        `iat` has whole-second precision, so a token issued in the same second
+        as the revocation counts as revoked.
+        """
+        valid_after = getattr(user, 'tokens_valid_after', None)
+        if valid_after is None:
+            return False
+        issued_at = token.get('iat')
+        if issued_at is None:
+            lifetime = settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']
+            issued_at = token['exp'] - lifetime.total_seconds()
+        return issued_at < math.ceil(valid_after.timestamp())
+
+    @staticmethod
+    def revoke_user_tokens(user):
+        """Invalidate every token issued to `user` so far (force logout)"""
+        from django.utils import timezone
+
+        user.tokens_valid_after = timezone.now()
+        # post_save bumps the UserCache version, so the new epoch is seen at once
+        user.save(update_fields=['tokens_valid_after'])
+        logger.info(f"All tokens revoked for user {user.pk}")
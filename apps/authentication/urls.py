@@ -1,8 +1,7 @@
 from django.urls import path
-from .views import SendOTPView, VerifyOTPView, LogoutView
+from .views import SendOTPView, VerifyOTPView, LogoutView, RevocationCheckingTokenRefreshView
 from .admin_login_view import AdminLoginView
 from .profile_views import UserProfileView, AdminUserUpdateView, ChangePasswordView
-from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
     # Customer OTP Authentication
@@ -13,7 +12,7 @@ urlpatterns = [
     path('auth/admin/login', AdminLoginView.as_view(), name='admin-login'),
     
     # Common
-    path('auth/refresh', TokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/refresh', RevocationCheckingTokenRefreshView.as_view(), name='token_refresh'),
     path('auth/logout', LogoutView.as_view(), name='logout'),
     path('auth/profile', UserProfileView.as_view(), name='user-profile'),
     path('auth/password/change', ChangePasswordView.as_view(), name='change-password'),
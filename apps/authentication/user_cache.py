@@ -0,0 +1,72 @@
+"""
+User Resolution Cache
+
+Authenticated requests resolve the JWT's user from a cached snapshot
+instead of a query. Each user has a version counter; the snapshot key
+embeds it, so bumping the version makes every older snapshot unreachable.
+
+A User save/delete (see apps.authentication.signals) bumps twice: at once,
+and again when the transaction commits. A request that reads the old,
+still-committed row between the two can cache it under the first new
+version, but the commit-time bump makes that snapshot unreachable as well.
+"""
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.contrib.auth import get_user_model
+from django.db import transaction
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UserCache:
+    PREFIX = "ecom:user:"
+    VERSION_PREFIX = "ecom:user_version:"
+
+    # Snapshots are invalidated explicitly; the TTL only bounds memory
+    SNAPSHOT_TTL = 60 * 60
+
+    @staticmethod
+    def _version_key(user_id) -> str:
+        return f"{UserCache.VERSION_PREFIX}{user_id}"
+
+    @staticmethod
+    def _snapshot_key(user_id, version) -> str:
+        return f"{UserCache.PREFIX}{user_id}:v{version}"
+
+    @staticmethod
+    def get_user(user_id):
+        """User for `user_id` (snapshot or DB), or None if it does not exist"""
+        version = cache.get(UserCache._version_key(user_id), 0)
+        key = UserCache._snapshot_key(user_id, version)
+        user = cache.get(key)
+        if user is not None:
+            return user
+
+        User = get_user_model()
+        try:
+            user = User.objects.get(pk=user_id)
+        except (User.DoesNotExist, ValueError, TypeError):
+            return None
+        except ValidationError as e:
+            # Malformed ids (e.g. not a UUID); database errors propagate
+            logger.warning(f"User lookup failed for {user_id}: {e}")
+            return None
+
+        cache.set(key, user, timeout=UserCache.SNAPSHOT_TTL)
+        return user
+
+    @staticmethod
+    def invalidate(user_id):
+        """Drop every cached snapshot of the user (role change, disable, any save)"""
+        key = UserCache._version_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+    @staticmethod
+    def invalidate_on_commit(user_id):
+        """Invalidate now and again once the current transaction commits"""
+        UserCache.invalidate(user_id)
+        transaction.on_commit(lambda: UserCache.invalidate(user_id))
@@ -2,18 +2,22 @@ from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from .serializers import SendOTPSerializer, VerifyOTPSerializer, LogoutSerializer
+from rest_framework_simplejwt.views import TokenRefreshView
+from .serializers import (
+    SendOTPSerializer, VerifyOTPSerializer, LogoutSerializer,
+    RevocationCheckingTokenRefreshSerializer
+)
 from .services import OTPService
 import logging
 
 logger = logging.getLogger(__name__)
 
-from rest_framework.throttling import ScopedRateThrottle
+from apps.core.throttling import RedisScopedRateThrottle
 
 class SendOTPView(APIView):
     authentication_classes = []  # Disable auth checks to prevent 401 on stale cookies
     permission_classes = [AllowAny]
-    throttle_classes = [ScopedRateThrottle]
+    throttle_classes = [RedisScopedRateThrottle]
     throttle_scope = 'otp'
 
     def post(self, request):
@@ -64,6 +68,12 @@ class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
+        serializer = LogoutSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response({"message": "Logged out successfully"}, status=status.HTTP_200_OK)
+
+
+class RevocationCheckingTokenRefreshView(TokenRefreshView):
+    """Token refresh that honours logout, rotation and force-logout revocations"""
+    serializer_class = RevocationCheckingTokenRefreshSerializer
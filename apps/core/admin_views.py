@@ -16,6 +16,7 @@ from apps.core.services.export_service import CSVExporter
 from apps.core.models import AuditLog
 from apps.products.models import Product
 from apps.orders.models import Order
+from apps.orders.services import OrderHistory
 from apps.payments.models import Payment
 from apps.authentication.token_blacklist import TokenBlacklist
 import logging
@@ -291,7 +292,7 @@ class AdminCustomerViewSet(viewsets.ReadOnlyModelViewSet):
     def retrieve(self, request, pk=None):
         """Customer detail with order history"""
         customer = self.get_object()
-        orders = Order.objects.filter(user=customer).select_related('payment')
+        orders = OrderHistory.for_user(customer)
         
         return Response({
             'id': str(customer.id),
@@ -363,8 +364,7 @@ class AdminCustomerViewSet(viewsets.ReadOnlyModelViewSet):
         customer = self.get_object()
         reason = request.data.get('reason', 'Admin forced logout')
         
-        # Note: This is a placeholder - in production, you'd blacklist all user's tokens
-        # For now, we just log the action
+        TokenBlacklist.revoke_user_tokens(customer)
         
         AuditLog.objects.create(
             user=request.user,
@@ -1,12 +1,14 @@
 import uuid
-import threading
 
-_request_local = threading.local()
+from apps.core import request_context
+from apps.core.request_context import get_correlation_id  # noqa: F401 (kept for existing imports)
+
 
 class CorrelationIDMiddleware:
     """
     Injects X-Request-ID into all requests and responses.
-    Stores it in thread-local storage for access in logging.
+    Binds the request context (correlation ID, route; user ID once
+    authenticated) for logging and Celery tasks, see apps.core.request_context.
     """
     def __init__(self, get_response):
         self.get_response = get_response
@@ -14,20 +16,24 @@ class CorrelationIDMiddleware:
     def __call__(self, request):
         # Get or generate correlation ID
         correlation_id = request.headers.get('X-Request-ID') or str(uuid.uuid4())
-        
-        # Store in thread-local for logger access
-        _request_local.correlation_id = correlation_id
-        
+
         # Add to request for easy access
         request.correlation_id = correlation_id
-        
-        response = self.get_response(request)
-        
+
+        token = request_context.bind(correlation_id=correlation_id, route=request.path)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_context.reset(token)
+
         # Add to response headers
         response['X-Request-ID'] = correlation_id
-        
+
         return response
 
-def get_correlation_id():
-    """Utility to retrieve correlation ID from anywhere in request cycle"""
-    return getattr(_request_local, 'correlation_id', None)
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # URL pattern instead of the raw path, so traces group by endpoint
+        match = request.resolver_match
+        if match is not None and match.route:
+            request_context.update(route=match.route)
+        return None
@@ -0,0 +1,221 @@
+"""
+Money - integer paise value type
+
+Amounts are held as an int number of paise, so adding line totals, applying
+quantities and comparing cart/order/gateway totals is plain integer maths
+with no float or Decimal drift. Conversions happen at the edges:
+
+    Money.of(Decimal('499.99'))  -> from rupees (half-up to the paisa)
+    money.paise                  -> int, what Razorpay expects
+    money.rupees                 -> Decimal('499.99'), for DecimalField columns
+
+`MoneyField` stores Money in the existing DECIMAL(…, 2) columns (no schema
+change) and `MoneySerializerField` reads/writes it in DRF serializers.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+from rest_framework import serializers
+
+
+class Money:
+    """Immutable INR amount backed by integer paise."""
+    __slots__ = ('_paise',)
+
+    def __init__(self, paise: int = 0):
+        if isinstance(paise, bool) or not isinstance(paise, int):
+            raise TypeError(f"Money() takes integer paise, got {type(paise).__name__}; use Money.of() for rupees")
+        object.__setattr__(self, '_paise', paise)
+
+    @classmethod
+    def of(cls, amount) -> 'Money':
+        """Money from rupees (Decimal, str, int or float), rounded half-up to the paisa"""
+        if isinstance(amount, Money):
+            return amount
+        if amount is None:
+            raise TypeError("Money.of() got None")
+        rupees = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+        return cls(int((rupees * 100).to_integral_value(rounding=ROUND_HALF_UP)))
+
+    @property
+    def paise(self) -> int:
+        return self._paise
+
+    @property
+    def rupees(self) -> Decimal:
+        return Decimal(self._paise).scaleb(-2)
+
+    # --- arithmetic -------------------------------------------------
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self._paise + other._paise)
+        if other == 0 and isinstance(other, int):  # sum() starts from 0
+            return self
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self._paise - other._paise)
+        if other == 0 and isinstance(other, int):
+            return self
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if other == 0 and isinstance(other, int):
+            return -self
+        return NotImplemented
+
+    def __mul__(self, other):
+        """Money * integer quantity; use scale()/percent() for fractional factors"""
+        if isinstance(other, int) and not isinstance(other, bool):
+            return Money(self._paise * other)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Money(-self._paise)
+
+    def __abs__(self):
+        return Money(abs(self._paise))
+
+    def scale(self, factor) -> 'Money':
+        """Multiply by a Decimal/str factor (rate multipliers, weights), half-up"""
+        value = Decimal(self._paise) * (factor if isinstance(factor, Decimal) else Decimal(str(factor)))
+        return Money(int(value.to_integral_value(rounding=ROUND_HALF_UP)))
+
+    def percent(self, rate) -> 'Money':
+        """`rate` percent of this amount (rate has at most 2 decimals), half-up"""
+        basis_points = int((Decimal(str(rate)) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+        numerator = self._paise * basis_points
+        sign = -1 if numerator < 0 else 1
+        return Money(sign * ((abs(numerator) + 5000) // 10000))
+
+    # --- comparison -------------------------------------------------
+
+    @staticmethod
+    def _other_paise(other):
+        if isinstance(other, Money):
+            return other._paise
+        if isinstance(other, int) and not isinstance(other, bool) and other == 0:
+            return 0
+        return None
+
+    def __eq__(self, other):
+        paise = self._other_paise(other)
+        return NotImplemented if paise is None else self._paise == paise
+
+    def __lt__(self, other):
+        paise = self._other_paise(other)
+        return NotImplemented if paise is None else self._paise < paise
+
+    def __le__(self, other):
+        paise = self._other_paise(other)
+        return NotImplemented if paise is None else self._paise <= paise
+
+    def __gt__(self, other):
+        paise = self._other_paise(other)
+        return NotImplemented if paise is None else self._paise > paise
+
+    def __ge__(self, other):
+        paise = self._other_paise(other)
+        return NotImplemented if paise is None else self._paise >= paise
+
+    def __hash__(self):
+        return hash(('Money', self._paise))
+
+    def __bool__(self):
+        return self._paise != 0
+
+    # --- representation ----------------------------------------------
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Money is immutable")
+
+    def __reduce__(self):
+        return (Money, (self._paise,))
+
+    def __str__(self):
+        sign = '-' if self._paise < 0 else ''
+        whole, fraction = divmod(abs(self._paise), 100)
+        return f"{sign}{whole}.{fraction:02d}"
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+
+Money.ZERO = Money(0)
+
+
+class MoneyAttribute(DeferredAttribute):
+    """Coerces assigned rupee values to Money so instances never hold Decimals/floats."""
+
+    def __set__(self, instance, value):
+        if value is not None and not hasattr(value, 'resolve_expression'):
+            value = Money.of(value)
+        instance.__dict__[self.field.attname] = value
+
+
+class MoneyField(models.DecimalField):
+    """
+    DecimalField that hands out Money. The column stays DECIMAL(max_digits, 2),
+    so converting an existing field needs no data migration.
+    """
+    descriptor_class = MoneyAttribute
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_digits', 10)
+        kwargs['decimal_places'] = 2
+        super().__init__(*args, **kwargs)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return Money.of(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, Money):
+            return value
+        return Money.of(super().to_python(value))
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None:
+            return None
+        return Money.of(value).rupees
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        # DecimalField would run the prepped Decimal through to_python() again,
+        # turning it back into Money, which database drivers cannot bind
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is None or hasattr(value, 'as_sql'):
+            return value
+        return connection.ops.adapt_decimalfield_value(value, self.max_digits, self.decimal_places)
+
+    def run_validators(self, value):
+        super().run_validators(value.rupees if isinstance(value, Money) else value)
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        return '' if value is None else str(value)
+
+
+class MoneySerializerField(serializers.DecimalField):
+    """DRF field for Money: accepts rupee strings/numbers, renders like DecimalField"""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('max_digits', 12)
+        kwargs.setdefault('decimal_places', 2)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        return Money.of(super().to_internal_value(data))
+
+    def to_representation(self, value):
+        if isinstance(value, Money):
+            value = value.rupees
+        return super().to_representation(value)
@@ -0,0 +1,19 @@
+"""
+API renderers
+"""
+from rest_framework.renderers import JSONRenderer as BaseJSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+from .money import Money
+
+
+class MoneyAwareJSONEncoder(JSONEncoder):
+    """DRF encoder that also serialises Money (as a number, like Decimal)"""
+
+    def default(self, obj):
+        if isinstance(obj, Money):
+            return super().default(obj.rupees)
+        return super().default(obj)
+
+
+class JSONRenderer(BaseJSONRenderer):
+    encoder_class = MoneyAwareJSONEncoder
@@ -0,0 +1,83 @@
+"""
+Request Context
+
+Correlation ID, user ID and route of the current request (or Celery task),
+kept in a ContextVar so it follows the request across threads and async
+code under both WSGI and ASGI.
+
+- CorrelationIDMiddleware binds it for every request.
+- RequestContextFilter copies it onto log records (%(correlation_id)s etc.).
+- apps.core.signals forwards it as Celery task headers on publish and
+  restores it in the worker around each task.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Optional
+import logging
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    correlation_id: Optional[str] = None
+    user_id: Optional[str] = None
+    route: Optional[str] = None
+
+
+EMPTY = RequestContext()
+
+_context: ContextVar[RequestContext] = ContextVar('request_context', default=EMPTY)
+
+# Celery message header per context field (prefixed: Celery has its own correlation_id)
+TASK_HEADERS = {
+    'correlation_id': 'x_correlation_id',
+    'user_id': 'x_user_id',
+    'route': 'x_route',
+}
+
+
+def get_context() -> RequestContext:
+    return _context.get()
+
+
+def get_correlation_id() -> Optional[str]:
+    return _context.get().correlation_id
+
+
+def bind(**fields):
+    """Start a new context; returns a token for `reset`"""
+    return _context.set(RequestContext(**fields))
+
+
+def update(**fields):
+    """Change fields of the current context (e.g. user_id once authenticated)"""
+    _context.set(replace(_context.get(), **fields))
+
+
+def reset(token):
+    _context.reset(token)
+
+
+def to_headers() -> dict:
+    """Current context as Celery task headers (unset fields are left out)"""
+    context = _context.get()
+    return {
+        header: str(getattr(context, field))
+        for field, header in TASK_HEADERS.items()
+        if getattr(context, field) is not None
+    }
+
+
+def from_headers(get) -> RequestContext:
+    """Context from task headers; `get(name)` looks a header up"""
+    return RequestContext(**{field: get(header) for field, header in TASK_HEADERS.items()})
+
+
+class RequestContextFilter(logging.Filter):
+    """Adds correlation_id, user_id and route ('-' when unset) to every record"""
+
+    def filter(self, record):
+        context = _context.get()
+        record.correlation_id = context.correlation_id or '-'
+        record.user_id = context.user_id or '-'
+        record.route = context.route or '-'
+        return True
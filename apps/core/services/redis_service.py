@@ -2,11 +2,87 @@ import time
 import uuid
 import logging
 from django.core.cache import cache
+from collections import namedtuple
 from django_redis import get_redis_connection
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'remaining', 'retry_after'])
+
+# Both scripts take KEYS[1] = state hash and ARGV = limit, window (ms), cost,
+# read the clock from Redis (one clock for every web/worker host) and return
+# {allowed, remaining, retry_after_ms}. cost=0 only checks whether one more
+# hit would be allowed, without consuming it.
+
+# Sliding window counter: previous and current fixed-window counts, with the
+# previous one weighted by how much of it still overlaps the sliding window.
+SLIDING_WINDOW_LUA = """
+if redis.replicate_commands then redis.replicate_commands() end
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local current_start = now - (now % window)
+
+local state = redis.call('HMGET', KEYS[1], 'start', 'current', 'previous')
+local start = tonumber(state[1]) or current_start
+local current = tonumber(state[2]) or 0
+local previous = tonumber(state[3]) or 0
+if start ~= current_start then
+    if start == current_start - window then previous = current else previous = 0 end
+    current = 0
+end
+
+local elapsed = now - current_start
+local estimated = previous * (window - elapsed) / window + current
+local needed = math.max(cost, 1)
+if estimated + needed > limit then
+    local retry = window - elapsed
+    if previous > 0 then
+        retry = math.min(retry, math.ceil((estimated + needed - limit) * window / previous))
+    end
+    redis.call('HSET', KEYS[1], 'start', current_start, 'current', current, 'previous', previous)
+    redis.call('PEXPIRE', KEYS[1], window * 2)
+    return {0, 0, retry}
+end
+
+current = current + cost
+redis.call('HSET', KEYS[1], 'start', current_start, 'current', current, 'previous', previous)
+redis.call('PEXPIRE', KEYS[1], window * 2)
+return {1, math.floor(limit - estimated - cost), 0}
+"""
+
+# Token bucket: `limit` tokens, refilled continuously at limit per window.
+TOKEN_BUCKET_LUA = """
+if redis.replicate_commands then redis.replicate_commands() end
+local capacity = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * capacity / window)
+
+local needed = math.max(cost, 1)
+local allowed = 0
+local retry = 0
+if tokens >= needed then
+    allowed = 1
+    tokens = tokens - cost
+else
+    retry = math.ceil((needed - tokens) * window / capacity)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', now)
+redis.call('PEXPIRE', KEYS[1], window)
+return {allowed, math.floor(tokens), retry}
+"""
+
 class RedisService:
     """
     Central utility for Redis operations: Locking, Rate Limiting, Idempotency.
@@ -72,3 +148,50 @@ class RedisService:
         # SETNX equivalent
         was_set = con.set(redis_key, "PROCESSED", nx=True, ex=ttl)
         return bool(was_set)
+
+    @staticmethod
+    def release_idempotency_key(scope: str, key_id: str):
+        """Forget a key set by check_and_set_idempotency_key (the work failed and may be retried)"""
+        con = get_redis_connection("default")
+        con.delete(RedisService.get_idempotency_key(scope, key_id))
+
+    # ------------------------------------------------------------------
+    # Rate limiting
+    # ------------------------------------------------------------------
+
+    SLIDING_WINDOW = 'sliding_window'
+    TOKEN_BUCKET = 'token_bucket'
+    _RATE_LIMIT_SOURCES = {SLIDING_WINDOW: SLIDING_WINDOW_LUA, TOKEN_BUCKET: TOKEN_BUCKET_LUA}
+    _rate_limit_scripts = {}
+
+    @staticmethod
+    def get_rate_limit_key(key: str) -> str:
+        return f"{RedisService.KEY_PREFIX}ratelimit:{key}"
+
+    @staticmethod
+    def rate_limit(key: str, limit: int, window: float, algorithm: str = SLIDING_WINDOW, cost: int = 1) -> RateLimitResult:
+        """
+        Atomic rate limit check-and-consume: one EVALSHA round trip.
+
+        :param limit: hits allowed per `window` (bucket capacity for token_bucket)
+        :param window: window length in seconds (full refill time for token_bucket)
+        :param cost: hits to consume; 0 only checks whether one more would pass
+        :returns: RateLimitResult(allowed, remaining, retry_after seconds)
+        """
+        con = get_redis_connection("default")
+        script = RedisService._rate_limit_scripts.get(algorithm)
+        if script is None:
+            # Script objects run EVALSHA and reload the source on NOSCRIPT
+            script = con.register_script(RedisService._RATE_LIMIT_SOURCES[algorithm])
+            RedisService._rate_limit_scripts[algorithm] = script
+
+        allowed, remaining, retry_after_ms = script(
+            keys=[RedisService.get_rate_limit_key(key)],
+            args=[int(limit), max(1, int(window * 1000)), int(cost)],
+            client=con,
+        )
+        return RateLimitResult(bool(allowed), max(0, int(remaining)), int(retry_after_ms) / 1000)
+
+    @staticmethod
+    def reset_rate_limit(key: str):
+        get_redis_connection("default").delete(RedisService.get_rate_limit_key(key))
@@ -3,12 +3,13 @@ Sales & Revenue Reporting Service
 Provides accurate, real-time financial reports from database
 NO CACHING for financial data
 """
-from django.db.models import Sum, Count, Avg, Q, F
+from django.db.models import Sum, Count, Q, F
 from django.utils import timezone
 from datetime import datetime, timedelta
-from apps.orders.models import Order
+from apps.orders.models import ArchivedOrder, ArchivedPayment, Order
 from apps.payments.models import Payment
-from decimal import Decimal
+from collections import Counter
+from apps.core.money import Money
 
 class ReportingService:
     
@@ -58,33 +59,36 @@ class ReportingService:
         
         return ReportingService._generate_report(date_from, date_to, 'Custom')
     
+    @staticmethod
+    def _payment_totals(model, start, end):
+        """{status: (count, sum)} for one payment tier in a single query"""
+        rows = model.objects.filter(created_at__range=(start, end)).values('status').annotate(
+            count=Count('id'), total=Sum('amount')
+        )
+        return {row['status']: (row['count'], row['total'] or Money.ZERO) for row in rows}
+
     @staticmethod
     def _generate_report(start, end, period_type):
-        """Core reporting logic"""
+        """Core reporting logic (hot and archived orders/payments combined)"""
         # All orders in period
         orders = Order.objects.filter(created_at__range=(start, end))
+        archived_orders = ArchivedOrder.objects.filter(created_at__range=(start, end))
         
-        # Payments in period
-        payments = Payment.objects.filter(created_at__range=(start, end))
+        # Payments in period, grouped by status across both tiers
+        payment_totals = {}
+        for model in (Payment, ArchivedPayment):
+            for status, (count, total) in ReportingService._payment_totals(model, start, end).items():
+                prev_count, prev_total = payment_totals.get(status, (0, Money.ZERO))
+                payment_totals[status] = (prev_count + count, prev_total + total)
         
         # Successful payments (CAPTURED)
-        successful_payments = payments.filter(status=Payment.Status.CAPTURED)
-        failed_payments = payments.filter(status=Payment.Status.FAILED)
-        refunded_payments = payments.filter(status=Payment.Status.REFUNDED)
+        successful_count, total_revenue = payment_totals.get(Payment.Status.CAPTURED, (0, Money.ZERO))
+        failed_count, _ = payment_totals.get(Payment.Status.FAILED, (0, Money.ZERO))
+        refunded_count, refund_total = payment_totals.get(Payment.Status.REFUNDED, (0, Money.ZERO))
         
         # Aggregations
-        total_orders = orders.count()
-        total_revenue = successful_payments.aggregate(
-            total=Sum('amount')
-        )['total'] or Decimal('0.00')
-        
-        refund_total = refunded_payments.aggregate(
-            total=Sum('amount')
-        )['total'] or Decimal('0.00')
-        
-        avg_order_value = successful_payments.aggregate(
-            avg=Avg('amount')
-        )['avg'] or Decimal('0.00')
+        total_orders = orders.count() + archived_orders.count()
+        avg_order_value = Money.of(total_revenue.rupees / successful_count) if successful_count else Money.ZERO
         
         # Top products by revenue
         from apps.orders.models import OrderItem
@@ -99,9 +103,13 @@ class ReportingService:
         ).order_by('-total_revenue')[:10]
         
         # Order status breakdown
-        status_breakdown = orders.values('status').annotate(
-            count=Count('id')
-        ).order_by('status')
+        status_counts = Counter()
+        for queryset in (orders, archived_orders):
+            for row in queryset.values('status').annotate(count=Count('id')):
+                status_counts[row['status']] += row['count']
+        status_breakdown = [
+            {'status': status, 'count': count} for status, count in sorted(status_counts.items())
+        ]
         
         return {
             'period_type': period_type,
@@ -110,14 +118,14 @@ class ReportingService:
             'summary': {
                 'total_orders': total_orders,
                 'total_revenue': str(total_revenue),
-                'successful_payments': successful_payments.count(),
-                'failed_payments': failed_payments.count(),
-                'refunded_payments': refunded_payments.count(),
+                'successful_payments': successful_count,
+                'failed_payments': failed_count,
+                'refunded_payments': refunded_count,
                 'refund_total': str(refund_total),
                 'net_revenue': str(total_revenue - refund_total),
                 'average_order_value': str(avg_order_value),
             },
             'top_products': list(top_products),
-            'order_status_breakdown': list(status_breakdown),
+            'order_status_breakdown': status_breakdown,
             'generated_at': timezone.now().isoformat()
         }
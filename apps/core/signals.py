@@ -0,0 +1,27 @@
+from celery.signals import before_task_publish, task_prerun, task_postrun
+from . import request_context
+
+# task_id -> context token, reset when the task finishes
+_task_tokens = {}
+
+@before_task_publish.connect
+def forward_request_context(sender=None, headers=None, **kwargs):
+    # Web request (or parent task) context travels with the message
+    if headers is not None:
+        for header, value in request_context.to_headers().items():
+            headers.setdefault(header, value)
+
+@task_prerun.connect
+def restore_request_context(sender=None, task_id=None, task=None, **kwargs):
+    context = request_context.from_headers(task.request.get)
+    if context == request_context.EMPTY:
+        return  # not published with a context (beat, eager apply): keep the current one
+    _task_tokens[task_id] = request_context.bind(
+        correlation_id=context.correlation_id, user_id=context.user_id, route=context.route
+    )
+
+@task_postrun.connect
+def clear_request_context(sender=None, task_id=None, **kwargs):
+    token = _task_tokens.pop(task_id, None)
+    if token is not None:
+        request_context.reset(token)
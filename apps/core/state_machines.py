@@ -9,6 +9,11 @@ PAID -> SHIPPED
 SHIPPED -> DELIVERED
 Any -> CANCELLED (admin action)
 """
+from django.db import transaction
+from django.utils import timezone
+import logging
+
+logger = logging.getLogger(__name__)
 
 ALLOWED_ORDER_TRANSITIONS = {
     'PENDING': ['AWAITING_PAYMENT', 'CANCELLED'],
@@ -30,19 +35,105 @@ def validate_order_transition(order, new_status):
             f"Invalid order state transition: {order.status} -> {new_status}"
         )
 
+def get_order_predecessors(to_status):
+    """Statuses from which `to_status` may be reached"""
+    return [
+        from_status for from_status, targets in ALLOWED_ORDER_TRANSITIONS.items()
+        if to_status in targets
+    ]
+
+def transition_order(order, new_status, allowed_from=None, user=None, reason='',
+                     action='ORDER_STATUS_CHANGED', request=None):
+    """
+    Compare-and-set order status transition.
+
+    Issues a single `UPDATE orders SET status=new WHERE id=? AND status IN
+    (<predecessors>)` and, if a row was updated, writes the OrderEvent outbox
+    row and the AuditLog entry in the same transaction. No row locks or
+    distributed locks are needed: concurrent callers race on the UPDATE and
+    exactly one wins.
+
+    :param allowed_from: restrict predecessors (defaults to the state machine)
+    :param user: acting user for the audit entry (None for system/webhook)
+    :param request: optional request for ip/correlation/path in the audit entry
+    :returns: {'won': bool, 'from_status': str|None, 'current_status': str}
+              On a lost race `order.status` is refreshed from the DB.
+    """
+    from apps.orders.models import Order, OrderEvent
+    from apps.core.models import AuditLog
+
+    predecessors = [
+        s for s in (allowed_from or get_order_predecessors(new_status))
+        if can_transition_order(s, new_status)
+    ]
+
+    now = timezone.now()
+    with transaction.atomic():
+        won = Order.objects.filter(pk=order.pk, status__in=predecessors).update(status=new_status, updated_at=now)
+        if not won:
+            order.refresh_from_db(fields=['status', 'updated_at'])
+            logger.info(f"Order {order.pk}: transition to {new_status} lost (current {order.status})")
+            return {'won': False, 'from_status': None, 'current_status': order.status}
+
+        from_status = _previous_order_status(order, predecessors)
+        order.status = new_status
+        order.updated_at = now
+        order._loaded_status = new_status
+        OrderEvent.record(order, from_status, payload={'reason': reason} if reason else None)
+
+        AuditLog.objects.create(
+            user=user,
+            user_mobile=getattr(user, 'mobile_number', '') or '',
+            user_role=getattr(user, 'role', 'SYSTEM') if user else 'SYSTEM',
+            action=action,
+            resource_type='Order',
+            resource_id=str(order.pk),
+            changes={'status': {'from': from_status, 'to': new_status}},
+            reason=reason,
+            ip_address=_get_client_ip(request) if request else None,
+            correlation_id=getattr(request, 'correlation_id', None) if request else None,
+            request_path=request.path if request else '',
+            request_method=request.method if request else '',
+        )
+
+    return {'won': True, 'from_status': from_status, 'current_status': new_status}
+
+def _previous_order_status(order, predecessors):
+    """
+    Status the UPDATE in transition_order replaced. Every status change writes
+    an OrderEvent in its own transaction and our UPDATE now holds the row, so
+    the latest event is the committed predecessor; orders older than the
+    outbox fall back to the status the caller last saw.
+    """
+    from apps.orders.models import OrderEvent
+
+    if len(predecessors) == 1:
+        return predecessors[0]
+    last = OrderEvent.objects.filter(order_id=order.pk).order_by('-id').values_list('to_status', flat=True).first()
+    if last in predecessors:
+        return last
+    return order.status if order.status in predecessors else predecessors[0]
+
+def _get_client_ip(request):
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return x_forwarded_for.split(',')[0]
+    return request.META.get('REMOTE_ADDR')
+
 """
 Payment State Machine
 
 Valid Transitions:
 CREATED -> CAPTURED (successful payment)
 CREATED -> FAILED (payment rejected)
+FAILED -> CAPTURED (retry on the same Razorpay order succeeded)
 CAPTURED -> REFUNDED (refund issued)
 """
 
 ALLOWED_PAYMENT_TRANSITIONS = {
     'CREATED': ['CAPTURED', 'FAILED'],
     'CAPTURED': ['REFUNDED'],
-    'FAILED': [],  # Terminal
+    'FAILED': ['CAPTURED'],  # Customer retried on the same Razorpay order and it succeeded
     'REFUNDED': []  # Terminal
 }
 
@@ -56,3 +147,30 @@ def validate_payment_transition(payment, new_status):
         raise ValueError(
             f"Invalid payment state transition: {payment.status} -> {new_status}"
         )
+
+def transition_payment(payment, new_status, allowed_from=None, **fields):
+    """
+    Compare-and-set payment status transition (see transition_order).
+    Extra `fields` are written in the same UPDATE. Returns True if this call won;
+    on a lost race `payment.status` is refreshed from the DB.
+
+    :param allowed_from: restrict predecessors (defaults to the state machine)
+    """
+    from apps.payments.models import Payment
+
+    predecessors = [
+        from_status for from_status in (allowed_from or ALLOWED_PAYMENT_TRANSITIONS)
+        if can_transition_payment(from_status, new_status)
+    ]
+    now = timezone.now()
+    won = Payment.objects.filter(pk=payment.pk, status__in=predecessors).update(
+        status=new_status, updated_at=now, **fields
+    )
+    if won:
+        payment.status = new_status
+        payment.updated_at = now
+        for name, value in fields.items():
+            setattr(payment, name, value)
+    else:
+        payment.refresh_from_db(fields=['status', 'updated_at'])
+    return bool(won)
@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+
+from apps.orders.models import Order
+
+from .money import Money
+
+
+class MoneyFieldRoundTripTest(TestCase):
+    """MoneyField must hand the database a Decimal and give Money back."""
+
+    def test_db_prep_value_is_decimal(self):
+        field = Order._meta.get_field('total_amount')
+        value = field.get_db_prep_save(Money.of('499.00'), connection)
+        self.assertNotIsInstance(value, Money)
+        self.assertEqual(Decimal(value), Decimal('499.00'))
+
+    def test_save_and_read_back(self):
+        order = Order.objects.create(
+            guest_phone='9000000000', total_amount=Money.of('499.99'), shipping_address={},
+        )
+        stored = Order.objects.get(pk=order.pk)
+        self.assertIsInstance(stored.total_amount, Money)
+        self.assertEqual(stored.total_amount, Money(49999))
+        self.assertIsNone(stored.tax_amount)
+
+    def test_filter_and_update_by_money(self):
+        order = Order.objects.create(guest_phone='9000000000', total_amount=Money(1000), shipping_address={})
+        self.assertTrue(Order.objects.filter(pk=order.pk, total_amount=Money(1000)).exists())
+        Order.objects.filter(pk=order.pk).update(total_amount=Money.of('12.34'))
+        self.assertEqual(Order.objects.get(pk=order.pk).total_amount, Money(1234))
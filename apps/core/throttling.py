@@ -0,0 +1,58 @@
+"""
+DRF throttles backed by RedisService.rate_limit.
+
+DRF's built-in throttles keep a list of request timestamps per client in the
+cache and rewrite it on every request (get, then set: racy and O(limit)).
+These keep a fixed-size counter state in Redis and decide in one atomic
+EVALSHA. Rates use the usual DEFAULT_THROTTLE_RATES scopes ('100/min').
+"""
+from rest_framework.throttling import AnonRateThrottle, ScopedRateThrottle, UserRateThrottle
+from apps.core.services.redis_service import RedisService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RedisThrottleMixin:
+    algorithm = RedisService.SLIDING_WINDOW
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        try:
+            result = RedisService.rate_limit(self.key, self.num_requests, self.duration, self.algorithm)
+        except Exception as e:
+            # Throttling is protective, not critical: fail open if Redis is down
+            logger.error(f"Rate limit check failed for {self.key}: {e}")
+            return True
+
+        self.retry_after = result.retry_after
+        return result.allowed
+
+    def wait(self):
+        return getattr(self, 'retry_after', None)
+
+
+class RedisAnonRateThrottle(RedisThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class RedisUserRateThrottle(RedisThrottleMixin, UserRateThrottle):
+    pass
+
+
+class RedisScopedRateThrottle(RedisThrottleMixin, ScopedRateThrottle):
+    def allow_request(self, request, view):
+        # Same scope resolution as ScopedRateThrottle, then the Redis check
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return RedisThrottleMixin.allow_request(self, request, view)
@@ -0,0 +1,83 @@
+"""
+Versioned Process Cache
+
+Holds one immutable snapshot per process (tax config, shipping index,
+service area matcher...) built from the database, and shares invalidation
+between workers through a version counter in the Django cache. A worker
+re-reads the counter at most every `check_interval` seconds, so serving the
+snapshot normally costs nothing.
+
+Invalidation runs on transaction commit: bumping earlier would let another
+worker rebuild from the old rows and keep them under the new version until
+the next change.
+"""
+from typing import Callable, Optional
+from django.core.cache import cache
+from django.db import transaction
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedProcessCache:
+    """
+    :param version_key: shared cache key holding the version counter
+    :param build: `build(version)` -> snapshot; the snapshot has a `version` attribute
+    :param name: used in log messages
+    :param is_current: optional extra staleness check (e.g. the snapshot's day)
+    """
+
+    # How often (seconds) a worker re-reads the shared version key
+    CHECK_INTERVAL = 5
+
+    def __init__(self, version_key: str, build: Callable, name: str,
+                 is_current: Optional[Callable] = None, check_interval: Optional[float] = None):
+        self.version_key = version_key
+        self.build = build
+        self.name = name
+        self.is_current = is_current or (lambda snapshot: True)
+        self.check_interval = self.CHECK_INTERVAL if check_interval is None else check_interval
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._last_version_check = 0.0
+
+    def get_version(self) -> int:
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, 1, timeout=None)
+            version = cache.get(self.version_key) or 1
+        return version
+
+    def bump_version(self):
+        """Invalidate the snapshot in every worker now"""
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, 1, timeout=None)
+        self._snapshot = None
+
+    def invalidate(self):
+        """Invalidate once the current transaction commits (immediately outside one)"""
+        transaction.on_commit(self.bump_version)
+
+    def get(self):
+        """Current snapshot; rebuilt when the shared version moves"""
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and self.is_current(snapshot):
+            if now - self._last_version_check < self.check_interval:
+                return snapshot
+            self._last_version_check = now
+            if self.get_version() == snapshot.version:
+                return snapshot
+
+        with self._lock:
+            version = self.get_version()
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != version or not self.is_current(snapshot):
+                snapshot = self._snapshot = self.build(version)
+                logger.info(f"{self.name} rebuilt (version {version})")
+            self._last_version_check = time.monotonic()
+            return snapshot
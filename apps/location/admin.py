@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import ServiceArea, CustomerLocation, LocationAttempt
+from .models import ServiceArea, CustomerLocation, LocationAttempt, LocationAttemptDaily
+from .services import LocationVerificationCache
 
 @admin.register(ServiceArea)
 class ServiceAreaAdmin(admin.ModelAdmin):
@@ -12,6 +13,15 @@ class CustomerLocationAdmin(admin.ModelAdmin):
     list_display = ('user', 'city', 'state', 'is_verified', 'expires_at')
     list_filter = ('is_verified', 'state')
     search_fields = ('user__mobile_number', 'city', 'full_address')
+    actions = ['revoke_verification']
+
+    @admin.action(description="Revoke location verification")
+    def revoke_verification(self, request, queryset):
+        user_ids = list(queryset.values_list('user_id', flat=True))
+        updated = queryset.update(is_verified=False)
+        # update() skips post_save, so drop the cached state explicitly
+        LocationVerificationCache.invalidate(*user_ids)
+        self.message_user(request, f"Revoked verification for {updated} customer(s)")
 
 @admin.register(LocationAttempt)
 class LocationAttemptAdmin(admin.ModelAdmin):
@@ -20,3 +30,9 @@ class LocationAttemptAdmin(admin.ModelAdmin):
     readonly_fields = ('user', 'latitude', 'longitude', 'accuracy', 'submitted_timestamp', 
                       'city', 'district', 'state', 'country', 'was_allowed', 'denial_reason', 
                       'matched_service_area', 'ip_address', 'user_agent', 'correlation_id')
+
+@admin.register(LocationAttemptDaily)
+class LocationAttemptDailyAdmin(admin.ModelAdmin):
+    list_display = ('date', 'city', 'state', 'allowed_count', 'denied_count')
+    list_filter = ('date', 'state')
+    search_fields = ('city', 'state')
@@ -0,0 +1,256 @@
+"""
+Reverse Geocoder Backends
+
+- BoundaryGeocoder: offline lookup against a local administrative-boundary
+  GeoJSON file (LOCATION_BOUNDARY_FILE), indexed with a uniform grid of
+  polygon bounding boxes. A lookup is a dict hit plus point-in-polygon tests
+  on the few candidates in one cell.
+- NominatimGeocoder: OpenStreetMap API, used as a fallback when enabled
+  (LOCATION_GEOCODER_FALLBACK) and the point is outside the local dataset.
+
+Backends return the geocoded dict used across apps.location, or None when
+they cannot resolve the point; they raise ValueError when the lookup fails.
+
+Shapefiles can be converted once with:
+    ogr2ogr -f GeoJSON -t_srs EPSG:4326 boundaries.geojson boundaries.shp
+"""
+from django.conf import settings
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Property names tried per field (own schema, GADM, OSM/Datameet exports)
+PROPERTY_NAMES = {
+    'city': ('city', 'town', 'subdistrict', 'NAME_3', 'sdtname'),
+    'district': ('district', 'NAME_2', 'dtname', 'DISTRICT'),
+    'state': ('state', 'NAME_1', 'stname', 'ST_NM', 'STATE'),
+    'country': ('country', 'NAME_0', 'COUNTRY'),
+}
+
+
+class GeocoderBackend:
+    name = 'base'
+    # Whether results are worth caching (remote lookups are; local ones are cheaper than the cache)
+    cacheable = False
+
+    def reverse(self, latitude: float, longitude: float):
+        raise NotImplementedError
+
+
+def _point_in_ring(x: float, y: float, ring) -> bool:
+    """Even-odd ray casting; `ring` is a flat tuple (x0, y0, x1, y1, ...)"""
+    inside = False
+    n = len(ring)
+    x1, y1 = ring[n - 2], ring[n - 1]
+    for i in range(0, n, 2):
+        x2, y2 = ring[i], ring[i + 1]
+        if (y2 > y) != (y1 > y) and x < (x1 - x2) * (y - y2) / (y1 - y2) + x2:
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
+
+
+class _Region:
+    """One boundary feature: polygons as (outer ring, holes) plus its bbox and attributes"""
+    __slots__ = ('polygons', 'bbox', 'area', 'attributes')
+
+    def __init__(self, polygons, attributes):
+        self.polygons = polygons
+        xs = [outer[i] for outer, _ in polygons for i in range(0, len(outer), 2)]
+        ys = [outer[i] for outer, _ in polygons for i in range(1, len(outer), 2)]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        self.area = (self.bbox[2] - self.bbox[0]) * (self.bbox[3] - self.bbox[1])
+        self.attributes = attributes
+
+    def contains(self, x: float, y: float) -> bool:
+        min_x, min_y, max_x, max_y = self.bbox
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return False
+        for outer, holes in self.polygons:
+            if _point_in_ring(x, y, outer) and not any(_point_in_ring(x, y, hole) for hole in holes):
+                return True
+        return False
+
+
+class BoundaryGeocoder(GeocoderBackend):
+    """
+    Offline reverse geocoder over a GeoJSON FeatureCollection of polygons.
+
+    Features can be any admin level; when several contain the point (a state
+    and a district inside it), the one with the smallest bounding box wins
+    and missing fields are filled from the larger ones.
+    """
+    name = 'boundary'
+
+    # Grid cell size in degrees (~11 km at the equator)
+    CELL_SIZE = 0.1
+
+    def __init__(self, path: str, cell_size: float = None):
+        self.path = path
+        self.cell_size = cell_size or self.CELL_SIZE
+        self.grid = {}
+        self.regions = []
+        self._load()
+
+    def _cell(self, x: float, y: float):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    @staticmethod
+    def _attributes(properties: dict) -> dict:
+        attributes = {}
+        for field, names in PROPERTY_NAMES.items():
+            attributes[field] = next((str(properties[name]) for name in names if properties.get(name)), '')
+        return attributes
+
+    @staticmethod
+    def _rings(geometry: dict):
+        def flat(ring):
+            return tuple(coordinate for point in ring for coordinate in point[:2])
+
+        if geometry.get('type') == 'Polygon':
+            polygons = [geometry['coordinates']]
+        elif geometry.get('type') == 'MultiPolygon':
+            polygons = geometry['coordinates']
+        else:
+            return []
+        return [(flat(rings[0]), tuple(flat(hole) for hole in rings[1:])) for rings in polygons if rings]
+
+    def _load(self):
+        started = time.monotonic()
+        with open(self.path, encoding='utf-8') as file:
+            collection = json.load(file)
+
+        for feature in collection.get('features', []):
+            polygons = self._rings(feature.get('geometry') or {})
+            if not polygons:
+                continue
+            region = _Region(polygons, self._attributes(feature.get('properties') or {}))
+            self.regions.append(region)
+
+            min_x, min_y, max_x, max_y = region.bbox
+            (cx0, cy0), (cx1, cy1) = self._cell(min_x, min_y), self._cell(max_x, max_y)
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    self.grid.setdefault((cx, cy), []).append(region)
+
+        # Most specific (smallest) regions first in every cell
+        for candidates in self.grid.values():
+            candidates.sort(key=lambda region: region.area)
+
+        logger.info(
+            f"Loaded {len(self.regions)} boundary regions into {len(self.grid)} grid cells "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+
+    def reverse(self, latitude: float, longitude: float):
+        x, y = float(longitude), float(latitude)
+        matches = [region for region in self.grid.get(self._cell(x, y), ()) if region.contains(x, y)]
+        if not matches:
+            return None
+
+        result = dict.fromkeys(PROPERTY_NAMES, '')
+        for region in matches:  # smallest first
+            for field, value in region.attributes.items():
+                if value and not result[field]:
+                    result[field] = value
+        result['country'] = result['country'] or 'India'
+        result['full_address'] = ', '.join(
+            value for value in (result['city'], result['district'], result['state'], result['country']) if value
+        )
+        result['latitude'] = latitude
+        result['longitude'] = longitude
+        return result
+
+
+class NominatimGeocoder(GeocoderBackend):
+    """OpenStreetMap Nominatim API (network, rate limited)"""
+    name = 'nominatim'
+    cacheable = True
+
+    def __init__(self, timeout: int = 5):
+        from geopy.geocoders import Nominatim
+        self.geolocator = Nominatim(user_agent="ecommerce_nizamabad_v1", timeout=timeout)
+
+    @staticmethod
+    def _extract_city(address):
+        """
+        Extract city name from address components
+        Handles various OSM naming conventions
+        """
+        for field in ['city', 'town', 'village', 'municipality', 'suburb']:
+            if field in address:
+                return address[field]
+
+        # Fallback to county or state_district
+        return address.get('county', address.get('state_district', ''))
+
+    def reverse(self, latitude: float, longitude: float):
+        from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+
+        try:
+            location = self.geolocator.reverse(
+                f"{latitude}, {longitude}",
+                language='en',
+                exactly_one=True
+            )
+        except (GeocoderTimedOut, GeocoderServiceError) as e:
+            logger.error(f"Geocoding API error: {e}")
+            raise ValueError("Location service temporarily unavailable")
+
+        if not location:
+            return None
+
+        address = location.raw.get('address', {})
+        return {
+            'city': self._extract_city(address),
+            'district': address.get('state_district', ''),
+            'state': address.get('state', ''),
+            'country': address.get('country', ''),
+            'full_address': location.address,
+            'latitude': latitude,
+            'longitude': longitude
+        }
+
+    def bounding_box(self, query: str):
+        """(lat_min, lat_max, long_min, long_max) of a named place, or None"""
+        from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+
+        try:
+            location = self.geolocator.geocode(query, exactly_one=True, language='en')
+        except (GeocoderTimedOut, GeocoderServiceError) as e:
+            logger.error(f"Geocoding API error: {e}")
+            raise ValueError("Location service temporarily unavailable")
+
+        box = location.raw.get('boundingbox') if location else None
+        if not box:
+            return None
+        south, north, west, east = (float(value) for value in box)
+        return south, north, west, east
+
+
+_lock = threading.Lock()
+_backends = None
+
+
+def get_backends() -> list:
+    """Configured backends in lookup order (built once per process)"""
+    global _backends
+    if _backends is not None:
+        return _backends
+
+    with _lock:
+        if _backends is None:
+            backends = []
+            boundary_file = getattr(settings, 'LOCATION_BOUNDARY_FILE', '')
+            if boundary_file:
+                try:
+                    backends.append(BoundaryGeocoder(boundary_file))
+                except (OSError, ValueError) as e:
+                    logger.error(f"Could not load boundary file {boundary_file}: {e}")
+            if getattr(settings, 'LOCATION_GEOCODER_FALLBACK', True) or not backends:
+                backends.append(NominatimGeocoder())
+            _backends = backends
+    return _backends
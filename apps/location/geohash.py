@@ -0,0 +1,91 @@
+"""
+Geohash encoding helpers for the geocode cache.
+
+Precision (characters) -> approximate cell size:
+    5: 4.9km x 4.9km    6: 1.2km x 0.61km    7: 153m x 153m
+"""
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_DECODE = {char: index for index, char in enumerate(BASE32)}
+
+
+def encode(latitude: float, longitude: float, precision: int = 6) -> str:
+    lat_range = [-90.0, 90.0]
+    long_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # even bits refine longitude
+    while len(chars) < precision:
+        if even:
+            mid = (long_range[0] + long_range[1]) / 2
+            if longitude >= mid:
+                value = (value << 1) | 1
+                long_range[0] = mid
+            else:
+                value <<= 1
+                long_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                value = (value << 1) | 1
+                lat_range[0] = mid
+            else:
+                value <<= 1
+                lat_range[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+    return ''.join(chars)
+
+
+def bbox(cell: str):
+    """(lat_min, lat_max, long_min, long_max) of a geohash cell"""
+    lat_range = [-90.0, 90.0]
+    long_range = [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            target = long_range if even else lat_range
+            mid = (target[0] + target[1]) / 2
+            target[1 - bit] = mid
+            even = not even
+    return lat_range[0], lat_range[1], long_range[0], long_range[1]
+
+
+def center(cell: str):
+    lat_min, lat_max, long_min, long_max = bbox(cell)
+    return (lat_min + lat_max) / 2, (long_min + long_max) / 2
+
+
+def neighbors(cell: str) -> list:
+    """The 8 cells around `cell` (same precision)"""
+    lat_min, lat_max, long_min, long_max = bbox(cell)
+    lat_step, long_step = lat_max - lat_min, long_max - long_min
+    lat, long = (lat_min + lat_max) / 2, (long_min + long_max) / 2
+    return [
+        encode(
+            max(-90.0, min(90.0, lat + dy * lat_step)),
+            (long + dx * long_step + 180.0) % 360.0 - 180.0,
+            len(cell),
+        )
+        for dy in (-1, 0, 1)
+        for dx in (-1, 0, 1)
+        if dx or dy
+    ]
+
+
+def cells_covering(lat_min: float, lat_max: float, long_min: float, long_max: float, precision: int = 6):
+    """Yield every cell intersecting the box (row by row, south to north)"""
+    sample = bbox(encode(lat_min, long_min, precision))
+    lat_step, long_step = sample[1] - sample[0], sample[3] - sample[2]
+    lat = sample[0] + lat_step / 2
+    while lat - lat_step / 2 <= lat_max:
+        long = sample[2] + long_step / 2
+        while long - long_step / 2 <= long_max:
+            yield encode(lat, long, precision)
+            long += long_step
+        lat += lat_step
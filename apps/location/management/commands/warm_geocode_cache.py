@@ -0,0 +1,27 @@
+"""
+Management command to pre-resolve geocode cache cells covering active service areas
+"""
+from django.core.management.base import BaseCommand
+from apps.location.services import GeocodeCache
+
+
+class Command(BaseCommand):
+    help = 'Warm the geohash geocode cache for every active ServiceArea'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-cells', type=int, default=5000, help='Stop after this many cells')
+        parser.add_argument('--delay', type=float, default=1.0, help='Seconds between geocoder calls (Nominatim allows 1/s)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count cells and cached entries')
+
+    def handle(self, *args, **options):
+        stats = GeocodeCache.warm(
+            max_cells=options['max_cells'],
+            delay=options['delay'],
+            dry_run=options['dry_run'],
+        )
+        prefix = '[DRY RUN] ' if stats['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{stats['cells']} cells over {stats['areas']} areas: {stats['cached']} already cached, "
+            f"{stats['resolved']} resolved, {stats['offline']} offline, {stats['failed']} failed"
+        ))
+        self.stdout.write(f"Cache metrics: {GeocodeCache.metrics()}")
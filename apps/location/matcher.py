@@ -0,0 +1,106 @@
+"""
+Service Area Matcher
+
+Active ServiceArea rows compiled into a nested dict
+country -> state -> district -> city (normalized; '' = any), so deciding
+availability is at most 16 dict lookups plus bounding-box checks on the few
+candidates, with no queries. Cached per process and invalidated through a
+version key bumped after ServiceArea saves/deletes commit (see
+apps.location.signals and apps.core.versioned_cache).
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from apps.core.versioned_cache import VersionedProcessCache
+
+VERSION_KEY = "service_area_matcher_version"
+
+LEVELS = ('country', 'state', 'district', 'city')
+
+
+def normalize(value) -> str:
+    return (value or '').strip().lower()
+
+
+@dataclass(frozen=True)
+class CompiledArea:
+    position: int  # rank in ServiceArea ordering; earliest match wins
+    area: object
+    bbox: Optional[Tuple[Optional[float], Optional[float], Optional[float], Optional[float]]]
+
+    def contains(self, latitude, longitude) -> bool:
+        """Inside the area's bounding box (missing bounds are open)"""
+        if self.bbox is None:
+            return True
+        if latitude is None or longitude is None:
+            return False
+        lat_min, lat_max, long_min, long_max = self.bbox
+        return (
+            (lat_min is None or latitude >= lat_min)
+            and (lat_max is None or latitude <= lat_max)
+            and (long_min is None or longitude >= long_min)
+            and (long_max is None or longitude <= long_max)
+        )
+
+
+class ServiceAreaMatcher:
+    def __init__(self, version: int, areas=()):
+        self.version = version
+        self.tree = {}
+        self.areas = tuple(areas)
+        for position, area in enumerate(self.areas):
+            bounds = (area.lat_min, area.lat_max, area.long_min, area.long_max)
+            compiled = CompiledArea(
+                position=position,
+                area=area,
+                bbox=None if all(bound is None for bound in bounds) else bounds,
+            )
+            node = self.tree
+            for level in LEVELS[:-1]:
+                node = node.setdefault(normalize(getattr(area, level)), {})
+            node.setdefault(normalize(area.city), []).append(compiled)
+
+    def __bool__(self):
+        return bool(self.areas)
+
+    def match(self, geocoded_data: dict):
+        """First active ServiceArea covering the geocoded location, or None"""
+        keys = [normalize(geocoded_data.get(level)) for level in LEVELS]
+        latitude = geocoded_data.get('latitude')
+        longitude = geocoded_data.get('longitude')
+
+        best = None
+        nodes = [self.tree]
+        for key in keys:
+            next_nodes = []
+            for node in nodes:
+                for candidate_key in ((key, '') if key else ('',)):
+                    child = node.get(candidate_key)
+                    if child is not None:
+                        next_nodes.append(child)
+            nodes = next_nodes
+        for candidates in nodes:
+            for compiled in candidates:
+                if (best is None or compiled.position < best.position) and compiled.contains(latitude, longitude):
+                    best = compiled
+        return best.area if best else None
+
+    def summary(self, limit: int = 3) -> list:
+        return [str(area) for area in self.areas[:limit]]
+
+
+def build_matcher(version: int) -> ServiceAreaMatcher:
+    from .models import ServiceArea
+    return ServiceAreaMatcher(version, ServiceArea.objects.filter(is_active=True))
+
+
+_cache = VersionedProcessCache(VERSION_KEY, build_matcher, "Service area matcher")
+
+
+def get_matcher() -> ServiceAreaMatcher:
+    """Current matcher; rebuilt when the shared version moves"""
+    return _cache.get()
+
+
+def bump_version():
+    """Invalidate the matcher in every worker once the current transaction commits"""
+    _cache.invalidate()
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.10 on 2026-10-19 15:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='locationattempt',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='LocationAttemptDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('city', models.CharField(blank=True, max_length=100)),
+                ('state', models.CharField(blank=True, max_length=100)),
+                ('allowed_count', models.PositiveIntegerField(default=0)),
+                ('denied_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-date', 'state', 'city'],
+                'indexes': [models.Index(fields=['date'], name='location_lo_date_7a6f4f_idx')],
+                'unique_together': {('date', 'city', 'state')},
+            },
+        ),
+    ]
@@ -151,8 +151,8 @@ class LocationAttempt(models.Model):
         on_delete=models.SET_NULL
     )
     
-    # Metadata
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Metadata (set when the attempt happens; rows are written later in batches)
+    timestamp = models.DateTimeField(default=timezone.now)
     ip_address = models.GenericIPAddressField()
     user_agent = models.TextField(blank=True)
     correlation_id = models.CharField(max_length=100, blank=True)
@@ -168,3 +168,25 @@ class LocationAttempt(models.Model):
     def __str__(self):
         status = "ALLOWED" if self.was_allowed else "DENIED"
         return f"{self.user.mobile_number} - {status} - {self.timestamp}"
+
+
+class LocationAttemptDaily(models.Model):
+    """
+    Per-day, per-city rollup of LocationAttempt. Raw attempts are deleted
+    after LOCATION_ATTEMPT_RETENTION_DAYS; analytics read these rows.
+    """
+    date = models.DateField()
+    city = models.CharField(max_length=100, blank=True)
+    state = models.CharField(max_length=100, blank=True)
+    allowed_count = models.PositiveIntegerField(default=0)
+    denied_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = [['date', 'city', 'state']]
+        indexes = [
+            models.Index(fields=['date'])
+        ]
+        ordering = ['-date', 'state', 'city']
+    
+    def __str__(self):
+        return f"{self.date} - {self.city}, {self.state}: {self.allowed_count}/{self.denied_count}"
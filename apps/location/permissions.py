@@ -2,9 +2,8 @@
 Location Enforcement Permission Class
 """
 from rest_framework.permissions import IsAuthenticated
-from django.utils import timezone
 from django.conf import settings
-from apps.location.models import CustomerLocation
+from apps.location.services import LocationVerificationCache
 import logging
 
 logger = logging.getLogger('location')
@@ -33,25 +32,18 @@ class HasVerifiedLocation(IsAuthenticated):
         if hasattr(request.user, 'role') and request.user.role == 'ADMIN':
             return True
         
-        # Check location verification
-        try:
-            location = CustomerLocation.objects.get(user=request.user)
-            
-            # Check if expired
-            if timezone.now() > location.expires_at:
-                logger.warning(f"Expired location for {request.user.mobile_number}")
-                self.message = "Location verification expired. Please verify your location again."
-                return False
-            
-            # Check if verified
-            if not location.is_verified:
-                logger.warning(f"Unverified location for {request.user.mobile_number}")
-                self.message = "Location not verified. Please complete location verification."
-                return False
-            
+        # Check location verification (cached state, see LocationVerificationCache)
+        state = LocationVerificationCache.get_state(request.user.pk)
+        if state == LocationVerificationCache.VERIFIED:
             return True
         
-        except CustomerLocation.DoesNotExist:
+        if state == LocationVerificationCache.EXPIRED:
+            logger.warning(f"Expired location for {request.user.mobile_number}")
+            self.message = "Location verification expired. Please verify your location again."
+        elif state == LocationVerificationCache.UNVERIFIED:
+            logger.warning(f"Unverified location for {request.user.mobile_number}")
+            self.message = "Location not verified. Please complete location verification."
+        else:
             logger.warning(f"No location record for {request.user.mobile_number}")
             self.message = "Location verification required. Please allow location access to browse products."
-            return False
+        return False
@@ -2,103 +2,209 @@
 Location Service
 Handles reverse geocoding and service area validation
 """
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+from django.conf import settings
 from django.core.cache import cache
-from datetime import timedelta
+from . import geohash
+from .geocoders import get_backends
+from .matcher import get_matcher
 import logging
-import hashlib
 
 logger = logging.getLogger(__name__)
 
-class LocationService:
-    
-    # Nominatim geolocator (OpenStreetMap)
-    geolocator = Nominatim(
-        user_agent="ecommerce_nizamabad_v1",
-        timeout=5
-    )
-    
+class GeocodeCache:
+    """
+    City-level geocode results shared per geohash cell.
+
+    Every point in a cell (LOCATION_GEOHASH_PRECISION characters, ~1.2km x
+    0.6km at 6) reuses one entry, and a cell whose 8 neighbours all agree on
+    the same place reuses that too. Hit/miss counters are kept in the cache.
+    """
+    KEY_PREFIX = "geocode"
+    METRICS_KEY = "ecom:metrics:geocode_cache"
+    METRICS = ('hits', 'neighbor_hits', 'misses', 'geocoder_calls')
+    FIELDS = ('city', 'district', 'state', 'country')
+
     # Cache geocode results for 7 days
-    CACHE_TTL = 60 * 60 * 24 * 7
+    TTL = 60 * 60 * 24 * 7
+
+    @staticmethod
+    def precision() -> int:
+        return getattr(settings, 'LOCATION_GEOHASH_PRECISION', 6)
+
+    @classmethod
+    def cell_for(cls, latitude, longitude) -> str:
+        return geohash.encode(latitude, longitude, cls.precision())
+
+    @classmethod
+    def _key(cls, cell: str) -> str:
+        return f"{cls.KEY_PREFIX}:gh:{cell}"
+
+    @classmethod
+    def record(cls, metric: str, amount: int = 1):
+        key = f"{cls.METRICS_KEY}:{metric}"
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            cache.set(key, amount, timeout=None)
+
+    @classmethod
+    def metrics(cls) -> dict:
+        values = cache.get_many([f"{cls.METRICS_KEY}:{metric}" for metric in cls.METRICS])
+        result = {metric: values.get(f"{cls.METRICS_KEY}:{metric}", 0) for metric in cls.METRICS}
+        lookups = result['hits'] + result['neighbor_hits'] + result['misses']
+        result['hit_rate'] = round((result['hits'] + result['neighbor_hits']) / lookups, 4) if lookups else None
+        return result
+
+    @classmethod
+    def get(cls, cell: str):
+        """City-level entry for the cell, or None (counts a hit or a miss)"""
+        entry = cache.get(cls._key(cell))
+        if entry:
+            cls.record('hits')
+            return entry
+
+        around = cache.get_many([cls._key(neighbor) for neighbor in geohash.neighbors(cell)])
+        places = {tuple(value[field] for field in cls.FIELDS) for value in around.values()}
+        if len(around) == 8 and len(places) == 1:
+            # Surrounded by one place: this cell is in it too
+            entry = next(iter(around.values()))
+            cache.set(cls._key(cell), entry, cls.TTL)
+            cls.record('neighbor_hits')
+            return entry
+
+        cls.record('misses')
+        return None
+
+    @classmethod
+    def set(cls, cell: str, result: dict):
+        cache.set(cls._key(cell), {field: result.get(field, '') for field in cls.FIELDS}, cls.TTL)
+
+    @classmethod
+    def warm(cls, max_cells: int = 5000, delay: float = 0, dry_run: bool = False) -> dict:
+        """
+        Pre-resolve the cells covering active ServiceAreas: their bounding box
+        when set, otherwise the place's box from a forward geocode. Cells the
+        offline backend resolves need no entry and are skipped.
+        """
+        import time
+        from .geocoders import NominatimGeocoder
+        from .models import ServiceArea
+
+        backends = get_backends()
+        remote = next((backend for backend in backends if backend.cacheable), None)
+        stats = {'areas': 0, 'cells': 0, 'cached': 0, 'resolved': 0, 'offline': 0, 'failed': 0, 'dry_run': dry_run}
+        if remote is None:
+            return stats  # nothing to warm: every lookup is offline
+
+        cells = []
+        for area in ServiceArea.objects.filter(is_active=True):
+            box = (area.lat_min, area.lat_max, area.long_min, area.long_max)
+            if None in box:
+                if not isinstance(remote, NominatimGeocoder):
+                    continue
+                try:
+                    box = remote.bounding_box(str(area))
+                except ValueError:
+                    box = None
+                if box is None:
+                    logger.warning(f"Geocode warm-up: no bounding box for {area}")
+                    continue
+            stats['areas'] += 1
+            cells.extend(geohash.cells_covering(*box, precision=cls.precision()))
+        cells = list(dict.fromkeys(cells))[:max_cells]
+        stats['cells'] = len(cells)
+
+        for start in range(0, len(cells), 500):
+            chunk = cells[start:start + 500]
+            present = cache.get_many([cls._key(cell) for cell in chunk])
+            for cell in chunk:
+                if cls._key(cell) in present:
+                    stats['cached'] += 1
+                    continue
+                if dry_run:
+                    continue
+                latitude, longitude = geohash.center(cell)
+                offline = next(
+                    (result for result in (
+                        backend.reverse(latitude, longitude) for backend in backends if not backend.cacheable
+                    ) if result and result.get('city')),
+                    None
+                )
+                if offline:
+                    stats['offline'] += 1
+                    continue
+                try:
+                    cls.record('geocoder_calls')
+                    result = remote.reverse(latitude, longitude)
+                except Exception as e:
+                    logger.warning(f"Geocode warm-up failed for cell {cell}: {e}")
+                    result = None
+                if result and result.get('city'):
+                    cls.set(cell, result)
+                    stats['resolved'] += 1
+                else:
+                    stats['failed'] += 1
+                if delay:
+                    time.sleep(delay)
+
+        logger.info(f"Geocode cache warm-up: {stats}")
+        return stats
+
+    @classmethod
+    def for_point(cls, entry: dict, latitude, longitude) -> dict:
+        result = dict(entry)
+        result['full_address'] = ', '.join(result[field] for field in ('city', 'district', 'state', 'country') if result[field])
+        result['latitude'] = latitude
+        result['longitude'] = longitude
+        return result
+
+
+class LocationService:
     
     @classmethod
     def reverse_geocode(cls, latitude, longitude):
         """
-        Convert coordinates to location details
-        Uses caching to reduce API calls
+        Convert coordinates to location details.
+        Tries the configured backends in order (offline boundary index first,
+        Nominatim as fallback); remote results are cached per geohash cell
+        (see GeocodeCache).
         """
-        # Generate cache key
-        cache_key = cls._get_cache_key(latitude, longitude)
-        
-        # Check cache
-        cached_result = cache.get(cache_key)
-        if cached_result:
-            logger.info(f"Geocode cache hit for {latitude}, {longitude}")
-            return cached_result
+        cell = None
+        partial = None  # resolved without a city; kept if no later backend does better
         
-        # Call geocoding API
-        try:
-            location = cls.geolocator.reverse(
-                f"{latitude}, {longitude}",
-                language='en',
-                exactly_one=True
-            )
-            
-            if not location:
-                raise ValueError("No location found for coordinates")
+        for backend in get_backends():
+            if backend.cacheable and cell is None:
+                cell = GeocodeCache.cell_for(latitude, longitude)
+                entry = GeocodeCache.get(cell)
+                if entry:
+                    return GeocodeCache.for_point(entry, latitude, longitude)
             
-            # Parse address components
-            address = location.raw.get('address', {})
+            try:
+                if backend.cacheable:
+                    GeocodeCache.record('geocoder_calls')
+                result = backend.reverse(latitude, longitude)
+            except Exception as e:
+                if partial:
+                    logger.warning(f"Geocoding fallback {backend.name} failed, using offline result: {e}")
+                    return partial
+                if isinstance(e, ValueError):
+                    raise
+                logger.error(f"Geocoding failed ({backend.name}): {e}")
+                raise ValueError("Unable to verify location")
             
-            result = {
-                'city': cls._extract_city(address),
-                'district': address.get('state_district', ''),
-                'state': address.get('state', ''),
-                'country': address.get('country', ''),
-                'full_address': location.address,
-                'latitude': latitude,
-                'longitude': longitude
-            }
-            
-            # Cache result
-            cache.set(cache_key, result, cls.CACHE_TTL)
-            
-            logger.info(f"Geocoded: {result['city']}, {result['state']}")
+            if not result:
+                continue
+            if not result.get('city'):
+                partial = partial or result
+                continue
+            if backend.cacheable:
+                GeocodeCache.set(cell, result)
+            logger.info(f"Geocoded ({backend.name}): {result['city']}, {result['state']}")
             return result
         
-        except (GeocoderTimedOut, GeocoderServiceError) as e:
-            logger.error(f"Geocoding API error: {e}")
-            raise ValueError("Location service temporarily unavailable")
-        
-        except Exception as e:
-            logger.error(f"Geocoding failed: {e}")
-            raise ValueError("Unable to verify location")
-    
-    @classmethod
-    def _extract_city(cls, address):
-        """
-        Extract city name from address components
-        Handles various OSM naming conventions
-        """
-        # Try different city fields
-        for field in ['city', 'town', 'village', 'municipality', 'suburb']:
-            if field in address:
-                return address[field]
-        
-        # Fallback to county or state_district
-        return address.get('county', address.get('state_district', ''))
-    
-    @classmethod
-    def _get_cache_key(cls, lat, long):
-        """
-        Generate cache key for coordinates
-        Rounded to 4 decimal places (~11m precision)
-        """
-        lat_rounded = round(lat, 4)
-        long_rounded = round(long, 4)
-        key_str = f"geocode:{lat_rounded}:{long_rounded}"
-        return hashlib.md5(key_str.encode()).hexdigest()
+        if partial:
+            return partial
+        raise ValueError("Unable to verify location")
     
     @classmethod
     def validate_coordinates(cls, latitude, longitude):
@@ -124,27 +230,302 @@ class LocationService:
     def check_service_availability(cls, geocoded_data):
         """
         Check if location is within any active service area
+        (compiled in-memory matcher, no queries)
         Returns (is_available, matched_area, denial_reason)
         """
-        from apps.location.models import ServiceArea
+        matcher = get_matcher()
         
-        # Get all active service areas
-        active_areas = ServiceArea.objects.filter(is_active=True)
-        
-        if not active_areas.exists():
+        if not matcher:
             return False, None, "Service not yet available in any region"
         
-        # Check each service area
-        for area in active_areas:
-            if area.matches_location(geocoded_data):
-                return True, area, None
+        matched_area = matcher.match(geocoded_data)
+        if matched_area:
+            return True, matched_area, None
         
         # Build denial message
-        available_areas = [str(area) for area in active_areas[:3]]
         denial_reason = (
             f"Service not available in {geocoded_data.get('city', 'your location')}, "
             f"{geocoded_data.get('state', '')}. "
-            f"Currently serving: {', '.join(available_areas)}"
+            f"Currently serving: {', '.join(matcher.summary())}"
         )
         
         return False, None, denial_reason
+
+
+class LocationVerificationCache:
+    """
+    Per-user location verification state in the cache, so HasVerifiedLocation
+    needs no query. A verified entry lives exactly until the location's
+    expires_at; other states are cached briefly. Entries are rewritten on every
+    CustomerLocation save and dropped on delete (apps.location.signals), which
+    covers VerifyLocationView and admin revocation.
+    """
+    KEY_PREFIX = "location:verified"
+    VERIFIED = 'VERIFIED'
+    EXPIRED = 'EXPIRED'
+    UNVERIFIED = 'UNVERIFIED'
+    MISSING = 'MISSING'
+
+    # TTL for non-verified states (they change through a save, which refreshes them)
+    NEGATIVE_TTL = 300
+
+    @classmethod
+    def _key(cls, user_id) -> str:
+        return f"{cls.KEY_PREFIX}:{user_id}"
+
+    @classmethod
+    def store(cls, user_id, location=None) -> str:
+        """Cache the state derived from `location` (None = no record) and return it"""
+        from django.utils import timezone
+
+        now = timezone.now()
+        if location is None:
+            state, timeout = cls.MISSING, cls.NEGATIVE_TTL
+        elif not location.is_verified:
+            state, timeout = cls.UNVERIFIED, cls.NEGATIVE_TTL
+        elif location.expires_at < now:
+            state, timeout = cls.EXPIRED, cls.NEGATIVE_TTL
+        else:
+            state = cls.VERIFIED
+            timeout = max(1, int((location.expires_at - now).total_seconds()))
+        cache.set(cls._key(user_id), state, timeout=timeout)
+        return state
+
+    @classmethod
+    def get_state(cls, user_id) -> str:
+        state = cache.get(cls._key(user_id))
+        if state is not None:
+            return state
+
+        from .models import CustomerLocation
+        location = CustomerLocation.objects.filter(user_id=user_id).only(
+            'is_verified', 'expires_at'
+        ).first()
+        return cls.store(user_id, location)
+
+    @classmethod
+    def invalidate(cls, *user_ids):
+        cache.delete_many([cls._key(user_id) for user_id in user_ids])
+
+
+class LocationAttemptService:
+    """
+    Buffered audit log of location verification attempts.
+
+    VerifyLocationView pushes each attempt onto a Redis list; a Celery task
+    drains it with bulk inserts. The retention job rolls complete days into
+    LocationAttemptDaily and deletes raw rows past the retention window.
+    """
+    BUFFER_KEY = "ecom:location_attempts:buffer"
+    # Kick a flush as soon as this many attempts are waiting (beat also flushes periodically)
+    FLUSH_THRESHOLD = 200
+    USER_AGENT_MAX_LENGTH = 256
+
+    FIELDS = (
+        'user_id', 'latitude', 'longitude', 'accuracy', 'submitted_timestamp',
+        'city', 'district', 'state', 'country', 'was_allowed', 'denial_reason',
+        'matched_service_area_id', 'ip_address', 'user_agent', 'correlation_id', 'timestamp',
+    )
+
+    @classmethod
+    def record(cls, **fields):
+        """Queue one attempt; falls back to a direct insert if Redis is unavailable"""
+        import json
+        from django.core.serializers.json import DjangoJSONEncoder
+        from django.utils import timezone
+        from django_redis import get_redis_connection
+        from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+        fields.setdefault('timestamp', timezone.now())
+        fields['user_agent'] = (fields.get('user_agent') or '')[:cls.USER_AGENT_MAX_LENGTH]
+        fields['correlation_id'] = fields.get('correlation_id') or ''
+        # Datetimes as ISO strings, UUID keys as strings (flush parses them back)
+        payload = json.dumps(fields, cls=DjangoJSONEncoder)
+        try:
+            pending = get_redis_connection("default").rpush(cls.BUFFER_KEY, payload)
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            logger.warning(f"Location attempt buffer unavailable, writing directly: {e}")
+            from .models import LocationAttempt
+            LocationAttempt.objects.create(**fields)
+            return
+
+        if pending == cls.FLUSH_THRESHOLD:
+            from .tasks import flush_location_attempts_async
+            flush_location_attempts_async.delay()
+
+    @classmethod
+    def flush(cls, batch_size: int = None, max_batches: int = None) -> int:
+        """Drain the buffer into LocationAttempt in bulk inserts; returns rows written"""
+        import json
+        from django.utils.dateparse import parse_datetime
+        from django_redis import get_redis_connection
+        from .models import LocationAttempt
+
+        batch_size = batch_size or settings.LOCATION_ATTEMPT_FLUSH_BATCH_SIZE
+        con = get_redis_connection("default")
+        written = batches = 0
+        while max_batches is None or batches < max_batches:
+            # Take and remove the head of the list atomically
+            pipe = con.pipeline(transaction=True)
+            pipe.lrange(cls.BUFFER_KEY, 0, batch_size - 1)
+            pipe.ltrim(cls.BUFFER_KEY, batch_size, -1)
+            raw_items, _ = pipe.execute()
+            if not raw_items:
+                break
+
+            attempts = []
+            for raw in raw_items:
+                data = json.loads(raw)
+                for name in ('timestamp', 'submitted_timestamp'):
+                    if data.get(name):
+                        data[name] = parse_datetime(data[name])
+                attempts.append(LocationAttempt(**{name: data.get(name) for name in cls.FIELDS if name in data}))
+            try:
+                LocationAttempt.objects.bulk_create(attempts, batch_size=batch_size)
+            except Exception:
+                # Put the batch back so the next run retries it
+                con.lpush(cls.BUFFER_KEY, *reversed(raw_items))
+                raise
+            written += len(attempts)
+            batches += 1
+        if written:
+            logger.info(f"Flushed {written} location attempts in {batches} batches")
+        return written
+
+    @classmethod
+    def rollup(cls) -> int:
+        """
+        Aggregate every complete day whose raw attempts are not all in its rollup.
+
+        A day is (re)computed from scratch when it has more raw attempts than
+        its rollup counts: never rolled up, or attempts flushed from the buffer
+        after it was. Pruning removes whole days, so a day's raw rows are
+        either all present or all gone.
+        """
+        from datetime import datetime, time as dt_time
+        from django.db import transaction
+        from django.db.models import Count, F, Q, Sum
+        from django.db.models.functions import TruncDate
+        from django.utils import timezone
+        from .models import LocationAttempt, LocationAttemptDaily
+
+        today_start = timezone.make_aware(datetime.combine(timezone.localdate(), dt_time.min))
+        raw = LocationAttempt.objects.filter(timestamp__lt=today_start).annotate(day=TruncDate('timestamp'))
+        raw_counts = dict(raw.values_list('day').annotate(total=Count('id')).order_by())
+        if not raw_counts:
+            return 0
+        rolled_counts = dict(
+            LocationAttemptDaily.objects.filter(date__in=raw_counts)
+            .values_list('date')
+            .annotate(total=Sum(F('allowed_count') + F('denied_count')))
+            .order_by()
+        )
+        pending_days = {day for day, total in raw_counts.items() if total > rolled_counts.get(day, 0)}
+        if not pending_days:
+            return 0
+
+        rows = (
+            raw.filter(day__in=pending_days)
+            .values('day', 'city', 'state')
+            .annotate(
+                allowed=Count('id', filter=Q(was_allowed=True)),
+                denied=Count('id', filter=Q(was_allowed=False)),
+            )
+            .order_by()
+        )
+        with transaction.atomic():
+            LocationAttemptDaily.objects.filter(date__in=pending_days).delete()
+            LocationAttemptDaily.objects.bulk_create([
+                LocationAttemptDaily(
+                    date=row['day'], city=row['city'], state=row['state'],
+                    allowed_count=row['allowed'], denied_count=row['denied'],
+                )
+                for row in rows
+            ])
+        logger.info(f"Rolled up location attempts for {len(pending_days)} days")
+        return len(pending_days)
+
+    @classmethod
+    def prune(cls, retention_days: int = None, batch_size: int = None) -> int:
+        """Delete raw attempts of days past the retention window, in pk batches"""
+        from datetime import datetime, time as dt_time, timedelta
+        from django.db import transaction
+        from django.utils import timezone
+        from .models import LocationAttempt
+
+        retention_days = retention_days or settings.LOCATION_ATTEMPT_RETENTION_DAYS
+        batch_size = batch_size or settings.LOCATION_ATTEMPT_FLUSH_BATCH_SIZE
+        # Whole days only (see rollup)
+        cutoff = timezone.make_aware(
+            datetime.combine(timezone.localdate() - timedelta(days=retention_days), dt_time.min)
+        )
+        expired = LocationAttempt.objects.filter(timestamp__lt=cutoff).order_by('pk')
+
+        deleted = 0
+        while True:
+            ids = list(expired.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                count, _ = LocationAttempt.objects.filter(pk__in=ids).delete()
+            deleted += count
+        return deleted
+
+    @classmethod
+    def run_retention(cls, retention_days: int = None) -> dict:
+        """Flush, roll up complete days, then prune (rollup always precedes deletion)"""
+        flushed = cls.flush()
+        days = cls.rollup()
+        deleted = cls.prune(retention_days)
+        stats = {'flushed': flushed, 'days_rolled_up': days, 'deleted': deleted}
+        logger.info(f"Location attempt retention: {stats}")
+        return stats
+
+    @staticmethod
+    def daily_summary(days: int = 30) -> dict:
+        """Allowed/denied per day and per city from the rollups, plus today live"""
+        from datetime import timedelta
+        from django.db.models import Count, Q, Sum
+        from django.utils import timezone
+        from .models import LocationAttempt, LocationAttemptDaily
+
+        today = timezone.localdate()
+        since = today - timedelta(days=days)
+        rollups = LocationAttemptDaily.objects.filter(date__gte=since)
+
+        per_day = {
+            row['date']: {'allowed': row['allowed'], 'denied': row['denied']}
+            for row in rollups.values('date').annotate(
+                allowed=Sum('allowed_count'), denied=Sum('denied_count')
+            ).order_by()
+        }
+        per_city = {
+            (row['city'], row['state']): {'allowed': row['allowed'], 'denied': row['denied']}
+            for row in rollups.values('city', 'state').annotate(
+                allowed=Sum('allowed_count'), denied=Sum('denied_count')
+            ).order_by()
+        }
+
+        # Today (and any day not rolled up yet) comes from the raw rows
+        missing_days = [since + timedelta(days=n) for n in range(days + 1) if since + timedelta(days=n) not in per_day]
+        if missing_days:
+            live = LocationAttempt.objects.filter(timestamp__date__in=missing_days)
+            for row in live.values('timestamp__date', 'city', 'state').annotate(
+                allowed=Count('id', filter=Q(was_allowed=True)),
+                denied=Count('id', filter=Q(was_allowed=False)),
+            ).order_by():
+                for bucket in (
+                    per_day.setdefault(row['timestamp__date'], {'allowed': 0, 'denied': 0}),
+                    per_city.setdefault((row['city'], row['state']), {'allowed': 0, 'denied': 0}),
+                ):
+                    bucket['allowed'] += row['allowed']
+                    bucket['denied'] += row['denied']
+
+        return {
+            'since': since,
+            'days': [{'date': day, **counts} for day, counts in sorted(per_day.items())],
+            'cities': sorted(
+                ({'city': city, 'state': state, **counts} for (city, state), counts in per_city.items()),
+                key=lambda row: -(row['allowed'] + row['denied'])
+            ),
+        }
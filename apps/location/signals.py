@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import ServiceArea, CustomerLocation
+from .matcher import bump_version
+from .services import LocationVerificationCache
+
+@receiver([post_save, post_delete], sender=ServiceArea)
+def invalidate_service_area_matcher(sender, instance, **kwargs):
+    # All workers recompile their ServiceAreaMatcher on the next version check after commit
+    bump_version()
+
+@receiver(post_save, sender=CustomerLocation)
+def refresh_location_verification(sender, instance, **kwargs):
+    LocationVerificationCache.store(instance.user_id, instance)
+
+@receiver(post_delete, sender=CustomerLocation)
+def drop_location_verification(sender, instance, **kwargs):
+    LocationVerificationCache.invalidate(instance.user_id)
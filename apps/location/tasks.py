@@ -0,0 +1,23 @@
+"""
+Celery Tasks for location verification background work
+"""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_location_attempts_async():
+    """Drain buffered location attempts into the database (beat + size-triggered)."""
+    from .services import LocationAttemptService
+
+    return {'written': LocationAttemptService.flush()}
+
+
+@shared_task
+def location_attempt_retention_async():
+    """Periodic entry point (Celery beat): roll up complete days and prune old raw attempts."""
+    from .services import LocationAttemptService
+
+    return LocationAttemptService.run_retention()
@@ -0,0 +1,57 @@
+import json
+from datetime import datetime, time, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import LocationAttempt, LocationAttemptDaily
+from .services import LocationAttemptService
+
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+        return len(self.lists[key])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class LocationAttemptServiceTest(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('9000000001', email='attempts@example.com')
+
+    def _attempt(self, **fields):
+        values = {
+            'user_id': self.user.pk, 'latitude': 12.97, 'longitude': 77.59, 'accuracy': 10.0,
+            'submitted_timestamp': timezone.now(), 'city': 'Bengaluru', 'state': 'Karnataka',
+            'was_allowed': True, 'ip_address': '127.0.0.1',
+        }
+        values.update(fields)
+        return values
+
+    def test_record_lands_in_buffer(self):
+        redis = FakeRedis()
+        with mock.patch('django_redis.get_redis_connection', return_value=redis):
+            LocationAttemptService.record(**self._attempt())
+
+        buffered = redis.lists[LocationAttemptService.BUFFER_KEY]
+        self.assertEqual(len(buffered), 1)
+        self.assertEqual(json.loads(buffered[0])['user_id'], str(self.user.pk))
+        self.assertFalse(LocationAttempt.objects.exists())
+
+    def test_rollup_counts_attempts_flushed_after_the_day_was_rolled_up(self):
+        yesterday = timezone.make_aware(datetime.combine(timezone.localdate() - timedelta(days=1), time(12)))
+        LocationAttempt.objects.create(**self._attempt(timestamp=yesterday))
+        self.assertEqual(LocationAttemptService.rollup(), 1)
+
+        LocationAttempt.objects.create(**self._attempt(timestamp=yesterday, was_allowed=False))
+        self.assertEqual(LocationAttemptService.rollup(), 1)
+        self.assertEqual(LocationAttemptService.rollup(), 0)
+
+        daily = LocationAttemptDaily.objects.get()
+        self.assertEqual((daily.allowed_count, daily.denied_count), (1, 1))
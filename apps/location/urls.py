@@ -2,7 +2,8 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     VerifyLocationView, LocationStatusView, ServiceAreasPublicView,
-    AdminServiceAreaViewSet, AdminLocationAttemptsView
+    AdminServiceAreaViewSet, AdminLocationAttemptsView, AdminGeocodeCacheView,
+    AdminLocationAnalyticsView
 )
 
 router = DefaultRouter()
@@ -14,4 +15,6 @@ urlpatterns = [
     path('location/status', LocationStatusView.as_view(), name='location-status'),
     path('location/service-areas', ServiceAreasPublicView.as_view(), name='service-areas'),
     path('admin/location-attempts', AdminLocationAttemptsView.as_view(), name='admin-location-attempts'),
+    path('admin/location/geocode-cache', AdminGeocodeCacheView.as_view(), name='admin-geocode-cache'),
+    path('admin/location/analytics', AdminLocationAnalyticsView.as_view(), name='admin-location-analytics'),
 ]
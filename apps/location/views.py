@@ -9,15 +9,15 @@ from rest_framework.decorators import action
 from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
-from django.core.cache import cache
 from .models import ServiceArea, CustomerLocation, LocationAttempt
 from .serializers import (
     VerifyLocationSerializer, ServiceAreaSerializer, 
     CustomerLocationSerializer, LocationAttemptSerializer,
     AdminServiceAreaSerializer
 )
-from .services import LocationService
+from .services import LocationService, GeocodeCache, LocationAttemptService
 from apps.core.models import AuditLog
+from apps.core.services.redis_service import RedisService
 import logging
 
 logger = logging.getLogger('location')
@@ -32,11 +32,9 @@ class VerifyLocationView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
-        # Rate limit: 5 requests per 10 minutes
+        # Rate limit: 5 denied attempts per sliding 10 minutes (checked here, consumed on denial)
         rate_limit_key = f"location:verify:{request.user.id}"
-        attempts = cache.get(rate_limit_key, 0)
-        
-        if attempts >= 5:
+        if not RedisService.rate_limit(rate_limit_key, limit=5, window=600, cost=0).allowed:
             return Response({
                 'error': 'Too many verification attempts. Please try again later.'
             }, status=status.HTTP_429_TOO_MANY_REQUESTS)
@@ -60,9 +58,9 @@ class VerifyLocationView(APIView):
             # Check service availability
             is_available, matched_area, denial_reason = LocationService.check_service_availability(geocoded)
             
-            # Log attempt
-            attempt = LocationAttempt.objects.create(
-                user=request.user,
+            # Log attempt (buffered, written in bulk by a background task)
+            LocationAttemptService.record(
+                user_id=request.user.pk,
                 latitude=lat,
                 longitude=long,
                 accuracy=accuracy,
@@ -73,7 +71,7 @@ class VerifyLocationView(APIView):
                 country=geocoded.get('country', ''),
                 was_allowed=is_available,
                 denial_reason=denial_reason or '',
-                matched_service_area=matched_area,
+                matched_service_area_id=matched_area.pk if matched_area else None,
                 ip_address=self._get_client_ip(request),
                 user_agent=request.META.get('HTTP_USER_AGENT', ''),
                 correlation_id=getattr(request, 'correlation_id', None)
@@ -118,8 +116,8 @@ class VerifyLocationView(APIView):
                 # Denied
                 logger.warning(f"Location denied for {request.user.mobile_number}: {denial_reason}")
                 
-                # Increment rate limit counter
-                cache.set(rate_limit_key, attempts + 1, timeout=600)
+                # Count the denial against the rate limit
+                RedisService.rate_limit(rate_limit_key, limit=5, window=600)
                 
                 return Response({
                     'verified': False,
@@ -282,3 +280,33 @@ class AdminLocationAttemptsView(APIView):
             'attempts': serializer.data,
             'total': queryset.count()
         })
+
+class AdminGeocodeCacheView(APIView):
+    """
+    GET /api/v1/admin/location/geocode-cache
+    Geocode cache hit/miss counters
+    """
+    from apps.products.admin_views import IsAdminUser
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        return Response({
+            'precision': GeocodeCache.precision(),
+            **GeocodeCache.metrics()
+        })
+
+class AdminLocationAnalyticsView(APIView):
+    """
+    GET /api/v1/admin/location/analytics?days=30
+    Allowed/denied verification attempts per day and per city (daily rollups)
+    """
+    from apps.products.admin_views import IsAdminUser
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        try:
+            days = min(max(int(request.query_params.get('days', 30)), 1), 366)
+        except ValueError:
+            return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(LocationAttemptService.daily_summary(days))
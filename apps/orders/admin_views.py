@@ -14,15 +14,18 @@ class AdminOrderViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Order.objects.all().select_related('user', 'payment').order_by('-created_at')
 
 import csv
-from django.http import HttpResponse
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse
 from django.db.models import Sum, Count, F
 from django.db.models.functions import TruncDate, TruncMonth
 from django.utils import timezone
 from datetime import timedelta
-from rest_framework import viewsets
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import Order, OrderItem
+from .services import InvoiceArchiveService
 
 class AdminAnalyticsViewSet(viewsets.ViewSet):
     """
@@ -124,3 +127,48 @@ class AdminAnalyticsViewSet(viewsets.ViewSet):
             ])
 
         return response
+
+
+class AdminInvoiceExportView(APIView):
+    """
+    Bulk invoice archive export (background job).
+
+    POST starts a job for a date range/status filter and returns its id.
+    GET with a job id returns progress; add ?download=1 once COMPLETED to
+    stream the ZIP.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        file_type = request.data.get('file', 'pdf')
+        if file_type not in ('pdf', 'html'):
+            return Response({'error': "file must be 'pdf' or 'html'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        filters = {
+            'date_from': request.data.get('date_from'),
+            'date_to': request.data.get('date_to'),
+            'status': request.data.get('status'),
+        }
+        job_id = InvoiceArchiveService.start_export(request.user, filters, file_type)
+        return Response({'job_id': job_id, 'status': 'QUEUED'}, status=status.HTTP_202_ACCEPTED)
+
+    def get(self, request, job_id=None):
+        if job_id is None:
+            # The collection URL only accepts POST
+            return self.http_method_not_allowed(request)
+
+        job = InvoiceArchiveService.get_job(job_id)
+        if not job:
+            return Response({'error': 'Export job not found or expired'}, status=status.HTTP_404_NOT_FOUND)
+
+        if request.query_params.get('download'):
+            if job.get('status') != 'COMPLETED':
+                return Response({'error': 'Export is not ready yet'}, status=status.HTTP_409_CONFLICT)
+            return FileResponse(
+                default_storage.open(job['file'], 'rb'),
+                as_attachment=True,
+                filename=f"invoices_{job_id}.zip",
+                content_type='application/zip'
+            )
+
+        return Response({'job_id': job_id, **job})
@@ -5,8 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
 from .models import Order
 from .serializers import OrderSerializer
-from apps.core.state_machines import validate_order_transition
-from apps.core.models import AuditLog
+from apps.core.state_machines import validate_order_transition, transition_order
 from apps.products.models import Product
 import logging
 
@@ -38,30 +37,26 @@ class OrderCancellationMixin:
         except ValueError as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Restore stock if already decremented
+        # Compare-and-set transition (writes outbox event + audit log), then
+        # restore stock only if this request actually won the cancellation
         with transaction.atomic():
-            if order.status == Order.Status.AWAITING_PAYMENT:
+            result = transition_order(
+                order, Order.Status.CANCELLED,
+                allowed_from=[Order.Status.PENDING, Order.Status.AWAITING_PAYMENT],
+                user=request.user, reason='Customer cancellation',
+                action='ORDER_CANCELLED', request=request
+            )
+            if not result['won']:
+                return Response({
+                    'error': f"Cannot cancel order in {result['current_status']} status"
+                }, status=status.HTTP_409_CONFLICT)
+
+            if result['from_status'] == Order.Status.AWAITING_PAYMENT:
                 for item in order.items.all():
-                    product = Product.objects.select_for_update().get(id=item.product.id)
+                    product = Product.objects.select_for_update().get(id=item.product_id)
                     product.stock_quantity += item.quantity
                     product.save()
                     logger.info(f"Restored {item.quantity} units of {product.name}")
-            
-            order.status = Order.Status.CANCELLED
-            order.save()
-            
-            # Audit log
-            AuditLog.objects.create(
-                user=request.user,
-                user_mobile=request.user.mobile_number,
-                user_role=request.user.role,
-                action='ORDER_CANCELLED',
-                resource_type='Order',
-                resource_id=str(order.id),
-                reason='Customer cancellation',
-                ip_address=self._get_client_ip(request),
-                correlation_id=getattr(request, 'correlation_id', None)
-            )
         
         logger.info(f"Order {order.id} cancelled by customer")
         return Response(OrderSerializer(order).data)
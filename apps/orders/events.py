@@ -0,0 +1,168 @@
+"""
+Order Event Outbox - Relay and Consumers
+
+`Order.save()` writes an `OrderEvent` row in the same transaction as every
+status change. `OrderEventRelay` publishes committed, unpublished events to
+Celery in batches; the worker then runs each registered consumer once per
+event. A consumer claims a Redis idempotency key before running and releases
+it if it raises, so a re-published batch has no visible effect while a failed
+consumer is retried (together with the task) until it succeeds.
+
+To react to order events (notifications, invoices, analytics rollups...),
+add a callable taking an `OrderEvent` to `ORDER_EVENT_CONSUMERS`.
+"""
+from django.db import transaction
+from django.utils import timezone
+from apps.core.services.redis_service import RedisService
+from .models import OrderEvent
+from .notification_templates import (
+    get_order_placed_message,
+    get_order_shipped_message,
+    get_order_out_for_delivery_message,
+    get_order_delivered_message
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Which statuses trigger a customer SMS
+NOTIFIABLE_STATUSES = {
+    'PENDING': ('ORDER_PLACED', get_order_placed_message),
+    'PAID': ('ORDER_PLACED', get_order_placed_message),
+    'SHIPPED': ('ORDER_SHIPPED', get_order_shipped_message),
+    'OUT_FOR_DELIVERY': ('ORDER_OUT_FOR_DELIVERY', get_order_out_for_delivery_message),
+    'DELIVERED': ('ORDER_DELIVERED', get_order_delivered_message),
+}
+
+
+def notify_customer(event):
+    """
+    Queue the order status SMS.
+
+    IDEMPOTENCY: `last_notified_status` still suppresses a repeat SMS for the
+    same status; it is now updated off the request path.
+    """
+    order = event.order
+    if event.to_status not in NOTIFIABLE_STATUSES or order.last_notified_status == event.to_status:
+        return
+
+    mobile_number = order.customer_mobile
+    if not mobile_number:
+        logger.warning(f"No mobile number for order {order.id}")
+        return
+
+    from apps.core.tasks import send_sms_async
+
+    event_type, message_func = NOTIFIABLE_STATUSES[event.to_status]
+    send_sms_async.delay(
+        mobile_number=mobile_number,
+        message=message_func(order),
+        event_type=event_type
+    )
+    type(order).objects.filter(pk=order.pk).update(last_notified_status=event.to_status)
+    logger.info(f"Order notification queued for {order.id}: {event_type}")
+
+
+def render_invoice(event):
+    """Render/store the invoice once the order is paid (and on later changes)."""
+    from .services import InvoiceService
+
+    if event.to_status in InvoiceService.INVOICEABLE_STATUSES:
+        InvoiceService.render_and_store(event.order)
+
+
+def invalidate_gst_returns(event):
+    """Recompute the GST day bucket when an order enters or leaves a supply status."""
+    from apps.taxation.returns import GSTReturnService, SUPPLY_STATUSES
+
+    if (event.from_status in SUPPLY_STATUSES) != (event.to_status in SUPPLY_STATUSES):
+        GSTReturnService.invalidate_day(timezone.localdate(event.order.created_at))
+
+
+ORDER_EVENT_CONSUMERS = [
+    notify_customer,
+    render_invoice,
+    invalidate_gst_returns,
+]
+
+
+class OrderEventDispatchError(Exception):
+    """One or more consumers failed; their keys were released so a retry runs them again."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        super().__init__(
+            ', '.join(f"event {event_id} {consumer}: {error}" for event_id, consumer, error in failures)
+        )
+
+
+def dispatch_events(event_ids):
+    """
+    Run every consumer for the given events (worker side).
+    Raises OrderEventDispatchError after the batch if any consumer failed;
+    consumers that succeeded are skipped when the batch is retried.
+    """
+    events = (
+        OrderEvent.objects.filter(pk__in=event_ids)
+        .select_related('order', 'order__user')
+        .order_by('id')
+    )
+    handled = 0
+    failures = []
+    for event in events:
+        for consumer in ORDER_EVENT_CONSUMERS:
+            scope = f"order_event:{consumer.__name__}"
+            if not RedisService.check_and_set_idempotency_key(scope, str(event.pk), ttl=7 * 86400):
+                continue
+            try:
+                consumer(event)
+            except Exception as e:
+                # One failing consumer must not block the others
+                RedisService.release_idempotency_key(scope, str(event.pk))
+                logger.error(f"Order event {event.pk} consumer {consumer.__name__} failed: {e}")
+                failures.append((event.pk, consumer.__name__, e))
+        handled += 1
+
+    if failures:
+        raise OrderEventDispatchError(failures)
+    return handled
+
+
+class OrderEventRelay:
+    """
+    Publishes committed outbox rows to Celery in batches.
+    """
+    BATCH_SIZE = 100
+    MAX_BATCHES = 50
+
+    @classmethod
+    def publish_pending(cls, batch_size=None, max_batches=None) -> int:
+        """
+        Hand unpublished events to `dispatch_order_events_async`, oldest first.
+        Concurrent relays skip rows another relay has locked.
+        Returns the number of events published.
+        """
+        from .tasks import dispatch_order_events_async
+
+        batch_size = batch_size or cls.BATCH_SIZE
+        max_batches = max_batches or cls.MAX_BATCHES
+        published = 0
+
+        for _ in range(max_batches):
+            with transaction.atomic():
+                event_ids = list(
+                    OrderEvent.objects.filter(published_at__isnull=True)
+                    .select_for_update(skip_locked=True)
+                    .order_by('id')
+                    .values_list('id', flat=True)[:batch_size]
+                )
+                if not event_ids:
+                    break
+                OrderEvent.objects.filter(pk__in=event_ids).update(published_at=timezone.now())
+                # Raises -> rollback, events stay unpublished for the next run
+                dispatch_order_events_async.delay(event_ids)
+            published += len(event_ids)
+
+        if published:
+            logger.info(f"Order event relay published {published} events")
+        return published
@@ -1,6 +1,6 @@
 from django.views.generic import TemplateView
 from django.shortcuts import redirect
-from .services import CartService
+from .services import CartService, OrderHistory
 from .serializers import CartSerializer
 
 class CartFrontendView(TemplateView):
@@ -57,9 +57,8 @@ class OrderListFrontendView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         if self.request.user.is_authenticated:
-            # Use Service or Direct ORM (Direct ORM simpler for frontend views if read-only)
-            from .models import Order
-            context['orders'] = Order.objects.filter(user=self.request.user).order_by('-created_at')
+            # Hot + archived orders, newest first
+            context['orders'] = OrderHistory.for_user(self.request.user)
         return context
 
 class OrderDetailFrontendView(TemplateView):
@@ -68,8 +67,6 @@ class OrderDetailFrontendView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         if self.request.user.is_authenticated:
-             from .models import Order
-             from django.shortcuts import get_object_or_404
-             order = get_object_or_404(Order, id=kwargs['pk'], user=self.request.user)
+             order = OrderHistory.get_for_user(self.request.user, kwargs['pk'])
              context['order'] = order
         return context
@@ -0,0 +1,29 @@
+"""
+Management command to move old DELIVERED/CANCELLED orders into the archive tables
+"""
+from django.core.management.base import BaseCommand
+from apps.orders.services import OrderArchiveService
+
+
+class Command(BaseCommand):
+    help = 'Archive completed orders (with items, payments, promo usages) older than N days'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Age in days (default: ORDER_ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=None, help='Orders per transaction (default: ORDER_ARCHIVE_BATCH_SIZE)')
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only count archivable orders')
+
+    def handle(self, *args, **options):
+        result = OrderArchiveService.run(
+            older_than_days=options['days'],
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            dry_run=options['dry_run'],
+        )
+        if result['dry_run']:
+            self.stdout.write(f"[DRY RUN] {result['archived']} orders would be archived")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Archived {result['archived']} orders in {result['batches']} batches"
+            ))
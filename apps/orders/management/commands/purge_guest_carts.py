@@ -0,0 +1,30 @@
+"""
+Management command to purge expired guest carts, their items and expired sessions
+"""
+from django.core.management.base import BaseCommand
+from apps.orders.services import GuestCartCleanupService
+
+
+class Command(BaseCommand):
+    help = 'Delete idle guest carts/items and expired sessions in small batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Retention in days (default: GUEST_CART_RETENTION_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows per delete (default: GUEST_CART_PURGE_BATCH_SIZE)')
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches per table')
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be deleted')
+
+    def handle(self, *args, **options):
+        metrics = GuestCartCleanupService.run(
+            retention_days=options['days'],
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            pause=options['pause'],
+            dry_run=options['dry_run'],
+        )
+        prefix = '[DRY RUN] Would delete' if metrics['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {metrics['carts_deleted']} guest carts, {metrics['items_deleted']} items, "
+            f"{metrics['sessions_deleted']} sessions ({metrics['batches']} batches, {metrics['duration_ms']}ms)"
+        ))
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_order_last_notified_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cart',
+            name='last_abandon_notified_at',
+            field=models.DateTimeField(blank=True, help_text='When the last abandoned-cart reminder was queued', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='cart',
+            index=models.Index(fields=['updated_at'], name='cart_updated_at_idx'),
+        ),
+    ]
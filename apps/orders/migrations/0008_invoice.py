@@ -0,0 +1,27 @@
+# Generated by Django 5.2.10 on 2026-10-19 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_cart_last_abandon_notified_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Invoice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('invoice_number', models.CharField(max_length=20)),
+                ('content_hash', models.CharField(db_index=True, help_text='SHA-256 of the invoice render input', max_length=64)),
+                ('order_updated_at', models.DateTimeField(help_text='Order.updated_at the artifacts were rendered from')),
+                ('html_file', models.FileField(upload_to='invoices/')),
+                ('pdf_file', models.FileField(blank=True, upload_to='invoices/')),
+                ('rendered_at', models.DateTimeField(auto_now=True)),
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='invoice', to='orders.order')),
+            ],
+        ),
+    ]
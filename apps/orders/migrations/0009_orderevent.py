@@ -0,0 +1,31 @@
+# Generated by Django 5.2.10 on 2026-10-19 11:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0008_invoice'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('ORDER_CREATED', 'Order Created'), ('STATUS_CHANGED', 'Status Changed')], max_length=20)),
+                ('from_status', models.CharField(blank=True, max_length=20, null=True)),
+                ('to_status', models.CharField(max_length=20)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='orders.order')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['published_at', 'id'], name='orderevent_unpublished_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.10 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0009_orderevent'),
+        ('products', '0011_alter_customizerequest_status'),
+        ('promotions', '0005_popup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.UUIDField(editable=False, help_text='Original Order id', primary_key=True, serialize=False)),
+                ('guest_email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('guest_phone', models.CharField(blank=True, max_length=15, null=True)),
+                ('payment_method', models.CharField(choices=[('ONLINE', 'Online Payment'), ('COD', 'Cash on Delivery')], max_length=10)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('AWAITING_PAYMENT', 'Awaiting Payment'), ('PAID', 'Paid'), ('SHIPPED', 'Shipped'), ('DELIVERED', 'Delivered'), ('CANCELLED', 'Cancelled')], max_length=20)),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('shipping_address', models.JSONField()),
+                ('invoice_files', models.JSONField(blank=True, default=dict, help_text='Stored invoice artifact names at archive time')),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_orders', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['user', 'created_at'], name='archorder_user_created_idx'),
+                    models.Index(fields=['created_at'], name='archorder_created_idx'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedOrderItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_snapshot', models.JSONField()),
+                ('length', models.FloatField()),
+                ('breadth', models.FloatField()),
+                ('height', models.FloatField()),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('quantity', models.PositiveIntegerField(default=1)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='orders.archivedorder')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_order_items', to='products.product')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedPayment',
+            fields=[
+                ('id', models.UUIDField(editable=False, help_text='Original Payment id', primary_key=True, serialize=False)),
+                ('razorpay_order_id', models.CharField(max_length=100, unique=True)),
+                ('razorpay_payment_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('currency', models.CharField(default='INR', max_length=3)),
+                ('status', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('updated_at', models.DateTimeField()),
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='payment', to='orders.archivedorder')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedPromoUsage',
+            fields=[
+                ('id', models.UUIDField(editable=False, help_text='Original PromoUsage id', primary_key=True, serialize=False)),
+                ('discount_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('used_at', models.DateTimeField()),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='promo_usages', to='orders.archivedorder')),
+                ('promo', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_usages', to='promotions.promocode')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_promo_usages', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.10 on 2026-10-19 15:00
+
+import apps.core.money
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0011_order_tax_totals'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='total_amount',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='unit_price',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='archivedorder',
+            name='total_amount',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='archivedorderitem',
+            name='unit_price',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='archivedpayment',
+            name='amount',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='archivedpromousage',
+            name='discount_amount',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='taxable_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='cgst_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='sgst_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='igst_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='cess_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='tax_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.10 on 2026-10-19 16:00
+
+import apps.core.money
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0012_money_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedorder',
+            name='taxable_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedorder',
+            name='cgst_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedorder',
+            name='sgst_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedorder',
+            name='igst_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedorder',
+            name='cess_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedorder',
+            name='tax_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+    ]
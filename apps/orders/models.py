@@ -1,9 +1,13 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 import uuid
+import logging
+from apps.core.money import MoneyField
 from apps.products.models import Product
 
+logger = logging.getLogger(__name__)
+
 class Address(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='addresses', on_delete=models.CASCADE)
     line1 = models.TextField()
@@ -39,13 +43,64 @@ class Order(models.Model):
     # Idempotency: Track last status that triggered SMS notification
     last_notified_status = models.CharField(max_length=20, null=True, blank=True, help_text="Last status for which SMS was sent")
     
-    total_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    total_amount = MoneyField(max_digits=10)
+
+    # GST captured at checkout (see taxation.OrderItemTax); null for older orders
+    taxable_amount = MoneyField(max_digits=12, null=True, blank=True)
+    cgst_amount = MoneyField(max_digits=12, null=True, blank=True)
+    sgst_amount = MoneyField(max_digits=12, null=True, blank=True)
+    igst_amount = MoneyField(max_digits=12, null=True, blank=True)
+    cess_amount = MoneyField(max_digits=12, null=True, blank=True)
+    tax_amount = MoneyField(max_digits=12, null=True, blank=True)
+
     shipping_address = models.JSONField(help_text="Snapshot of address at time of order")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Order {self.id} - {self.status}"
+
+    @property
+    def has_stored_tax(self):
+        return self.tax_amount is not None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the persisted status so save() can detect transitions
+        # (left unset when `status` was deferred; save() then reads it back)
+        if 'status' in field_names:
+            instance._loaded_status = values[field_names.index('status')]
+        return instance
+
+    def _persisted_status(self):
+        if hasattr(self, '_loaded_status'):
+            return self._loaded_status
+        return type(self)._base_manager.filter(pk=self.pk).values_list('status', flat=True).first()
+
+    def save(self, *args, **kwargs):
+        """
+        Save and, when the status changed, write an OrderEvent in the same transaction.
+        The outbox relay publishes the event to Celery only after commit.
+        """
+        created = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            status_written = 'status' not in self.get_deferred_fields()
+        else:
+            status_written = 'status' in update_fields
+        if not status_written:
+            return super().save(*args, **kwargs)
+
+        previous_status = None if created else self._persisted_status()
+
+        if not created and previous_status == self.status:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            OrderEvent.record(self, previous_status)
+        self._loaded_status = self.status
     
     @property
     def customer_mobile(self):
@@ -54,6 +109,56 @@ class Order(models.Model):
             return self.user.mobile_number
         return self.guest_phone
 
+class OrderEvent(models.Model):
+    """
+    Transactional outbox for order lifecycle events.
+
+    Rows are inserted in the same transaction as the status change and
+    published to Celery by `apps.orders.events.OrderEventRelay` once committed.
+    """
+    class EventType(models.TextChoices):
+        ORDER_CREATED = 'ORDER_CREATED', 'Order Created'
+        STATUS_CHANGED = 'STATUS_CHANGED', 'Status Changed'
+
+    order = models.ForeignKey(Order, related_name='events', on_delete=models.CASCADE)
+    event_type = models.CharField(max_length=20, choices=EventType.choices)
+    from_status = models.CharField(max_length=20, null=True, blank=True)
+    to_status = models.CharField(max_length=20)
+    payload = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['published_at', 'id'], name='orderevent_unpublished_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.order_id}: {self.from_status} -> {self.to_status}"
+
+    @classmethod
+    def record(cls, order, from_status, payload=None):
+        """Insert an event for `order` (already at its new status) and kick the relay after commit."""
+        event = cls.objects.create(
+            order=order,
+            event_type=cls.EventType.ORDER_CREATED if from_status is None else cls.EventType.STATUS_CHANGED,
+            from_status=from_status,
+            to_status=order.status,
+            payload=payload or {},
+        )
+        transaction.on_commit(cls.kick_relay)
+        return event
+
+    @staticmethod
+    def kick_relay():
+        # Best effort: the periodic relay picks up anything missed here
+        try:
+            from .tasks import relay_order_events_async
+            relay_order_events_async.delay()
+        except Exception as e:
+            logger.warning(f"Could not kick order event relay: {e}")
+
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, related_name='items', on_delete=models.CASCADE)
     product = models.ForeignKey(Product, related_name='order_items', on_delete=models.PROTECT)
@@ -64,12 +169,34 @@ class OrderItem(models.Model):
     breadth = models.FloatField()
     height = models.FloatField()
     
-    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+    unit_price = MoneyField(max_digits=10)
     quantity = models.PositiveIntegerField(default=1)
 
     def __str__(self):
         return f"{self.product.name} x {self.quantity}"
 
+class Invoice(models.Model):
+    """
+    Rendered invoice artifacts for an order.
+
+    Files are stored under the SHA-256 of their render input so identical
+    content is never written twice; `order_updated_at` tells whether the
+    stored artifact is still current without re-rendering.
+    """
+    order = models.OneToOneField(Order, related_name='invoice', on_delete=models.CASCADE)
+    invoice_number = models.CharField(max_length=20)
+    content_hash = models.CharField(max_length=64, db_index=True, help_text="SHA-256 of the invoice render input")
+    order_updated_at = models.DateTimeField(help_text="Order.updated_at the artifacts were rendered from")
+    html_file = models.FileField(upload_to='invoices/')
+    pdf_file = models.FileField(upload_to='invoices/', blank=True)
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.invoice_number} ({self.content_hash[:12]})"
+
+    def is_current(self, order):
+        return self.order_updated_at == order.updated_at
+
 class Cart(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='cart', on_delete=models.CASCADE, null=True, blank=True)
     session_key = models.CharField(max_length=40, null=True, blank=True, db_index=True)
@@ -85,12 +212,18 @@ class Cart(models.Model):
         blank=True,
         related_name='carts'
     )
+
+    # Abandoned-cart dedup: set when a reminder is queued, compared against updated_at
+    last_abandon_notified_at = models.DateTimeField(null=True, blank=True, help_text="When the last abandoned-cart reminder was queued")
     
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['user'], name='unique_user_cart', condition=models.Q(user__isnull=False)),
             models.UniqueConstraint(fields=['session_key'], name='unique_session_cart', condition=models.Q(session_key__isnull=False))
         ]
+        indexes = [
+            models.Index(fields=['updated_at'], name='cart_updated_at_idx'),
+        ]
 
     def __str__(self):
         return f"Cart of {self.user.mobile_number if self.user else 'Guest ' + str(self.session_key)}"
@@ -111,3 +244,88 @@ class CartItem(models.Model):
 
     def __str__(self):
         return f"{self.product.name} ({self.length}x{self.breadth}x{self.height})"
+
+
+# --- Cold archive tier (see OrderArchiveService) ---
+
+class ArchivedOrder(models.Model):
+    """
+    Cold-tier copy of a DELIVERED/CANCELLED order moved out of the hot table.
+    Keeps the original order id and the attributes templates/reports read, so
+    `OrderHistory` can return these alongside live orders.
+    """
+    is_archived = True
+
+    id = models.UUIDField(primary_key=True, editable=False, help_text="Original Order id")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='archived_orders', on_delete=models.PROTECT, null=True, blank=True)
+    guest_email = models.EmailField(null=True, blank=True)
+    guest_phone = models.CharField(max_length=15, null=True, blank=True)
+    payment_method = models.CharField(max_length=10, choices=Order.PaymentMethod.choices)
+    status = models.CharField(max_length=20, choices=Order.Status.choices)
+    total_amount = MoneyField(max_digits=10)
+    # GST totals as captured at checkout (null for orders placed before tax capture)
+    taxable_amount = MoneyField(max_digits=12, null=True, blank=True)
+    cgst_amount = MoneyField(max_digits=12, null=True, blank=True)
+    sgst_amount = MoneyField(max_digits=12, null=True, blank=True)
+    igst_amount = MoneyField(max_digits=12, null=True, blank=True)
+    cess_amount = MoneyField(max_digits=12, null=True, blank=True)
+    tax_amount = MoneyField(max_digits=12, null=True, blank=True)
+    shipping_address = models.JSONField()
+    invoice_files = models.JSONField(default=dict, blank=True, help_text="Stored invoice artifact names at archive time")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='archorder_user_created_idx'),
+            models.Index(fields=['created_at'], name='archorder_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived Order {self.id} - {self.status}"
+
+    @property
+    def has_stored_tax(self):
+        return self.tax_amount is not None
+
+    @property
+    def customer_mobile(self):
+        if self.user:
+            return self.user.mobile_number
+        return self.guest_phone
+
+class ArchivedOrderItem(models.Model):
+    order = models.ForeignKey(ArchivedOrder, related_name='items', on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, related_name='archived_order_items', on_delete=models.PROTECT)
+    product_snapshot = models.JSONField()
+    length = models.FloatField()
+    breadth = models.FloatField()
+    height = models.FloatField()
+    unit_price = MoneyField(max_digits=10)
+    quantity = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.product_snapshot.get('name', self.product_id)} x {self.quantity}"
+
+class ArchivedPayment(models.Model):
+    id = models.UUIDField(primary_key=True, editable=False, help_text="Original Payment id")
+    order = models.OneToOneField(ArchivedOrder, related_name='payment', on_delete=models.CASCADE)
+    razorpay_order_id = models.CharField(max_length=100, unique=True)
+    razorpay_payment_id = models.CharField(max_length=100, blank=True, null=True)
+    amount = MoneyField(max_digits=10)
+    currency = models.CharField(max_length=3, default='INR')
+    status = models.CharField(max_length=20)
+    created_at = models.DateTimeField(db_index=True)
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.razorpay_order_id} - {self.status} (archived)"
+
+class ArchivedPromoUsage(models.Model):
+    id = models.UUIDField(primary_key=True, editable=False, help_text="Original PromoUsage id")
+    promo = models.ForeignKey('promotions.PromoCode', on_delete=models.PROTECT, related_name='archived_usages')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_promo_usages')
+    order = models.ForeignKey(ArchivedOrder, on_delete=models.CASCADE, related_name='promo_usages')
+    discount_amount = MoneyField(max_digits=10)
+    used_at = models.DateTimeField()
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Order, OrderItem, Address, Cart, CartItem
+from apps.core.money import Money, MoneySerializerField
 from apps.products.serializers import ProductSerializer
 from apps.products.services import PricingService
 
@@ -25,9 +26,11 @@ class CartItemSerializer(serializers.ModelSerializer):
 
     def get_price_details(self, obj):
         try:
-            return PricingService.calculate_price(obj.product.id, obj.length, obj.breadth, obj.height)
+            price_info = PricingService.calculate_price(obj.product, obj.length, obj.breadth, obj.height)
         except Exception:
             return None
+        # Plain Decimals for templates ({% widthratio %}) as well as JSON
+        return {key: value.rupees if isinstance(value, Money) else value for key, value in price_info.items()}
 
 class CartSerializer(serializers.ModelSerializer):
     items = CartItemSerializer(many=True, read_only=True)
@@ -44,18 +47,15 @@ class CartSerializer(serializers.ModelSerializer):
         return self._calculate_subtotal(obj)
 
     def _calculate_subtotal(self, obj):
-        total = 0
-        for item in obj.items.all():
-            try:
-                price_info = PricingService.calculate_price(item.product.id, item.length, item.breadth, item.height)
-                total += float(price_info['final_price']) * item.quantity
-            except:
-                pass
-        return total
+        # Priced once per cart and reused by discount/total
+        cache = self.__dict__.setdefault('_subtotals', {})
+        if obj.pk not in cache:
+            cache[obj.pk] = PricingService.cart_subtotal(obj)
+        return cache[obj.pk]
 
     def get_discount_amount(self, obj):
         if not obj.applied_promo:
-            return 0.0
+            return Money.ZERO
         
         # Calculate Subtotal
         subtotal = self._calculate_subtotal(obj)
@@ -63,28 +63,30 @@ class CartSerializer(serializers.ModelSerializer):
         # Simple Validation (avoid heavy DB hits if possible, but basic checks needed)
         # Ideally, we trust the database state, but min_order might have been violated
         if subtotal < obj.applied_promo.min_order_amount:
-            return 0.0
+            return Money.ZERO
         
         # Calculate
         from apps.promotions.services import PromotionService
-        from decimal import Decimal
-        return PromotionService.calculate_discount(obj.applied_promo, Decimal(str(subtotal)))
+        return PromotionService.calculate_discount(obj.applied_promo, subtotal)
 
     def get_total_price(self, obj):
         subtotal = self._calculate_subtotal(obj)
         discount = self.get_discount_amount(obj)
-        return max(0, subtotal - float(discount))
+        return max(Money.ZERO, subtotal - discount)
 
     def get_applied_promo_code(self, obj):
         return obj.applied_promo.code if obj.applied_promo else None
 
 class OrderItemSerializer(serializers.ModelSerializer):
+    unit_price = MoneySerializerField(max_digits=10)
+
     class Meta:
         model = OrderItem
         fields = ['product_snapshot', 'length', 'breadth', 'height', 'unit_price', 'quantity']
 
 class OrderSerializer(serializers.ModelSerializer):
     items = OrderItemSerializer(many=True, read_only=True)
+    total_amount = MoneySerializerField(max_digits=10)
     
     class Meta:
         model = Order
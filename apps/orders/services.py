@@ -3,108 +3,184 @@ Order Services - Invoicing and Cart Management
 """
 from django.template.loader import render_to_string
 from django.utils import timezone
-from .models import Cart, CartItem, Order
+from django.core.cache import cache
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+from django.db.models import Exists, F, OuterRef, Q
+from .models import (
+    ArchivedOrder, ArchivedOrderItem, ArchivedPayment, ArchivedPromoUsage,
+    Cart, CartItem, Invoice, Order, OrderItem
+)
 from django.db import transaction
+from django.conf import settings
+from datetime import timedelta
+import hashlib
+import heapq
+import json
+import shutil
+import tempfile
+import time
 import uuid
+import zipfile
+import logging
+
+logger = logging.getLogger(__name__)
 
 class InvoiceService:
+    """
+    Invoice rendering and artifact storage.
+
+    HTML is rendered from `invoices/invoice.html`; a PDF is produced too when
+    WeasyPrint is installed. Artifacts are written once per content hash by a
+    Celery task (see orders.tasks.render_invoice_async) and InvoiceView serves
+    the stored files, rendering synchronously only if they are missing or stale.
+    """
+    TEMPLATE_NAME = 'invoices/invoice.html'
+    COMPANY_NAME = 'WoodCraft Ecommerce'
+    GSTIN = '36AAAAA0000A1Z5'  # Example
+    SUPPORT_EMAIL = 'support@woodcraft.com'
+    SUPPORT_PHONE = '+91 98765 43210'
+
+    # Statuses for which an invoice is rendered ahead of time
+    INVOICEABLE_STATUSES = (Order.Status.PAID, Order.Status.SHIPPED, Order.Status.DELIVERED)
+
     @staticmethod
-    def generate_invoice_html(order: Order) -> str:
+    def get_invoice_number(order: Order) -> str:
+        return f"INV-{str(order.id)[:8]}"
+
+    @classmethod
+    def build_context(cls, order: Order) -> dict:
+        """Template context; line items and their stored tax are loaded in a single query."""
+        lines = []
+        for item in order.items.select_related('product', 'tax').order_by('pk'):
+            snapshot = item.product_snapshot or {}
+            tax = getattr(item, 'tax', None)
+            lines.append({
+                'name': snapshot.get('name') or item.product.name,
+                'length': item.length,
+                'breadth': item.breadth,
+                'height': item.height,
+                'quantity': item.quantity,
+                'unit_price': item.unit_price,
+                'line_total': item.unit_price * item.quantity,
+                'hsn_code': tax.hsn_code if tax else '',
+                'tax_amount': tax.total_tax if tax else None,
+            })
+
+        tax_summary = None
+        if order.has_stored_tax:
+            tax_summary = {
+                'taxable_amount': order.taxable_amount,
+                'cgst': order.cgst_amount,
+                'sgst': order.sgst_amount,
+                'igst': order.igst_amount,
+                'cess': order.cess_amount,
+                'total': order.tax_amount,
+            }
+
+        return {
+            'order': order,
+            'lines': lines,
+            'tax_summary': tax_summary,
+            'address': order.shipping_address or {},
+            'invoice_number': cls.get_invoice_number(order),
+            'company_name': cls.COMPANY_NAME,
+            'gstin': cls.GSTIN,
+            'support_email': cls.SUPPORT_EMAIL,
+            'support_phone': cls.SUPPORT_PHONE,
+        }
+
+    @staticmethod
+    def compute_content_hash(context: dict) -> str:
+        """SHA-256 over everything the template prints, so equal hashes mean equal invoices."""
+        order = context['order']
+        payload = {
+            'template': InvoiceService.TEMPLATE_NAME,
+            'order': [str(order.id), order.status, str(order.total_amount), order.created_at.isoformat()],
+            'address': context['address'],
+            'lines': context['lines'],
+            'tax': context['tax_summary'],
+            'company': [context['company_name'], context['gstin'], context['support_email'], context['support_phone']],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    @classmethod
+    def generate_invoice_html(cls, order: Order, context: dict = None) -> str:
         """
-        Generates a professional HTML invoice for an order.
+        Render the invoice HTML for an order.
         Frontend can print this to PDF.
         """
-        # Calculate tax breakdown if not already present
-        # For now, we simulate the context needed for a template
-        context = {
-            'order': order,
-            'items': order.items.all(),
-            'generated_at': timezone.now(),
-            'company_name': 'WoodCraft Ecommerce',
-            'gstin': '36AAAAA0000A1Z5', # Example
-            'support_email': 'support@woodcraft.com',
-            'support_phone': '+91 98765 43210'
-        }
-        
-        # In a real app, use a proper Django template
-        # Here we construct a basic HTML string for demonstration/MVP
-        invoice_html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: sans-serif; padding: 20px; }}
-                .header {{ display: flex; justify-content: space-between; margin-bottom: 40px; }}
-                .title {{ font-size: 24px; font-weight: bold; }}
-                .meta {{ text-align: right; }}
-                table {{ width: 100%; border-collapse: collapse; margin-bottom: 20px; }}
-                th, td {{ padding: 10px; border-bottom: 1px solid #ddd; text-align: left; }}
-                th {{ background-color: #f8f8f8; }}
-                .totals {{ float: right; width: 300px; }}
-                .total-row {{ display: flex; justify-content: space-between; padding: 5px 0; }}
-                .grand-total {{ font-weight: bold; font-size: 18px; border-top: 2px solid #333; margin-top: 10px; pt: 10px; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <div>
-                    <div class="title">INVOICE</div>
-                    <div>{context['company_name']}</div>
-                    <div>GSTIN: {context['gstin']}</div>
-                </div>
-                <div class="meta">
-                    <div>Invoice #: INV-{str(order.id)[:8]}</div>
-                    <div>Date: {order.created_at.strftime('%Y-%m-%d')}</div>
-                    <div>Status: {order.status}</div>
-                </div>
-            </div>
-            
-            <div style="margin-bottom: 30px;">
-                <strong>Bill To:</strong><br>
-                {order.shipping_address.get('line1')},<br>
-                {order.shipping_address.get('city')}, {order.shipping_address.get('state')} - {order.shipping_address.get('zip_code')}
-            </div>
-            
-            <table>
-                <thead>
-                    <tr>
-                        <th>Item</th>
-                        <th>Qty</th>
-                        <th>Price</th>
-                        <th>Total</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """
-        
-        for item in context['items']:
-            invoice_html += f"""
-                <tr>
-                    <td>{item.product.name} ({item.length}x{item.breadth}x{item.height})</td>
-                    <td>{item.quantity}</td>
-                    <td>₹{item.unit_price}</td>
-                    <td>₹{item.unit_price * item.quantity}</td>
-                </tr>
-            """
-            
-        invoice_html += f"""
-                </tbody>
-            </table>
-            
-            <div class="totals">
-                <div class="total-row grand-total">
-                    <span>Grand Total:</span>
-                    <span>₹{order.total_amount}</span>
-                </div>
-            </div>
-            
-            <div style="clear: both; margin-top: 50px; font-size: 12px; color: #666;">
-                <p>Thank you for your business!</p>
-                <p>For support, contact {context['support_email']} or {context['support_phone']}</p>
-            </div>
-        </body>
-        </html>
+        return render_to_string(cls.TEMPLATE_NAME, context or cls.build_context(order))
+
+    @staticmethod
+    def render_pdf(html: str):
+        """Returns PDF bytes, or None when WeasyPrint is not installed."""
+        try:
+            from weasyprint import HTML
+        except ImportError:
+            logger.warning("WeasyPrint not installed; skipping invoice PDF generation")
+            return None
+        return HTML(string=html).write_pdf()
+
+    @staticmethod
+    def _store(name: str, content: bytes) -> str:
+        # Content-addressed: an existing file with this name already holds these bytes
+        if not default_storage.exists(name):
+            name = default_storage.save(name, ContentFile(content))
+        return name
+
+    @classmethod
+    def render_and_store(cls, order: Order, force: bool = False):
         """
-        return invoice_html
+        Render and persist invoice artifacts unless the stored ones are current.
+        Returns the Invoice row.
+        """
+        invoice = Invoice.objects.filter(order=order).first()
+        if invoice and not force and invoice.is_current(order):
+            return invoice
+
+        context = cls.build_context(order)
+        content_hash = cls.compute_content_hash(context)
+
+        if invoice and not force and invoice.content_hash == content_hash:
+            # Order row changed but nothing printed on the invoice did
+            Invoice.objects.filter(pk=invoice.pk).update(order_updated_at=order.updated_at)
+            invoice.order_updated_at = order.updated_at
+            return invoice
+
+        html = cls.generate_invoice_html(order, context)
+        base_name = f"invoices/{order.id}/{content_hash}"
+        html_name = cls._store(f"{base_name}.html", html.encode('utf-8'))
+
+        pdf_name = ''
+        pdf = cls.render_pdf(html)
+        if pdf is not None:
+            pdf_name = cls._store(f"{base_name}.pdf", pdf)
+
+        invoice, _ = Invoice.objects.update_or_create(
+            order=order,
+            defaults={
+                'invoice_number': context['invoice_number'],
+                'content_hash': content_hash,
+                'order_updated_at': order.updated_at,
+                'html_file': html_name,
+                'pdf_file': pdf_name,
+            }
+        )
+        logger.info(f"Invoice rendered for order {order.id} ({content_hash[:12]})")
+        return invoice
+
+    @classmethod
+    def get_invoice(cls, order: Order):
+        """Stored invoice for the order, rendering it now if missing or stale."""
+        try:
+            invoice = order.invoice
+        except Invoice.DoesNotExist:
+            invoice = None
+        if invoice and invoice.is_current(order):
+            return invoice
+        return cls.render_and_store(order)
 
 class CartService:
     @staticmethod
@@ -158,3 +234,429 @@ class CartService:
             
             # Delete guest cart
             guest_cart.delete()
+
+
+class AbandonedCartService:
+    """
+    Incremental abandoned-cart scanner.
+
+    Each run only considers carts that went stale since the previous run
+    (high-water mark kept in cache), streams them with a server-side cursor,
+    and queues reminders to Celery in batches. `Cart.last_abandon_notified_at`
+    prevents the same cart being reminded twice unless it was touched again.
+    """
+    HIGH_WATER_MARK_KEY = "ecom:abandoned_cart:high_water_mark"
+    STALE_AFTER = timedelta(hours=24)
+    CHUNK_SIZE = 500
+    BATCH_SIZE = 100
+
+    @staticmethod
+    def get_candidates(cutoff, since=None):
+        """
+        Carts idle since before `cutoff` (and after `since`, if given) that have
+        items, a reachable email, and no reminder since their last update.
+        """
+        has_items = CartItem.objects.filter(cart=OuterRef('pk'))
+        queryset = Cart.objects.filter(
+            Exists(has_items),
+            Q(user__email__gt='') | Q(user__isnull=True, guest_email__gt=''),
+            Q(last_abandon_notified_at__isnull=True) | Q(last_abandon_notified_at__lt=F('updated_at')),
+            updated_at__lt=cutoff,
+        )
+        if since is not None:
+            queryset = queryset.filter(updated_at__gte=since)
+
+        return (
+            queryset
+            .select_related('user')
+            .only('id', 'guest_email', 'updated_at', 'user__email', 'user__name')
+            .order_by('updated_at')
+        )
+
+    @classmethod
+    def scan(cls, stale_after=None, chunk_size=None, batch_size=None, full=False) -> dict:
+        """
+        Run one incremental pass. Returns counters for logging/metrics.
+
+        :param full: ignore the high-water mark and rescan every stale cart
+                     (dedup still applies via last_abandon_notified_at).
+        """
+        from .tasks import send_abandoned_cart_notifications_async
+
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        batch_size = batch_size or cls.BATCH_SIZE
+        now = timezone.now()
+        cutoff = now - (stale_after or cls.STALE_AFTER)
+        since = None if full else cache.get(cls.HIGH_WATER_MARK_KEY)
+
+        stats = {'scanned': 0, 'queued': 0, 'batches': 0, 'since': since, 'cutoff': cutoff}
+        batch = []
+
+        def flush():
+            if not batch:
+                return
+            send_abandoned_cart_notifications_async.delay(batch)
+            # queryset.update() leaves auto_now updated_at untouched
+            Cart.objects.filter(pk__in=[entry['cart_id'] for entry in batch]).update(
+                last_abandon_notified_at=now
+            )
+            stats['queued'] += len(batch)
+            stats['batches'] += 1
+            batch.clear()
+
+        for cart in cls.get_candidates(cutoff, since).iterator(chunk_size=chunk_size):
+            stats['scanned'] += 1
+            if cart.user_id:
+                email, name = cart.user.email, cart.user.name
+            else:
+                email, name = cart.guest_email, ''
+            batch.append({'cart_id': cart.pk, 'email': email, 'user_name': name or 'there'})
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+
+        # Only advance the mark once every candidate up to cutoff was queued
+        cache.set(cls.HIGH_WATER_MARK_KEY, cutoff, timeout=None)
+        logger.info(
+            f"Abandoned cart scan: {stats['queued']} queued in {stats['batches']} batches "
+            f"(window {since} -> {cutoff})"
+        )
+        return stats
+
+
+class GuestCartCleanupService:
+    """
+    Garbage collector for anonymous carts and expired Django sessions.
+
+    Deletes in small primary-key batches, each in its own short transaction,
+    so no long-held locks or oversized WAL segments are produced.
+    """
+    METRICS_KEY = "ecom:metrics:guest_cart_gc"
+
+    @staticmethod
+    def _purge_in_batches(queryset, delete_batch, batch_size, max_batches, pause):
+        """Repeatedly pick `batch_size` pks from `queryset` and hand them to `delete_batch`."""
+        total = batches = 0
+        while max_batches is None or batches < max_batches:
+            ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                total += delete_batch(ids)
+            batches += 1
+            if pause:
+                time.sleep(pause)
+        return total, batches
+
+    @classmethod
+    def purge_guest_carts(cls, retention_days=None, batch_size=None, max_batches=None, pause=0, dry_run=False) -> dict:
+        """
+        Remove guest carts (and their items) idle for longer than the retention window.
+        """
+        retention_days = retention_days or settings.GUEST_CART_RETENTION_DAYS
+        batch_size = batch_size or settings.GUEST_CART_PURGE_BATCH_SIZE
+        cutoff = timezone.now() - timedelta(days=retention_days)
+        expired = Cart.objects.filter(user__isnull=True, updated_at__lt=cutoff).order_by('pk')
+
+        if dry_run:
+            return {'carts': expired.count(), 'items': CartItem.objects.filter(cart__in=expired).count(), 'batches': 0}
+
+        stats = {'carts': 0, 'items': 0}
+
+        def delete_batch(ids):
+            # Explicit child delete keeps the cascade to one statement per batch
+            items_deleted, _ = CartItem.objects.filter(cart_id__in=ids).delete()
+            carts_deleted, _ = Cart.objects.filter(pk__in=ids).delete()
+            stats['items'] += items_deleted
+            return carts_deleted
+
+        stats['carts'], stats['batches'] = cls._purge_in_batches(expired, delete_batch, batch_size, max_batches, pause)
+        return stats
+
+    @classmethod
+    def purge_expired_sessions(cls, batch_size=None, max_batches=None, pause=0, dry_run=False) -> dict:
+        """Batched equivalent of `clearsessions` for the database session backend."""
+        from django.contrib.sessions.models import Session
+
+        batch_size = batch_size or settings.GUEST_CART_PURGE_BATCH_SIZE
+        expired = Session.objects.filter(expire_date__lt=timezone.now()).order_by('pk')
+
+        if dry_run:
+            return {'sessions': expired.count(), 'batches': 0}
+
+        def delete_batch(ids):
+            deleted, _ = Session.objects.filter(pk__in=ids).delete()
+            return deleted
+
+        deleted, batches = cls._purge_in_batches(expired, delete_batch, batch_size, max_batches, pause)
+        return {'sessions': deleted, 'batches': batches}
+
+    @classmethod
+    def run(cls, **kwargs) -> dict:
+        """Purge carts then sessions, record metrics and return combined counters."""
+        started = time.monotonic()
+        cart_stats = cls.purge_guest_carts(**kwargs)
+        session_stats = cls.purge_expired_sessions(
+            **{k: v for k, v in kwargs.items() if k != 'retention_days'}
+        )
+        metrics = {
+            'carts_deleted': cart_stats['carts'],
+            'items_deleted': cart_stats['items'],
+            'sessions_deleted': session_stats['sessions'],
+            'batches': cart_stats['batches'] + session_stats['batches'],
+            'duration_ms': int((time.monotonic() - started) * 1000),
+            'ran_at': timezone.now().isoformat(),
+            'dry_run': bool(kwargs.get('dry_run')),
+        }
+        if not metrics['dry_run']:
+            cache.set(cls.METRICS_KEY, metrics, timeout=None)
+        logger.info(f"Guest cart GC: {metrics}")
+        return metrics
+
+
+class InvoiceArchiveService:
+    """
+    Bulk ZIP export of stored invoice artifacts for a date range/filter.
+
+    Orders are streamed with a server-side cursor and each invoice file is
+    copied into a ZIP on disk chunk by chunk, so memory stays bounded no
+    matter how many invoices are exported. Progress lives in cache under the
+    job id and is polled by the admin UI.
+    """
+    JOB_KEY = "ecom:invoice_export:{job_id}"
+    JOB_TTL = 60 * 60 * 24
+    CHUNK_SIZE = 200
+    PROGRESS_EVERY = 50
+
+    @staticmethod
+    def get_queryset(date_from=None, date_to=None, status=None):
+        queryset = Order.objects.all()
+        if status:
+            queryset = queryset.filter(status=status)
+        else:
+            queryset = queryset.filter(status__in=InvoiceService.INVOICEABLE_STATUSES)
+        # Date bounds are inclusive calendar days (a bare date_to means the whole day)
+        if date_from:
+            queryset = queryset.filter(created_at__date__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(created_at__date__lte=date_to)
+        return queryset.select_related('invoice').order_by('created_at')
+
+    @classmethod
+    def _job_key(cls, job_id):
+        return cls.JOB_KEY.format(job_id=job_id)
+
+    @classmethod
+    def get_job(cls, job_id):
+        return cache.get(cls._job_key(job_id))
+
+    @classmethod
+    def update_job(cls, job_id, **fields):
+        job = cls.get_job(job_id) or {}
+        job.update(fields)
+        cache.set(cls._job_key(job_id), job, timeout=cls.JOB_TTL)
+        return job
+
+    @classmethod
+    def start_export(cls, requested_by, filters: dict, file_type='pdf') -> str:
+        """Register a job and hand it to Celery. Returns the job id."""
+        from .tasks import export_invoice_archive_async
+
+        job_id = uuid.uuid4().hex
+        cls.update_job(
+            job_id,
+            status='QUEUED', processed=0, total=None, skipped=0,
+            file_type=file_type, filters=filters, file=None, error=None,
+            requested_by=str(requested_by.pk) if requested_by else None,
+            created_at=timezone.now().isoformat(),
+        )
+        export_invoice_archive_async.delay(job_id, filters, file_type)
+        return job_id
+
+    @classmethod
+    def build_archive(cls, job_id, filters: dict, file_type='pdf') -> str:
+        """
+        Write the ZIP for a job and store it. Returns the storage name.
+        Invoices that are missing or stale are rendered (and stored) on the way.
+        """
+        queryset = cls.get_queryset(**filters)
+        total = queryset.count()
+        cls.update_job(job_id, status='RUNNING', total=total)
+
+        processed = skipped = 0
+        with tempfile.TemporaryFile() as spool:
+            with zipfile.ZipFile(spool, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                for order in queryset.iterator(chunk_size=cls.CHUNK_SIZE):
+                    try:
+                        invoice = InvoiceService.get_invoice(order)
+                    except Exception as e:
+                        logger.error(f"Invoice export: could not render {order.id}: {e}")
+                        skipped += 1
+                        continue
+
+                    use_pdf = file_type == 'pdf' and bool(invoice.pdf_file)
+                    stored = invoice.pdf_file if use_pdf else invoice.html_file
+                    extension = 'pdf' if use_pdf else 'html'
+                    arcname = f"{order.created_at:%Y-%m}/{invoice.invoice_number}.{extension}"
+                    with stored.open('rb') as source, archive.open(arcname, 'w') as target:
+                        shutil.copyfileobj(source, target)
+
+                    processed += 1
+                    if processed % cls.PROGRESS_EVERY == 0:
+                        cls.update_job(job_id, processed=processed, skipped=skipped)
+
+            spool.seek(0)
+            name = default_storage.save(f"exports/invoices/{job_id}.zip", File(spool))
+
+        cls.update_job(job_id, status='COMPLETED', processed=processed, skipped=skipped,
+                        file=name, completed_at=timezone.now().isoformat())
+        logger.info(f"Invoice export {job_id}: {processed} invoices archived, {skipped} skipped")
+        return name
+
+
+class OrderArchiveService:
+    """
+    Moves old DELIVERED/CANCELLED orders (with items, payment and promo usages)
+    from the hot tables into the Archived* tables, one small transaction per
+    batch. Read paths go through `OrderHistory` so callers see both tiers.
+    """
+    ARCHIVABLE_STATUSES = (Order.Status.DELIVERED, Order.Status.CANCELLED)
+
+    @classmethod
+    def get_candidates(cls, older_than_days=None):
+        days = older_than_days or settings.ORDER_ARCHIVE_AFTER_DAYS
+        cutoff = timezone.now() - timedelta(days=days)
+        return Order.objects.filter(status__in=cls.ARCHIVABLE_STATUSES, updated_at__lt=cutoff).order_by('pk')
+
+    @classmethod
+    def archive_orders(cls, order_ids) -> int:
+        """Copy the given orders into the archive tier and delete them from the hot tables."""
+        from apps.payments.models import Payment
+        from apps.promotions.models import PromoUsage
+
+        with transaction.atomic():
+            orders = list(
+                Order.objects.select_for_update()
+                .filter(pk__in=order_ids, status__in=cls.ARCHIVABLE_STATUSES)
+                .select_related('invoice')
+            )
+            if not orders:
+                return 0
+            ids = [order.pk for order in orders]
+
+            archived_orders = []
+            for order in orders:
+                invoice = order.invoice if hasattr(order, 'invoice') else None
+                archived_orders.append(ArchivedOrder(
+                    id=order.pk, user_id=order.user_id, guest_email=order.guest_email,
+                    guest_phone=order.guest_phone, payment_method=order.payment_method,
+                    status=order.status, total_amount=order.total_amount,
+                    taxable_amount=order.taxable_amount, cgst_amount=order.cgst_amount,
+                    sgst_amount=order.sgst_amount, igst_amount=order.igst_amount,
+                    cess_amount=order.cess_amount, tax_amount=order.tax_amount,
+                    shipping_address=order.shipping_address, created_at=order.created_at,
+                    updated_at=order.updated_at,
+                    invoice_files={
+                        'number': invoice.invoice_number, 'html': invoice.html_file.name,
+                        'pdf': invoice.pdf_file.name,
+                    } if invoice else {},
+                ))
+            ArchivedOrder.objects.bulk_create(archived_orders)
+
+            ArchivedOrderItem.objects.bulk_create([
+                ArchivedOrderItem(
+                    order_id=item.order_id, product_id=item.product_id,
+                    product_snapshot=item.product_snapshot, length=item.length,
+                    breadth=item.breadth, height=item.height,
+                    unit_price=item.unit_price, quantity=item.quantity,
+                )
+                for item in OrderItem.objects.filter(order_id__in=ids)
+            ])
+
+            payments = Payment.objects.filter(order_id__in=ids)
+            ArchivedPayment.objects.bulk_create([
+                ArchivedPayment(
+                    id=payment.pk, order_id=payment.order_id,
+                    razorpay_order_id=payment.razorpay_order_id,
+                    razorpay_payment_id=payment.razorpay_payment_id,
+                    amount=payment.amount, currency=payment.currency, status=payment.status,
+                    created_at=payment.created_at, updated_at=payment.updated_at,
+                )
+                for payment in payments
+            ])
+
+            ArchivedPromoUsage.objects.bulk_create([
+                ArchivedPromoUsage(
+                    id=usage.pk, promo_id=usage.promo_id, user_id=usage.user_id,
+                    order_id=usage.order_id, discount_amount=usage.discount_amount,
+                    used_at=usage.used_at,
+                )
+                for usage in PromoUsage.objects.filter(order_id__in=ids)
+            ])
+
+            # Payment.order is PROTECT; everything else cascades from Order
+            payments.delete()
+            Order.objects.filter(pk__in=ids).delete()
+
+        return len(ids)
+
+    @classmethod
+    def run(cls, older_than_days=None, batch_size=None, max_batches=None, dry_run=False) -> dict:
+        batch_size = batch_size or settings.ORDER_ARCHIVE_BATCH_SIZE
+        candidates = cls.get_candidates(older_than_days)
+        if dry_run:
+            return {'archived': candidates.count(), 'batches': 0, 'dry_run': True}
+
+        archived = batches = 0
+        while max_batches is None or batches < max_batches:
+            ids = list(candidates.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            archived += cls.archive_orders(ids)
+            batches += 1
+
+        logger.info(f"Order archive: moved {archived} orders in {batches} batches")
+        return {'archived': archived, 'batches': batches, 'dry_run': False}
+
+
+class OrderHistory:
+    """
+    Unified read access over hot (`Order`) and archived (`ArchivedOrder`) orders
+    for customer history and reporting. Archived rows expose the same
+    attributes templates use (status, items, total_amount, payment, ...).
+    """
+
+    @staticmethod
+    def _querysets(**filters):
+        return (
+            Order.objects.filter(**filters).select_related('payment').prefetch_related('items__product'),
+            ArchivedOrder.objects.filter(**filters).select_related('payment').prefetch_related('items__product'),
+        )
+
+    @classmethod
+    def for_user(cls, user) -> list:
+        """All orders of a user, newest first, across both tiers."""
+        hot, cold = cls._querysets(user=user)
+        return list(heapq.merge(
+            hot.order_by('-created_at'), cold.order_by('-created_at'),
+            key=lambda order: order.created_at, reverse=True
+        ))
+
+    @staticmethod
+    def count_for_user(user) -> int:
+        return Order.objects.filter(user=user).count() + ArchivedOrder.objects.filter(user=user).count()
+
+    @classmethod
+    def get(cls, pk, **filters):
+        """Single order from either tier; raises Http404 when missing."""
+        from django.http import Http404
+
+        for queryset in cls._querysets(pk=pk, **filters):
+            order = queryset.first()
+            if order is not None:
+                return order
+        raise Http404("No order matches the given query.")
+
+    @classmethod
+    def get_for_user(cls, user, pk):
+        return cls.get(pk, user=user)
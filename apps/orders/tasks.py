@@ -0,0 +1,122 @@
+"""
+Celery Tasks for Order/Cart background work
+"""
+from celery import shared_task
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def send_abandoned_cart_notifications_async(self, recipients):
+    """
+    Send abandoned-cart reminders for one batch produced by AbandonedCartService.scan.
+
+    Args:
+        recipients: list of {'cart_id', 'email', 'user_name'} dicts
+    """
+    from apps.notifications.services import NotificationService
+
+    cart_url = f"{getattr(settings, 'FRONTEND_URL', 'http://localhost:8000')}/cart/"
+    sent = 0
+    for recipient in recipients:
+        try:
+            NotificationService.send_notification(
+                'ABANDONED_CART',
+                recipient['email'],
+                {'user_name': recipient['user_name'], 'cart_url': cart_url}
+            )
+            sent += 1
+        except Exception as e:
+            # One bad address must not fail (and retry) the whole batch
+            logger.error(f"Abandoned cart reminder failed for cart {recipient.get('cart_id')}: {e}")
+
+    return {'success': True, 'sent': sent, 'total': len(recipients)}
+
+
+@shared_task
+def scan_abandoned_carts_async():
+    """Periodic entry point (Celery beat) for the incremental abandoned-cart scan."""
+    from .services import AbandonedCartService
+
+    stats = AbandonedCartService.scan()
+    return {'scanned': stats['scanned'], 'queued': stats['queued'], 'batches': stats['batches']}
+
+
+@shared_task
+def purge_guest_carts_async():
+    """Periodic entry point (Celery beat) for guest cart and session garbage collection."""
+    from .services import GuestCartCleanupService
+
+    return GuestCartCleanupService.run()
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def render_invoice_async(self, order_id):
+    """
+    Render and store invoice HTML/PDF for an order (no-op if already current).
+    """
+    from .models import Order
+    from .services import InvoiceService
+
+    try:
+        order = Order.objects.get(pk=order_id)
+    except Order.DoesNotExist:
+        logger.error(f"Order {order_id} not found for invoice rendering")
+        return {'success': False, 'message': 'Order not found'}
+
+    try:
+        invoice = InvoiceService.render_and_store(order)
+    except Exception as e:
+        logger.error(f"Invoice rendering failed for order {order_id}: {e}")
+        raise self.retry(exc=e)
+
+    return {'success': True, 'content_hash': invoice.content_hash}
+
+
+@shared_task(bind=True)
+def export_invoice_archive_async(self, job_id, filters, file_type='pdf'):
+    """
+    Build a ZIP of invoices for InvoiceArchiveService; progress is kept in cache.
+    """
+    from .services import InvoiceArchiveService
+
+    try:
+        name = InvoiceArchiveService.build_archive(job_id, filters, file_type)
+    except Exception as e:
+        logger.error(f"Invoice export {job_id} failed: {e}")
+        InvoiceArchiveService.update_job(job_id, status='FAILED', error=str(e))
+        return {'success': False, 'message': str(e)}
+
+    return {'success': True, 'file': name}
+
+
+@shared_task
+def relay_order_events_async():
+    """Publish committed OrderEvent outbox rows (kicked on commit and by Celery beat)."""
+    from .events import OrderEventRelay
+
+    return {'published': OrderEventRelay.publish_pending()}
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def dispatch_order_events_async(self, event_ids):
+    """
+    Run order event consumers (SMS, invoice, ...) for one relay batch.
+    Failed consumers are retried with backoff (30s, 60s, 120s).
+    """
+    from .events import OrderEventDispatchError, dispatch_events
+
+    try:
+        return {'handled': dispatch_events(event_ids)}
+    except OrderEventDispatchError as e:
+        raise self.retry(exc=e, countdown=30 * (2 ** self.request.retries))
+
+
+@shared_task
+def archive_orders_async():
+    """Periodic entry point (Celery beat) for moving completed orders to the archive tier."""
+    from .services import OrderArchiveService
+
+    return OrderArchiveService.run()
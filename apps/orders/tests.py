@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from apps.core.money import Money
+
+from .models import ArchivedOrder, Order
+from .services import OrderArchiveService
+
+
+class OrderArchiveTaxTest(TestCase):
+
+    def test_archive_keeps_gst_totals(self):
+        order = Order.objects.create(
+            guest_phone='9000000000',
+            status=Order.Status.DELIVERED,
+            total_amount=Money.of(Decimal('1180.00')),
+            taxable_amount=Money.of(Decimal('1000.00')),
+            cgst_amount=Money.of(Decimal('90.00')),
+            sgst_amount=Money.of(Decimal('90.00')),
+            igst_amount=Money(0),
+            cess_amount=Money(0),
+            tax_amount=Money.of(Decimal('180.00')),
+            shipping_address={},
+        )
+
+        self.assertEqual(OrderArchiveService.archive_orders([order.pk]), 1)
+
+        archived = ArchivedOrder.objects.get(pk=order.pk)
+        self.assertTrue(archived.has_stored_tax)
+        self.assertEqual(archived.taxable_amount, Money.of(Decimal('1000.00')))
+        self.assertEqual(archived.cgst_amount, Money.of(Decimal('90.00')))
+        self.assertEqual(archived.tax_amount, Money.of(Decimal('180.00')))
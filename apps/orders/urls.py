@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import AddressViewSet, CartView, CartItemView, OrderViewSet, InvoiceView, ApplyCouponView
-from .admin_views import AdminOrderViewSet, AdminAnalyticsViewSet
+from .admin_views import AdminOrderViewSet, AdminAnalyticsViewSet, AdminInvoiceExportView
 
 router = DefaultRouter()
 router.register(r'admin/analytics', AdminAnalyticsViewSet, basename='admin-analytics')
@@ -16,4 +16,6 @@ urlpatterns = [
     path('cart/items/<int:pk>', CartItemView.as_view(), name='cart-remove-item'),
     path('cart/apply-coupon', ApplyCouponView.as_view(), name='cart-apply-coupon'),
     path('orders/<uuid:order_id>/invoice', InvoiceView.as_view(), name='order-invoice'),
+    path('admin/invoices/export', AdminInvoiceExportView.as_view(), name='admin-invoice-export'),
+    path('admin/invoices/export/<str:job_id>', AdminInvoiceExportView.as_view(), name='admin-invoice-export-status'),
 ]
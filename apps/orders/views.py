@@ -5,11 +5,14 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from django.db import transaction
-from django.http import HttpResponse
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse
 from .models import Address, Cart, CartItem, Order, OrderItem
 from .serializers import AddressSerializer, CartSerializer, CartItemSerializer, OrderSerializer, CreateOrderSerializer
-from .services import CartService, InvoiceService
+from .services import CartService, InvoiceService, OrderHistory
+from apps.core.money import Money
 from apps.products.services import PricingService
+from apps.taxation.services import TaxCalculationService
 from apps.products.models import Product
 from apps.location.permissions import HasVerifiedLocation
 from .cancellation import OrderCancellationMixin
@@ -170,18 +173,11 @@ class ApplyCouponView(APIView):
             return Response({"error": "Code required"}, status=status.HTTP_400_BAD_REQUEST)
 
         # Calculate Cart Total for validation
-        subtotal = 0
-        for item in cart.items.all():
-            try:
-                price_info = PricingService.calculate_price(item.product.id, item.length, item.breadth, item.height)
-                subtotal += float(price_info['final_price']) * item.quantity
-            except:
-                pass
+        subtotal = PricingService.cart_subtotal(cart)
         
         from apps.promotions.services import PromotionService
-        from decimal import Decimal
         
-        validation = PromotionService.validate_promo_code(code, request.user if request.user.is_authenticated else None, Decimal(str(subtotal)))
+        validation = PromotionService.validate_promo_code(code, request.user if request.user.is_authenticated else None, subtotal)
         
         if not validation['valid']:
             return Response({"error": validation['message']}, status=status.HTTP_400_BAD_REQUEST)
@@ -211,6 +207,24 @@ class OrderViewSet(OrderCancellationMixin, viewsets.ModelViewSet):
              return Order.objects.all().order_by('-created_at')
         return Order.objects.filter(user=self.request.user).order_by('-created_at')
 
+    def list(self, request, *args, **kwargs):
+        # Customers see archived orders too; writes stay on the hot queryset above
+        if request.user.role == 'ADMIN':
+            return super().list(request, *args, **kwargs)
+        orders = OrderHistory.for_user(request.user)
+        page = self.paginate_queryset(orders)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(orders, many=True).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        if request.user.role == 'ADMIN':
+            order = OrderHistory.get(kwargs['pk'])
+        else:
+            order = OrderHistory.get_for_user(request.user, kwargs['pk'])
+        self.check_object_permissions(request, order)
+        return Response(self.get_serializer(order).data)
+
     def create(self, request):
         """
         Checkout: Converts Cart -> Order
@@ -276,11 +290,11 @@ class OrderViewSet(OrderCancellationMixin, viewsets.ModelViewSet):
                 return Response({"error": "Cart is empty"}, status=status.HTTP_400_BAD_REQUEST)
 
             # Calculate Total & Create Order Items
-            total_amount = 0
+            total_amount = Money.ZERO
             
             # Create Order Shell
             order_data = {
-                'total_amount': 0,
+                'total_amount': Money.ZERO,
                 'shipping_address': shipping_address_data,
                 'status': Order.Status.PENDING
             }
@@ -299,6 +313,7 @@ class OrderViewSet(OrderCancellationMixin, viewsets.ModelViewSet):
             # For now, default PENDING is fine.
                 
             order = Order.objects.create(**order_data)
+            order_items = []
 
             for item in cart.items.all():
                 # Lock Product for Inventory Update
@@ -314,13 +329,13 @@ class OrderViewSet(OrderCancellationMixin, viewsets.ModelViewSet):
                 product.save()
 
                 price_info = PricingService.calculate_price(
-                    item.product.id, item.length, item.breadth, item.height
+                    product, item.length, item.breadth, item.height
                 )
                 unit_price = price_info['final_price']
                 line_total = unit_price * item.quantity
                 total_amount += line_total
                 
-                OrderItem.objects.create(
+                order_items.append(OrderItem.objects.create(
                     order=order,
                     product=item.product,
                     product_snapshot={'name': item.product.name, 'code': item.product.admin_code},
@@ -329,24 +344,24 @@ class OrderViewSet(OrderCancellationMixin, viewsets.ModelViewSet):
                     height=item.height,
                     unit_price=unit_price,
                     quantity=item.quantity
-                )
+                ))
 
             order.total_amount = total_amount
+            discount = Money.ZERO
             # Apply Coupon if present
             if cart.applied_promo:
                 from apps.promotions.services import PromotionService
-                from decimal import Decimal
                 
                 # Re-validate to be sure
                 validation = PromotionService.validate_promo_code(
                     cart.applied_promo.code, 
                     request.user if request.user.is_authenticated else None, 
-                    Decimal(str(total_amount))
+                    total_amount
                 )
                 
                 if validation['valid']:
                     discount = validation['discount_amount']
-                    total_amount = max(0, float(total_amount) - float(discount))
+                    total_amount = max(Money.ZERO, total_amount - discount)
                     
                     # Record Usage
                     from apps.promotions.models import PromoUsage, PromoCode
@@ -359,6 +374,9 @@ class OrderViewSet(OrderCancellationMixin, viewsets.ModelViewSet):
                         discount_amount=discount
                     )
                     PromoCode.objects.filter(id=cart.applied_promo.id).update(usage_count=F('usage_count') + 1)
+
+            # Freeze the GST breakdown (stored per line + order totals) on the discounted value
+            TaxCalculationService.capture_order_tax(order, order_items, discount=discount)
             
             order.total_amount = total_amount
             order.save()
@@ -385,10 +403,46 @@ class InvoiceView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, order_id):
-        order = get_object_or_404(Order, id=order_id)
-        if order.user != request.user and request.user.role != 'ADMIN':
+        order = Order.objects.select_related('invoice').filter(id=order_id).first() or OrderHistory.get(order_id)
+        if order.user_id != request.user.id and request.user.role != 'ADMIN':
              return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
+
+        if getattr(order, 'is_archived', False):
+            return self.archived_invoice(request, order)
         
-        # Generate Invoice
-        html_content = InvoiceService.generate_invoice_html(order)
-        return HttpResponse(html_content, content_type="text/html")
+        # Serve the stored artifact (rendered in background when the order was paid)
+        invoice = InvoiceService.get_invoice(order)
+        etag = f'"{invoice.content_hash}"'
+        if request.headers.get('If-None-Match') == etag:
+            return HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+
+        # ?file=pdf (not ?format=, which DRF reserves for renderer selection)
+        if request.query_params.get('file') == 'pdf':
+            if not invoice.pdf_file:
+                return Response({"error": "PDF invoice not available"}, status=status.HTTP_404_NOT_FOUND)
+            response = FileResponse(invoice.pdf_file.open('rb'), content_type='application/pdf',
+                                    filename=f"{invoice.invoice_number}.pdf")
+        else:
+            response = FileResponse(invoice.html_file.open('rb'), content_type='text/html; charset=utf-8')
+        response['ETag'] = etag
+        return response
+
+    def archived_invoice(self, request, order):
+        """Serve the artifacts recorded when the order was archived (they are never re-rendered)."""
+        files = order.invoice_files or {}
+        name = files.get('pdf') if request.query_params.get('file') == 'pdf' else files.get('html')
+        if not name or not default_storage.exists(name):
+            return Response({"error": "Invoice not available"}, status=status.HTTP_404_NOT_FOUND)
+
+        # Stored names are content hashes, so they double as ETags
+        etag = f'"{name.rsplit("/", 1)[-1].split(".", 1)[0]}"'
+        if request.headers.get('If-None-Match') == etag:
+            return HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+
+        if name == files.get('pdf'):
+            response = FileResponse(default_storage.open(name, 'rb'), content_type='application/pdf',
+                                    filename=f"{files.get('number') or order.id}.pdf")
+        else:
+            response = FileResponse(default_storage.open(name, 'rb'), content_type='text/html; charset=utf-8')
+        response['ETag'] = etag
+        return response
@@ -1,11 +1,12 @@
 from rest_framework import serializers
+from apps.core.money import MoneySerializerField
 from .models import Payment
 from apps.orders.models import Order
 from apps.products.models import Product
 
 class RefundSerializer(serializers.Serializer):
     payment_id = serializers.UUIDField(required=True)
-    amount = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    amount = MoneySerializerField(max_digits=10, required=False)
     reason = serializers.CharField(max_length=500, required=False)
     
     def validate_payment_id(self, value):
@@ -13,7 +13,7 @@ from .admin_serializers import (
 )
 from apps.orders.models import Order
 from apps.products.models import Product
-from apps.core.state_machines import validate_order_transition
+from apps.core.state_machines import validate_order_transition, transition_order
 from .services import RazorpayService
 import logging
 
@@ -71,8 +71,12 @@ class AdminOrderViewSet(viewsets.ReadOnlyModelViewSet):
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         old_status = order.status
-        order.status = new_status
-        order.save()
+        result = transition_order(order, new_status, allowed_from=[old_status], user=request.user,
+                                  reason=reason, action='ADMIN_STATUS_OVERRIDE', request=request)
+        if not result['won']:
+            return Response({
+                'error': f"Order status changed concurrently (now {result['current_status']})"
+            }, status=status.HTTP_409_CONFLICT)
         
         # Audit log
         logger.warning(
@@ -150,7 +154,7 @@ class RefundView(APIView):
             refund = client.payment.refund(
                 payment.razorpay_payment_id,
                 {
-                    'amount': int(float(refund_amount) * 100),  # Convert to paise
+                    'amount': refund_amount.paise,
                     'notes': {'reason': reason}
                 }
             )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.10 on 2026-10-19 15:00
+
+import apps.core.money
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payment',
+            name='amount',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=10),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 import uuid
+from apps.core.money import MoneyField
 from apps.orders.models import Order
 
 class Payment(models.Model):
@@ -17,7 +18,7 @@ class Payment(models.Model):
     razorpay_payment_id = models.CharField(max_length=100, blank=True, null=True)
     razorpay_signature = models.TextField(blank=True, null=True)
     
-    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    amount = MoneyField(max_digits=10)
     currency = models.CharField(max_length=3, default='INR')
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.CREATED)
     
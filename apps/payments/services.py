@@ -1,6 +1,11 @@
 import razorpay
 from django.conf import settings
+from django.db.models import F
+from apps.core.money import Money
 from rest_framework.exceptions import ValidationError
+import logging
+
+logger = logging.getLogger(__name__)
 
 class RazorpayService:
     @staticmethod
@@ -13,10 +18,10 @@ class RazorpayService:
         ))
 
     @staticmethod
-    def create_order(amount_in_inr: float, receipt: str) -> dict:
+    def create_order(amount: Money, receipt: str) -> dict:
         client = RazorpayService.get_client()
         data = {
-            "amount": int(amount_in_inr * 100), # Convert to paise
+            "amount": Money.of(amount).paise,
             "currency": "INR",
             "receipt": str(receipt),
             "payment_capture": 1 
@@ -32,3 +37,45 @@ class RazorpayService:
             return True
         except razorpay.errors.SignatureVerificationError:
             return False
+
+
+class PaymentCaptureService:
+    """
+    Marks a payment CAPTURED from the verify call or the webhook.
+
+    A declined attempt (payment.failed) returns the order's stock; when the
+    retry on the same Razorpay order then succeeds, the stock is taken out
+    again so the units are not sold twice. Call inside a transaction.
+    """
+
+    @staticmethod
+    def capture(payment, **fields) -> bool:
+        """Returns True if this call captured the payment (False: already captured/refunded)"""
+        from apps.core.state_machines import transition_payment
+        from .models import Payment
+
+        if transition_payment(payment, Payment.Status.CAPTURED, allowed_from=[Payment.Status.CREATED], **fields):
+            return True
+        if payment.status == Payment.Status.FAILED and transition_payment(
+            payment, Payment.Status.CAPTURED, allowed_from=[Payment.Status.FAILED], **fields
+        ):
+            PaymentCaptureService.reserve_stock(payment.order)
+            return True
+        return False
+
+    @staticmethod
+    def reserve_stock(order):
+        """Take the order's units out of stock again (after a failed attempt released them)"""
+        from apps.products.models import Product
+
+        for item in order.items.all():
+            taken = Product.objects.filter(pk=item.product_id, stock_quantity__gte=item.quantity).update(
+                stock_quantity=F('stock_quantity') - item.quantity
+            )
+            if not taken:
+                # Paid for, but the released units were sold meanwhile: needs manual follow-up
+                Product.objects.filter(pk=item.product_id).update(stock_quantity=0)
+                logger.error(
+                    f"Order {order.id}: insufficient stock to re-reserve {item.quantity} x product "
+                    f"{item.product_id} after payment retry"
+                )
@@ -0,0 +1,100 @@
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+
+from apps.core.money import Money
+from apps.core.state_machines import transition_payment
+from apps.orders.models import Order, OrderItem
+from apps.products.models import Category, Product
+
+from .models import Payment
+from .webhooks import RobustRazorpayWebhookView
+
+
+class FailedThenCapturedTest(TestCase):
+    """A declined attempt followed by a successful retry on the same Razorpay order must still pay the order."""
+
+    def setUp(self):
+        self.order = Order.objects.create(
+            guest_phone='9000000000',
+            status=Order.Status.AWAITING_PAYMENT,
+            total_amount=Money.of(Decimal('499.00')),
+            shipping_address={},
+        )
+        self.payment = Payment.objects.create(
+            order=self.order,
+            razorpay_order_id='order_retry',
+            amount=self.order.total_amount,
+            status=Payment.Status.FAILED,
+        )
+
+    def test_transition_payment_accepts_capture_after_failure(self):
+        self.assertTrue(transition_payment(self.payment, Payment.Status.CAPTURED, razorpay_payment_id='pay_2'))
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.Status.CAPTURED)
+        self.assertEqual(self.payment.razorpay_payment_id, 'pay_2')
+
+    def test_captured_webhook_marks_order_paid(self):
+        payment = Payment.objects.select_related('order').get(pk=self.payment.pk)
+        RobustRazorpayWebhookView()._process_event(
+            'payment.captured', payment, {'id': 'pay_2', 'amount': payment.amount.paise}
+        )
+
+        self.payment.refresh_from_db()
+        self.order.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.Status.CAPTURED)
+        self.assertEqual(self.order.status, Order.Status.PAID)
+
+    def test_repeated_capture_loses_and_reports_stored_status(self):
+        transition_payment(self.payment, Payment.Status.CAPTURED)
+        stale = Payment.objects.get(pk=self.payment.pk)
+        stale.status = Payment.Status.FAILED
+        self.assertFalse(transition_payment(stale, Payment.Status.CAPTURED))
+        self.assertEqual(stale.status, Payment.Status.CAPTURED)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class FailedThenCapturedStockTest(TestCase):
+    """payment.failed returns the stock; the successful retry must take it out again."""
+
+    def setUp(self):
+        category = Category.objects.create(name='Retry', slug='retry')
+        self.product = Product.objects.create(
+            category=category, name='Retry Product', admin_code='RETRY-1',
+            base_price=Money.of(Decimal('249.50')), stock_quantity=10,
+        )
+        self.order = Order.objects.create(
+            guest_phone='9000000000',
+            status=Order.Status.AWAITING_PAYMENT,
+            total_amount=Money.of(Decimal('499.00')),
+            shipping_address={},
+        )
+        OrderItem.objects.create(
+            order=self.order, product=self.product, product_snapshot={'name': 'Retry Product'},
+            length=1.0, breadth=1.0, height=1.0, unit_price=Money.of(Decimal('249.50')), quantity=2,
+        )
+        self.payment = Payment.objects.create(
+            order=self.order,
+            razorpay_order_id='order_stock',
+            amount=self.order.total_amount,
+        )
+
+    def _event(self, event, entity):
+        payment = Payment.objects.select_related('order').get(pk=self.payment.pk)
+        RobustRazorpayWebhookView()._process_event(event, payment, entity)
+
+    def test_retry_capture_reserves_stock_again(self):
+        self._event('payment.failed', {'id': 'pay_1'})
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock_quantity, 12)
+
+        self._event('payment.captured', {'id': 'pay_2', 'amount': self.payment.amount.paise})
+        self.product.refresh_from_db()
+        self.order.refresh_from_db()
+        self.assertEqual(self.product.stock_quantity, 10)
+        self.assertEqual(self.order.status, Order.Status.PAID)
+
+    def test_first_capture_leaves_stock_alone(self):
+        self._event('payment.captured', {'id': 'pay_1', 'amount': self.payment.amount.paise})
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock_quantity, 10)
@@ -6,9 +6,10 @@ from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from .models import Payment
-from .services import RazorpayService
+from .services import PaymentCaptureService, RazorpayService
 from .serializers import CreatePaymentSerializer, VerifyPaymentSerializer
 from apps.orders.models import Order
+from apps.core.state_machines import transition_order
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,18 +36,26 @@ class CreateRazorpayOrderView(APIView):
              })
 
         try:
-            rz_order = RazorpayService.create_order(float(order.total_amount), str(order.id))
+            rz_order = RazorpayService.create_order(order.total_amount, str(order.id))
             
-            Payment.objects.create(
-                order=order,
-                razorpay_order_id=rz_order['id'],
-                amount=order.total_amount,
-                currency=rz_order['currency'],
-                status=Payment.Status.CREATED
-            )
-            
-            order.status = Order.Status.AWAITING_PAYMENT
-            order.save()
+            with transaction.atomic():
+                Payment.objects.create(
+                    order=order,
+                    razorpay_order_id=rz_order['id'],
+                    amount=order.total_amount,
+                    currency=rz_order['currency'],
+                    status=Payment.Status.CREATED
+                )
+
+                result = transition_order(order, Order.Status.AWAITING_PAYMENT, user=request.user,
+                                          reason='Razorpay order created', request=request)
+                if not result['won']:
+                    # Order moved on (cancelled, or another init won): drop our Payment row
+                    transaction.set_rollback(True)
+                    return Response(
+                        {"error": f"Order is {result['current_status']}, not pending"},
+                        status=status.HTTP_409_CONFLICT
+                    )
 
             return Response({
                 "razorpay_order_id": rz_order['id'],
@@ -71,25 +80,40 @@ class VerifyPaymentView(APIView):
         if not RazorpayService.verify_signature(data):
             return Response({"error": "Invalid Signature"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Update DB
-        with transaction.atomic():
-            payment = get_object_or_404(Payment, razorpay_order_id=data['razorpay_order_id'])
-            
-            # Security: Verify the payment belongs to the requesting user
-            if payment.order.user != request.user:
-                logger.warning(f"Unauthorized payment verification attempt: {request.user.id} for order {payment.order.id}")
-                return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
-            
-            if payment.status == Payment.Status.CAPTURED:
-                return Response({"message": "Already captured"}, status=status.HTTP_200_OK)
+        payment = get_object_or_404(Payment.objects.select_related('order'), razorpay_order_id=data['razorpay_order_id'])
+        
+        # Security: Verify the payment belongs to the requesting user
+        if payment.order.user_id != request.user.id:
+            logger.warning(f"Unauthorized payment verification attempt: {request.user.id} for order {payment.order.id}")
+            return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
 
-            payment.razorpay_payment_id = data['razorpay_payment_id']
-            payment.razorpay_signature = data['razorpay_signature']
-            payment.status = Payment.Status.CAPTURED
-            payment.save()
+        # Update DB (compare-and-set: races with the webhook resolve to one winner)
+        with transaction.atomic():
+            captured = PaymentCaptureService.capture(
+                payment,
+                razorpay_payment_id=data['razorpay_payment_id'],
+                razorpay_signature=data['razorpay_signature'],
+            )
+            if not captured:
+                # Lost to the webhook (or refunded meanwhile): answer from the stored state
+                if payment.status == Payment.Status.CAPTURED:
+                    return Response({"message": "Already captured"}, status=status.HTTP_200_OK)
+                return Response(
+                    {"error": f"Payment is {payment.status}"},
+                    status=status.HTTP_409_CONFLICT
+                )
             
-            payment.order.status = Order.Status.PAID
-            payment.order.save()
+            result = transition_order(payment.order, Order.Status.PAID, user=request.user,
+                                      reason='Payment verified', action='ORDER_PAID', request=request)
+            if not result['won']:
+                # Money is taken either way: keep the capture, flag the order for follow-up
+                logger.warning(
+                    f"Payment {payment.id} captured but order {payment.order.id} is {result['current_status']}"
+                )
+                return Response(
+                    {"error": f"Payment captured but order is {result['current_status']}"},
+                    status=status.HTTP_409_CONFLICT
+                )
 
         return Response({"status": "Payment Verified"}, status=status.HTTP_200_OK)
 
@@ -110,13 +134,11 @@ class RazorpayWebhookView(APIView):
             rz_order_id = payment_entity['order_id']
             
             try:
-                payment = Payment.objects.get(razorpay_order_id=rz_order_id)
-                if payment.status != Payment.Status.CAPTURED:
-                    payment.status = Payment.Status.CAPTURED
-                    payment.save()
-                    payment.order.status = Order.Status.PAID
-                    payment.order.save()
-                    logger.info(f"Webhook: Captured Order {payment.order.id}")
+                payment = Payment.objects.select_related('order').get(razorpay_order_id=rz_order_id)
+                with transaction.atomic():
+                    if PaymentCaptureService.capture(payment):
+                        transition_order(payment.order, Order.Status.PAID, action='ORDER_PAID')
+                        logger.info(f"Webhook: Captured Order {payment.order.id}")
             except Payment.DoesNotExist:
                 logger.error(f"Webhook: Payment not found for {rz_order_id}")
 
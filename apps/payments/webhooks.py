@@ -6,8 +6,9 @@ from django.db import transaction
 from django.shortcuts import get_object_or_404
 from .models import Payment
 from apps.orders.models import Order
-from .services import RazorpayService
+from .services import PaymentCaptureService, RazorpayService
 from apps.core.services.redis_service import RedisService
+from apps.core.state_machines import transition_order, transition_payment
 import logging
 import json
 
@@ -67,18 +68,12 @@ class RobustRazorpayWebhookView(APIView):
             logger.info(f"Webhook: Duplicate Event Ignored {idempotency_key}")
             return Response({"status": "ignored_duplicate"}, status=status.HTTP_200_OK)
 
-        # 4. DISTRIBUTED LOCKING & PROCESSING
-        # Lock on the ORDER ID to prevent race condition with Frontend Success Page
-        # We need to find the internal Order ID via Payment table or Notes
-        
+        # 4. PROCESSING
+        # Concurrency with the frontend verify call is handled by compare-and-set
+        # transitions on Payment and Order: whichever UPDATE lands first wins.
         try:
-            # Finding internal order might require DB lookup if not in notes
-            # We stored razopray_order_id in Payment table.
-            payment_record = Payment.objects.get(razorpay_order_id=rz_order_id)
-            order_id = str(payment_record.order.id)
-            
-            with RedisService.acquire_lock("order", order_id, timeout=30):
-                self._process_event(event_type, payment_record, payment_entity)
+            payment_record = Payment.objects.select_related('order').get(razorpay_order_id=rz_order_id)
+            self._process_event(event_type, payment_record, payment_entity)
 
         except Payment.DoesNotExist:
             logger.error(f"Webhook: Unknown Order {rz_order_id}")
@@ -86,68 +81,62 @@ class RobustRazorpayWebhookView(APIView):
             return Response({"status": "unknown_order"}, status=status.HTTP_200_OK)
         except Exception as e:
             logger.error(f"Webhook: Processing Error {e}")
-            # If lock failed or DB error, we might want to return 500 to trigger retry (if not lock timeout)
-            # But for lock timeout (race condition), ideally we check DB status.
+            # DB error: return 500 so Razorpay retries
             return Response({"status": "error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         return Response({"status": "processed"}, status=status.HTTP_200_OK)
 
     def _process_event(self, event_type, payment_record, payment_entity):
-        # RELOAD DB record to get latest state inside lock
-        payment_record.refresh_from_db()
         order = payment_record.order
 
         if event_type == 'payment.captured':
-            if payment_record.status == Payment.Status.CAPTURED:
-                logger.info(f"Webhook: Already Captured {payment_record.id}")
-                return
+            # Gateway amount is integer paise; ours is Money, so this is an exact comparison
+            captured = payment_entity.get('amount')
+            if captured is not None and captured != payment_record.amount.paise:
+                logger.error(
+                    f"Webhook: Captured amount {captured} paise != expected "
+                    f"{payment_record.amount.paise} paise for payment {payment_record.id}"
+                )
 
             with transaction.atomic():
-                payment_record.razorpay_payment_id = payment_entity['id']
-                payment_record.status = Payment.Status.CAPTURED
-                payment_record.save()
-                
-                if order.status != Order.Status.PAID:
-                    order.status = Order.Status.PAID
-                    order.save()
+                if not PaymentCaptureService.capture(payment_record, razorpay_payment_id=payment_entity['id']):
+                    logger.info(f"Webhook: Capture ignored for {payment_record.id} (payment is {payment_record.status})")
+                    return
+
+                result = transition_order(order, Order.Status.PAID, reason='Razorpay payment.captured webhook',
+                                          action='ORDER_PAID')
+                if result['won']:
                     logger.info(f"Webhook: Order {order.id} marked PAID")
+                else:
+                    logger.warning(f"Webhook: Payment captured but order {order.id} is {result['current_status']}")
 
         elif event_type == 'payment.failed':
-            if payment_record.status == Payment.Status.FAILED:
-                return
-
             with transaction.atomic():
-                payment_record.status = Payment.Status.FAILED
-                payment_record.save()
+                if not transition_payment(payment_record, Payment.Status.FAILED):
+                    return
                 
                 # CRITICAL: Rollback stock on payment failure
-                from apps.products.models import Product
-                for item in order.items.all():
-                    product = Product.objects.select_for_update().get(id=item.product.id)
-                    product.stock_quantity += item.quantity
-                    product.save()
-                    logger.info(f"Webhook: Restored {item.quantity} units of {product.name}")
-                
+                self._restore_stock(order)
                 logger.info(f"Webhook: Payment Failed {payment_record.id}, Stock Restored")
         
         elif event_type == 'refund.processed' or event_type == 'payment.refunded':
             # Handle refund webhook
-            if payment_record.status == Payment.Status.REFUNDED:
-                return
-            
             with transaction.atomic():
-                payment_record.status = Payment.Status.REFUNDED
-                payment_record.save()
+                if not transition_payment(payment_record, Payment.Status.REFUNDED):
+                    return
                 
                 # Restore stock on refund
-                from apps.products.models import Product
-                for item in order.items.all():
-                    product = Product.objects.select_for_update().get(id=item.product.id)
-                    product.stock_quantity += item.quantity
-                    product.save()
-                
+                self._restore_stock(order)
                 logger.info(f"Webhook: Refund processed {payment_record.id}, Stock Restored")
 
+    def _restore_stock(self, order):
+        from apps.products.models import Product
+        for item in order.items.all():
+            product = Product.objects.select_for_update().get(id=item.product_id)
+            product.stock_quantity += item.quantity
+            product.save()
+            logger.info(f"Webhook: Restored {item.quantity} units of {product.name}")
+
     def _get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.10 on 2026-10-19 13:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0011_alter_customizerequest_status'),
+        ('taxation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='tax_category',
+            field=models.ForeignKey(blank=True, help_text='GST category/HSN for products in this category', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='categories', to='taxation.taxcategory'),
+        ),
+    ]
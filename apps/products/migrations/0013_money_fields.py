@@ -0,0 +1,29 @@
+# Generated by Django 5.2.10 on 2026-10-19 15:00
+
+import apps.core.money
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0012_category_tax_category'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='base_price',
+            field=apps.core.money.MoneyField(decimal_places=2, help_text='Base price in INR', max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='dimensionconfig',
+            name='price_add_on',
+            field=apps.core.money.MoneyField(decimal_places=2, default=0.0, help_text='Flat add-on cost in INR', max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='productdimension',
+            name='price',
+            field=apps.core.money.MoneyField(decimal_places=2, help_text='Price for this specific dimension', max_digits=10),
+        ),
+    ]
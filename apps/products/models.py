@@ -1,4 +1,5 @@
 from django.db import models
+from apps.core.money import MoneyField
 from django.utils.translation import gettext_lazy as _
 import uuid
 
@@ -7,6 +8,10 @@ class Category(models.Model):
     slug = models.SlugField(max_length=100, unique=True)
     description = models.TextField(blank=True)
     parent = models.ForeignKey('self', null=True, blank=True, related_name='subcategories', on_delete=models.CASCADE)
+    tax_category = models.ForeignKey(
+        'taxation.TaxCategory', null=True, blank=True, related_name='categories',
+        on_delete=models.SET_NULL, help_text="GST category/HSN for products in this category"
+    )
     
     class Meta:
         verbose_name_plural = 'Categories'
@@ -20,7 +25,7 @@ class Product(models.Model):
     name = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, unique=True, null=True, blank=True)
     admin_code = models.CharField(max_length=50, unique=True, help_text="Internal SKU or Code")
-    base_price = models.DecimalField(max_digits=10, decimal_places=2, help_text="Base price in INR")
+    base_price = MoneyField(max_digits=10, help_text="Base price in INR")
     description = models.TextField(blank=True)
     legacy_image_urls = models.JSONField(default=list, help_text="List of image URLs (Deprecated)", blank=True)
     
@@ -75,7 +80,7 @@ class DimensionConfig(models.Model):
     max_height = models.FloatField(help_text="Max Height in cm")
 
     price_multiplier = models.DecimalField(max_digits=5, decimal_places=2, default=1.00, help_text="Multiplier for Base Price")
-    price_add_on = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, help_text="Flat add-on cost in INR")
+    price_add_on = MoneyField(max_digits=10, default=0.00, help_text="Flat add-on cost in INR")
 
     def __str__(self):
         return f"{self.product.name} Config ({self.min_length}-{self.max_length}L)"
@@ -88,7 +93,7 @@ class ProductDimension(models.Model):
     length = models.FloatField(help_text="Length in cm")
     breadth = models.FloatField(help_text="Breadth in cm")
     height = models.FloatField(help_text="Height in cm")
-    price = models.DecimalField(max_digits=10, decimal_places=2, help_text="Price for this specific dimension")
+    price = MoneyField(max_digits=10, help_text="Price for this specific dimension")
     is_default = models.BooleanField(default=False)
 
     class Meta:
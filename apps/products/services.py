@@ -1,4 +1,5 @@
 from decimal import Decimal
+from apps.core.money import Money
 from .models import Product, DimensionConfig
 
 class PricingService:
@@ -10,8 +11,13 @@ class PricingService:
         1. Exact match in ProductDimension
         2. Range match in DimensionConfig
         3. Base Price (fallback)
+
+        `product_id` may also be a Product instance. Prices are Money.
         """
-        product = Product.objects.get(id=product_id)
+        if isinstance(product_id, Product):
+            product = product_id
+        else:
+            product = Product.objects.get(id=product_id)
 
         # 1. Check for Exact ProductDimension Match
         try:
@@ -26,7 +32,7 @@ class PricingService:
                 "final_price": dim.price,
                 "base_price": dim.price, # Treat as base
                 "multiplier": Decimal("1.0"),
-                "add_on": Decimal("0.0"),
+                "add_on": Money.ZERO,
                 "config_id": None,
                 "dimension_id": dim.id
             }
@@ -53,10 +59,10 @@ class PricingService:
             multiplier = matching_config.price_multiplier
             add_on = matching_config.price_add_on
             
-            final_price = (base * multiplier) + add_on
+            final_price = base.scale(multiplier) + add_on
             
             return {
-                "final_price": final_price.quantize(Decimal("0.01")),
+                "final_price": final_price,
                 "base_price": base,
                 "multiplier": multiplier,
                 "add_on": add_on,
@@ -68,6 +74,31 @@ class PricingService:
             "final_price": product.base_price,
             "base_price": product.base_price,
             "multiplier": Decimal("1.0"),
-            "add_on": Decimal("0.0"),
+            "add_on": Money.ZERO,
             "config_id": None
         }
+
+    @staticmethod
+    def price_items(items) -> list:
+        """
+        Unit prices for cart items as [(item, Money or None)]; None when the
+        item's dimensions are no longer available.
+        """
+        priced = []
+        for item in items:
+            try:
+                price_info = PricingService.calculate_price(item.product, item.length, item.breadth, item.height)
+                priced.append((item, price_info['final_price']))
+            except (ValueError, Product.DoesNotExist):
+                priced.append((item, None))
+        return priced
+
+    @staticmethod
+    def cart_subtotal(cart) -> Money:
+        """Sum of priced cart lines (unavailable dimensions are skipped)"""
+        return sum(
+            (unit_price * item.quantity
+             for item, unit_price in PricingService.price_items(cart.items.select_related('product'))
+             if unit_price is not None),
+            Money.ZERO
+        )
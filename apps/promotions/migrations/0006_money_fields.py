@@ -0,0 +1,30 @@
+# Generated by Django 5.2.10 on 2026-10-19 15:00
+
+import apps.core.money
+import decimal
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('promotions', '0005_popup'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='promocode',
+            name='max_discount_amount',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, help_text='Maximum discount cap for percentage based discounts', max_digits=10, null=True),
+        ),
+        migrations.AlterField(
+            model_name='promocode',
+            name='min_order_amount',
+            field=apps.core.money.MoneyField(decimal_places=2, default=decimal.Decimal('0.00'), help_text='Minimum cart value required', max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='promousage',
+            name='discount_amount',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=10),
+        ),
+    ]
@@ -5,6 +5,7 @@ from django.db import models
 from django.conf import settings
 from decimal import Decimal
 import uuid
+from apps.core.money import MoneyField
 from django.utils import timezone
 
 class PromoCode(models.Model):
@@ -23,13 +24,13 @@ class PromoCode(models.Model):
     discount_type = models.CharField(max_length=10, choices=DISCOUNT_TYPES, default='PERCENT')
     discount_value = models.DecimalField(max_digits=10, decimal_places=2, help_text="Percentage value or Fixed Amount")
     
-    max_discount_amount = models.DecimalField(
-        max_digits=10, decimal_places=2, null=True, blank=True,
+    max_discount_amount = MoneyField(
+        max_digits=10, null=True, blank=True,
         help_text="Maximum discount cap for percentage based discounts"
     )
     
-    min_order_amount = models.DecimalField(
-        max_digits=10, decimal_places=2, default=Decimal('0.00'),
+    min_order_amount = MoneyField(
+        max_digits=10, default=Decimal('0.00'),
         help_text="Minimum cart value required"
     )
     
@@ -69,7 +70,7 @@ class PromoUsage(models.Model):
     promo = models.ForeignKey(PromoCode, on_delete=models.PROTECT, related_name='usages')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     order = models.ForeignKey('orders.Order', on_delete=models.CASCADE, related_name='promo_usages')
-    discount_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    discount_amount = MoneyField(max_digits=10)
     used_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -2,8 +2,8 @@
 Promotions Service
 Handles validation and calculation of discounts
 """
-from decimal import Decimal
 from django.utils import timezone
+from apps.core.money import Money
 from .models import PromoCode, PromoUsage
 from django.db.models import F
 import logging
@@ -13,10 +13,12 @@ logger = logging.getLogger(__name__)
 class PromotionService:
     
     @staticmethod
-    def validate_promo_code(code: str, user=None, order_total: Decimal = Decimal('0.00')) -> dict:
+    def validate_promo_code(code: str, user=None, order_total=Money.ZERO) -> dict:
         """
         Validate a promo code for applicability.
+        `order_total` is Money (rupee Decimals are accepted too).
         """
+        order_total = Money.of(order_total)
         try:
             promo = PromoCode.objects.get(code__iexact=code)
         except PromoCode.DoesNotExist:
@@ -30,7 +32,11 @@ class PromotionService:
             return {'valid': False, 'message': f'Minimum order amount of {promo.min_order_amount} required'}
             
         if user and user.is_authenticated:
-            user_usage = PromoUsage.objects.filter(promo=promo, user=user).count()
+            # Usages of archived orders still count towards the per-user limit
+            user_usage = (
+                PromoUsage.objects.filter(promo=promo, user=user).count()
+                + promo.archived_usages.filter(user=user).count()
+            )
             if user_usage >= promo.per_user_limit:
                 return {'valid': False, 'message': 'You have already used this promo code'}
         
@@ -45,11 +51,12 @@ class PromotionService:
         }
 
     @staticmethod
-    def calculate_discount(promo: PromoCode, order_total: Decimal) -> Decimal:
+    def calculate_discount(promo: PromoCode, order_total: Money) -> Money:
+        order_total = Money.of(order_total)
         if promo.discount_type == 'FIXED':
-            discount = promo.discount_value
+            discount = Money.of(promo.discount_value)
         else:
-            discount = order_total * (promo.discount_value / Decimal('100.00'))
+            discount = order_total.percent(promo.discount_value)
             if promo.max_discount_amount:
                 discount = min(discount, promo.max_discount_amount)
         
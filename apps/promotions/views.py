@@ -8,10 +8,11 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from .models import PromoCode
 from .services import PromotionService
 from rest_framework import serializers
+from apps.core.money import MoneySerializerField
 
 class ValidatePromoSerializer(serializers.Serializer):
     code = serializers.CharField()
-    order_amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    order_amount = MoneySerializerField(max_digits=10)
 
 class ValidatePromoView(APIView):
     """
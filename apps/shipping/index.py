@@ -0,0 +1,194 @@
+"""
+Shipping Index
+
+Immutable, process-cached lookup tables for shipping quotes:
+normalized state -> zone, per-zone active rates sorted by order value, active
+shipping methods and the pincode serviceability table. Workers share
+invalidation through a version key in the Django cache (bumped on commit by
+apps.shipping.signals and the import_pincodes command, see
+apps.core.versioned_cache), so a quote is lookups plus arithmetic, with no
+queries.
+"""
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+from apps.core.versioned_cache import VersionedProcessCache
+
+VERSION_KEY = "shipping_index_version"
+
+
+def normalize_state(state: str) -> str:
+    return (state or '').lower().strip()
+
+
+def pincode_key(pincode) -> Optional[int]:
+    """Integer form of a pincode ('560 001' -> 560001); None if not numeric"""
+    digits = str(pincode or '').replace(' ', '').strip()
+    if not digits.isdigit() or len(digits) > 9:
+        return None
+    return int(digits)
+
+
+# PincodeTable flag bits
+SERVICEABLE = 1
+COD_AVAILABLE = 2
+PREPAID_ONLY = 4
+
+
+class PincodeTable:
+    """
+    Read-only pincode serviceability table in parallel arrays.
+
+    ~19k pincodes take a few hundred KB instead of one model instance each:
+    sorted int32 pincodes, a flag byte per row, and int16 indexes into the
+    shared zone and place (city, state) tuples. Lookups are a binary search.
+    """
+    __slots__ = ('pincodes', 'flags', 'zone_idx', 'place_idx', 'zones', 'places')
+
+    def __init__(self, rows=(), zones=()):
+        """`rows`: (pincode, zone_id, city, state, flags); `zones`: every ShippingZone"""
+        self.zones = tuple(zones)
+        zone_positions = {zone.pk: position for position, zone in enumerate(self.zones)}
+        place_positions = {}
+        entries = sorted(
+            (key, zone_id, city, state, flags)
+            for key, zone_id, city, state, flags in (
+                (pincode_key(row[0]), *row[1:]) for row in rows
+            )
+            if key is not None
+        )
+
+        self.pincodes = array('i')
+        self.flags = array('B')
+        self.zone_idx = array('h')
+        self.place_idx = array('H')
+        for key, zone_id, city, state, flags in entries:
+            if self.pincodes and self.pincodes[-1] == key:
+                continue  # '560001' and '560 001' both stored; keep the first
+            self.pincodes.append(key)
+            self.flags.append(flags)
+            self.zone_idx.append(zone_positions.get(zone_id, -1))
+            self.place_idx.append(place_positions.setdefault((city, state), len(place_positions)))
+        self.places = tuple(place_positions)
+
+    def __len__(self):
+        return len(self.pincodes)
+
+    def _position(self, pincode) -> Optional[int]:
+        key = pincode_key(pincode)
+        if key is None:
+            return None
+        position = bisect_left(self.pincodes, key)
+        if position < len(self.pincodes) and self.pincodes[position] == key:
+            return position
+        return None
+
+    def lookup(self, pincode) -> Optional[dict]:
+        """Serviceability row for a pincode, or None if it is not listed"""
+        position = self._position(pincode)
+        if position is None:
+            return None
+        flags = self.flags[position]
+        zone_position = self.zone_idx[position]
+        city, state = self.places[self.place_idx[position]]
+        return {
+            'zone': self.zones[zone_position] if zone_position >= 0 else None,
+            'city': city,
+            'state': state,
+            'serviceable': bool(flags & SERVICEABLE),
+            'cod_available': bool(flags & COD_AVAILABLE),
+            'prepaid_only': bool(flags & PREPAID_ONLY),
+        }
+
+    def zone_for(self, pincode):
+        """Active zone of a serviceable pincode"""
+        position = self._position(pincode)
+        if position is None or not self.flags[position] & SERVICEABLE:
+            return None
+        zone_position = self.zone_idx[position]
+        if zone_position < 0:
+            return None
+        zone = self.zones[zone_position]
+        return zone if zone.is_active else None
+
+
+@dataclass(frozen=True)
+class ShippingIndex:
+    version: int
+    zone_by_state: Mapping[str, object] = field(default_factory=lambda: MappingProxyType({}))
+    pincodes: PincodeTable = field(default_factory=PincodeTable)
+    rates_by_zone: Mapping[object, Tuple[object, ...]] = field(default_factory=lambda: MappingProxyType({}))
+    methods: Tuple[object, ...] = ()
+    method_by_code: Mapping[str, object] = field(default_factory=lambda: MappingProxyType({}))
+
+    def zone_for_state(self, state: str):
+        return self.zone_by_state.get(normalize_state(state))
+
+    def zone_for_pincode(self, pincode: str):
+        return self.pincodes.zone_for(pincode)
+
+    def rate_for(self, zone, order_value) -> Optional[object]:
+        """First active rate of the zone whose order-value band contains `order_value`"""
+        for rate in self.rates_by_zone.get(zone.pk, ()):
+            if rate.min_order_value > order_value:
+                break  # sorted by min_order_value
+            if rate.max_order_value is None or rate.max_order_value >= order_value:
+                return rate
+        return None
+
+
+def build_index(version: int) -> ShippingIndex:
+    """Load zones, rates, pincodes and methods (four queries)"""
+    from .models import PincodeServiceability, ShippingMethod, ShippingRate, ShippingZone
+
+    all_zones = list(ShippingZone.objects.order_by('priority', 'name'))
+    zones = {zone.pk: zone for zone in all_zones if zone.is_active}
+
+    zone_by_state = {}
+    for zone in zones.values():
+        for state in zone.states:
+            # Lower priority value wins when zones overlap
+            zone_by_state.setdefault(normalize_state(state), zone)
+
+    pincodes = PincodeTable(
+        (
+            (pincode, zone_id, city, state,
+             (SERVICEABLE if serviceable else 0) | (COD_AVAILABLE if cod else 0) | (PREPAID_ONLY if prepaid else 0))
+            for pincode, zone_id, city, state, serviceable, cod, prepaid in
+            PincodeServiceability.objects.order_by().values_list(
+                'pincode', 'zone_id', 'city', 'state', 'is_serviceable', 'cod_available', 'prepaid_only'
+            ).iterator(chunk_size=5000)
+        ),
+        zones=all_zones,
+    )
+
+    rates_by_zone = {}
+    for rate in ShippingRate.objects.filter(is_active=True, zone_id__in=zones.keys()).order_by('min_order_value'):
+        rate.zone = zones[rate.zone_id]
+        rates_by_zone.setdefault(rate.zone_id, []).append(rate)
+
+    methods = tuple(ShippingMethod.objects.filter(is_active=True).order_by('priority'))
+
+    return ShippingIndex(
+        version=version,
+        zone_by_state=MappingProxyType(zone_by_state),
+        pincodes=pincodes,
+        rates_by_zone=MappingProxyType({zone_id: tuple(rates) for zone_id, rates in rates_by_zone.items()}),
+        methods=methods,
+        method_by_code=MappingProxyType({method.code: method for method in methods}),
+    )
+
+
+_cache = VersionedProcessCache(VERSION_KEY, build_index, "Shipping index")
+
+
+def get_shipping_index() -> ShippingIndex:
+    """Current index; rebuilt when the shared version moves"""
+    return _cache.get()
+
+
+def bump_version():
+    """Invalidate the index in every worker once the current transaction commits"""
+    _cache.invalidate()
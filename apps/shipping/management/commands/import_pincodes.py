@@ -0,0 +1,39 @@
+"""
+Management command to bulk load a pincode serviceability dataset (CSV)
+"""
+from django.core.management.base import BaseCommand, CommandError
+from apps.shipping.services import PincodeImportService
+
+
+class Command(BaseCommand):
+    help = 'Import pincode serviceability rows from a CSV file (pincode, city, state[, zone, cod_available, prepaid_only, is_serviceable])'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help='Path to the CSV file')
+        parser.add_argument('--zone', default=None, help='Zone name for rows with no zone column and no state match')
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows per insert (default: 2000)')
+        parser.add_argument('--skip-existing', action='store_true', help='Leave existing pincodes untouched instead of updating them')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the file without writing')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8-sig') as file:
+                result = PincodeImportService.run(
+                    file,
+                    default_zone_name=options['zone'],
+                    batch_size=options['batch_size'],
+                    update_existing=not options['skip_existing'],
+                    dry_run=options['dry_run'],
+                )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for error in result['errors'][:20]:
+            self.stderr.write(error)
+        if len(result['errors']) > 20:
+            self.stderr.write(f"... and {len(result['errors']) - 20} more")
+
+        prefix = '[DRY RUN] ' if result['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Imported {result['imported']} pincodes, skipped {result['skipped']}"
+        ))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.10 on 2026-10-19 15:00
+
+import apps.core.money
+import decimal
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shipping', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='shippingrate',
+            name='min_order_value',
+            field=apps.core.money.MoneyField(decimal_places=2, default=decimal.Decimal('0.00'), max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='shippingrate',
+            name='max_order_value',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, help_text='Leave blank for no upper limit', max_digits=10, null=True),
+        ),
+        migrations.AlterField(
+            model_name='shippingrate',
+            name='base_rate',
+            field=apps.core.money.MoneyField(decimal_places=2, help_text='Base shipping charge', max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='shippingrate',
+            name='per_kg_rate',
+            field=apps.core.money.MoneyField(decimal_places=2, default=decimal.Decimal('0.00'), help_text='Additional charge per kg after base weight', max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='shippingrate',
+            name='free_above',
+            field=apps.core.money.MoneyField(blank=True, decimal_places=2, help_text='Free shipping for orders above this amount', max_digits=10, null=True),
+        ),
+    ]
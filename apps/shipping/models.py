@@ -3,6 +3,7 @@ Shipping Models - Shipping zones, rates, and calculation
 """
 from django.db import models
 from decimal import Decimal
+from apps.core.money import MoneyField
 import uuid
 
 
@@ -49,23 +50,23 @@ class ShippingRate(models.Model):
     name = models.CharField(max_length=100)
     
     # Order value range
-    min_order_value = models.DecimalField(
-        max_digits=10, decimal_places=2, default=Decimal('0.00')
+    min_order_value = MoneyField(
+        max_digits=10, default=Decimal('0.00')
     )
-    max_order_value = models.DecimalField(
-        max_digits=10, decimal_places=2, null=True, blank=True,
+    max_order_value = MoneyField(
+        max_digits=10, null=True, blank=True,
         help_text="Leave blank for no upper limit"
     )
     
     # Base shipping rate
-    base_rate = models.DecimalField(
-        max_digits=10, decimal_places=2,
+    base_rate = MoneyField(
+        max_digits=10,
         help_text="Base shipping charge"
     )
     
     # Per-kg rate for weight-based shipping
-    per_kg_rate = models.DecimalField(
-        max_digits=10, decimal_places=2, default=Decimal('0.00'),
+    per_kg_rate = MoneyField(
+        max_digits=10, default=Decimal('0.00'),
         help_text="Additional charge per kg after base weight"
     )
     base_weight_kg = models.DecimalField(
@@ -74,8 +75,8 @@ class ShippingRate(models.Model):
     )
     
     # Free shipping threshold
-    free_above = models.DecimalField(
-        max_digits=10, decimal_places=2, null=True, blank=True,
+    free_above = MoneyField(
+        max_digits=10, null=True, blank=True,
         help_text="Free shipping for orders above this amount"
     )
     
@@ -2,6 +2,7 @@
 Shipping Serializers
 """
 from rest_framework import serializers
+from apps.core.money import MoneySerializerField
 from .models import ShippingZone, ShippingMethod
 
 
@@ -22,7 +23,7 @@ class PincodeCheckSerializer(serializers.Serializer):
 
 
 class ShippingEstimateRequestSerializer(serializers.Serializer):
-    order_value = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    order_value = MoneySerializerField(max_digits=10, required=False)
     destination_state = serializers.CharField(max_length=100)
     weight_kg = serializers.DecimalField(max_digits=6, decimal_places=2, required=False, default=1.0)
     shipping_method = serializers.CharField(required=False, default='STANDARD')
@@ -2,9 +2,11 @@
 Shipping Calculation Service
 Calculates shipping costs based on zones, rates, and order details
 """
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, List, Optional
-from .models import ShippingZone, ShippingRate, ShippingMethod, PincodeServiceability
+from apps.core.money import Money
+from .models import ShippingZone, PincodeServiceability
+from .index import get_shipping_index
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,60 +18,35 @@ class ShippingService:
     """
     
     # Default shipping for areas without zone configuration
-    DEFAULT_SHIPPING_RATE = Decimal('99.00')
-    DEFAULT_FREE_ABOVE = Decimal('1999.00')
+    DEFAULT_SHIPPING_RATE = Money.of('99.00')
+    DEFAULT_FREE_ABOVE = Money.of('1999.00')
+
+    # Volumetric weight (kg) = L x B x H (cm) / divisor, the courier standard
+    VOLUMETRIC_DIVISOR = Decimal('5000')
+    MIN_ITEM_WEIGHT_KG = Decimal('0.50')
     
     @staticmethod
     def get_zone_for_state(state: str) -> Optional[ShippingZone]:
         """
-        Find shipping zone for a given state.
+        Find shipping zone for a given state (cached inverted index).
         """
-        state_lower = state.lower().strip()
-        
-        zones = ShippingZone.objects.filter(is_active=True).order_by('priority')
-        for zone in zones:
-            if state_lower in [s.lower() for s in zone.states]:
-                return zone
-        
-        return None
+        return get_shipping_index().zone_for_state(state)
     
     @staticmethod
     def get_zone_for_pincode(pincode: str) -> Optional[ShippingZone]:
         """
-        Find shipping zone for a specific pincode.
+        Find shipping zone for a specific pincode (cached inverted index).
         """
-        try:
-            service = PincodeServiceability.objects.get(
-                pincode=pincode.strip(),
-                is_serviceable=True
-            )
-            return service.zone
-        except PincodeServiceability.DoesNotExist:
-            return None
+        return get_shipping_index().zone_for_pincode(pincode)
     
     @staticmethod
     def check_serviceability(pincode: str) -> Dict:
         """
         Check if pincode is serviceable and get delivery options.
+        Served from the in-memory pincode table (binary search, no query).
         """
-        try:
-            service = PincodeServiceability.objects.get(pincode=pincode.strip())
-            
-            if not service.is_serviceable:
-                return {
-                    'serviceable': False,
-                    'message': 'Delivery not available to this pincode'
-                }
-            
-            return {
-                'serviceable': True,
-                'zone': service.zone.name,
-                'city': service.city,
-                'state': service.state,
-                'cod_available': service.cod_available,
-                'prepaid_only': service.prepaid_only
-            }
-        except PincodeServiceability.DoesNotExist:
+        service = get_shipping_index().pincodes.lookup(pincode)
+        if service is None:
             # If pincode not in database, assume serviceable (fallback)
             return {
                 'serviceable': True,
@@ -80,10 +57,73 @@ class ShippingService:
                 'prepaid_only': False,
                 'note': 'Pincode not in database, using default zone'
             }
+
+        if not service['serviceable']:
+            return {
+                'serviceable': False,
+                'message': 'Delivery not available to this pincode'
+            }
+
+        return {
+            'serviceable': True,
+            'zone': service['zone'].name if service['zone'] else 'Default',
+            'city': service['city'],
+            'state': service['state'],
+            'cod_available': service['cod_available'],
+            'prepaid_only': service['prepaid_only']
+        }
     
+    @staticmethod
+    def _resolve_zone(index, destination_state: str, pincode: str = None):
+        zone = index.zone_for_pincode(pincode) if pincode else None
+        return zone or index.zone_for_state(destination_state)
+
+    @staticmethod
+    def _price(zone, rate, order_value: Money, weight_kg: Decimal, method=None) -> Dict:
+        """Cost and delivery window for one method, given an already resolved zone and rate"""
+        if method is None:
+            method_multiplier = Decimal('1.00')
+            delivery_adjustment = 0
+        else:
+            method_multiplier = method.rate_multiplier
+            delivery_adjustment = method.delivery_days_adjustment
+
+        if zone and rate:
+            # Check for free shipping
+            if rate.free_above and order_value >= rate.free_above:
+                shipping_cost = Money.ZERO
+                is_free = True
+            else:
+                # Calculate base + weight
+                extra_weight = max(Decimal('0.00'), weight_kg - rate.base_weight_kg)
+                weight_charge = rate.per_kg_rate.scale(extra_weight)
+                shipping_cost = (rate.base_rate + weight_charge).scale(method_multiplier)
+                is_free = False
+            free_threshold = rate.free_above
+            min_days = max(1, rate.min_delivery_days + delivery_adjustment)
+            max_days = max(min_days, rate.max_delivery_days + delivery_adjustment)
+        else:
+            # No zone or no rate for it, use defaults
+            is_free = order_value >= ShippingService.DEFAULT_FREE_ABOVE
+            shipping_cost = Money.ZERO if is_free else ShippingService.DEFAULT_SHIPPING_RATE.scale(method_multiplier)
+            free_threshold = ShippingService.DEFAULT_FREE_ABOVE
+            min_days, max_days = (5, 10) if zone else (7, 14)
+
+        return {
+            'shipping_cost': shipping_cost,
+            'is_free_shipping': is_free,
+            'free_shipping_threshold': free_threshold,
+            'amount_for_free_shipping': max(Money.ZERO, free_threshold - order_value) if free_threshold else None,
+            'estimated_delivery': {
+                'min_days': min_days,
+                'max_days': max_days,
+                'display': f"{min_days}-{max_days} business days"
+            },
+        }
+
     @staticmethod
     def calculate_shipping(
-        order_value: Decimal,
+        order_value: Money,
         destination_state: str,
         weight_kg: Decimal = Decimal('1.00'),
         shipping_method_code: str = 'STANDARD',
@@ -100,97 +140,70 @@ class ShippingService:
             pincode: Optional pincode for precise zone lookup
             
         Returns:
-            Dict with shipping_cost, delivery_days, and breakdown
+            Dict with shipping_cost, delivery_days, and breakdown (amounts are Money)
         """
-        # Get zone
-        zone = None
-        if pincode:
-            zone = ShippingService.get_zone_for_pincode(pincode)
-        
-        if not zone:
-            zone = ShippingService.get_zone_for_state(destination_state)
-        
-        # Get shipping method
-        try:
-            method = ShippingMethod.objects.get(code=shipping_method_code, is_active=True)
-        except ShippingMethod.DoesNotExist:
-            method = None
-            method_multiplier = Decimal('1.00')
-            delivery_adjustment = 0
-        else:
-            method_multiplier = method.rate_multiplier
-            delivery_adjustment = method.delivery_days_adjustment
-        
-        # Calculate rate
-        if zone:
-            # Find applicable rate
-            rate = ShippingRate.objects.filter(
-                zone=zone,
-                is_active=True,
-                min_order_value__lte=order_value
-            ).filter(
-                models.Q(max_order_value__gte=order_value) |
-                models.Q(max_order_value__isnull=True)
-            ).first()
-            
-            if rate:
-                # Check for free shipping
-                if rate.free_above and order_value >= rate.free_above:
-                    shipping_cost = Decimal('0.00')
-                    is_free = True
-                    free_threshold = rate.free_above
-                else:
-                    # Calculate base + weight
-                    base = rate.base_rate
-                    extra_weight = max(Decimal('0.00'), weight_kg - rate.base_weight_kg)
-                    weight_charge = extra_weight * rate.per_kg_rate
-                    shipping_cost = (base + weight_charge) * method_multiplier
-                    is_free = False
-                    free_threshold = rate.free_above
-                
-                min_days = max(1, rate.min_delivery_days + delivery_adjustment)
-                max_days = max(min_days, rate.max_delivery_days + delivery_adjustment)
-                zone_name = zone.name
-            else:
-                # No rate found, use defaults
-                shipping_cost = ShippingService.DEFAULT_SHIPPING_RATE * method_multiplier
-                is_free = order_value >= ShippingService.DEFAULT_FREE_ABOVE
-                if is_free:
-                    shipping_cost = Decimal('0.00')
-                free_threshold = ShippingService.DEFAULT_FREE_ABOVE
-                min_days = 5
-                max_days = 10
-                zone_name = zone.name
-        else:
-            # No zone found, use defaults
-            if order_value >= ShippingService.DEFAULT_FREE_ABOVE:
-                shipping_cost = Decimal('0.00')
-                is_free = True
-            else:
-                shipping_cost = ShippingService.DEFAULT_SHIPPING_RATE * method_multiplier
-                is_free = False
-            
-            free_threshold = ShippingService.DEFAULT_FREE_ABOVE
-            min_days = 7
-            max_days = 14
-            zone_name = 'Default'
-        
-        # Round to 2 decimal places
-        shipping_cost = shipping_cost.quantize(Decimal('0.01'))
-        
-        return {
-            'shipping_cost': shipping_cost,
-            'is_free_shipping': is_free,
-            'free_shipping_threshold': free_threshold,
-            'amount_for_free_shipping': max(Decimal('0.00'), free_threshold - order_value) if free_threshold else None,
-            'zone': zone_name,
+        order_value = Money.of(order_value)
+        weight_kg = Decimal(str(weight_kg))
+        index = get_shipping_index()
+
+        zone = ShippingService._resolve_zone(index, destination_state, pincode)
+        rate = index.rate_for(zone, order_value) if zone else None
+        result = ShippingService._price(
+            zone, rate, order_value, weight_kg, index.method_by_code.get(shipping_method_code)
+        )
+        result.update({
+            'zone': zone.name if zone else 'Default',
             'shipping_method': shipping_method_code,
-            'estimated_delivery': {
-                'min_days': min_days,
-                'max_days': max_days,
-                'display': f"{min_days}-{max_days} business days"
-            },
-            'weight_kg': str(weight_kg)
+            'weight_kg': str(weight_kg),
+        })
+        return result
+
+    @staticmethod
+    def quote(order_value: Money, destination_state: str, weight_kg: Decimal = Decimal('1.00'),
+              pincode: str = None) -> Dict:
+        """
+        Shipping options for every active method in one call.
+
+        The zone and rate band are resolved once and priced per method; the
+        zone's other rate tiers are listed so the UI can show how far the
+        order is from a cheaper band.
+        """
+        order_value = Money.of(order_value)
+        weight_kg = Decimal(str(weight_kg))
+        index = get_shipping_index()
+
+        zone = ShippingService._resolve_zone(index, destination_state, pincode)
+        rate = index.rate_for(zone, order_value) if zone else None
+
+        methods = []
+        for method in index.methods or (None,):
+            option = ShippingService._price(zone, rate, order_value, weight_kg, method)
+            option.update({
+                'code': method.code if method else 'STANDARD',
+                'name': method.name if method else 'Standard',
+                'has_tracking': method.has_tracking if method else False,
+            })
+            methods.append(option)
+
+        tiers = [
+            {
+                'min_order_value': tier.min_order_value,
+                'max_order_value': tier.max_order_value,
+                'base_rate': tier.base_rate,
+                'free_above': tier.free_above,
+                'min_delivery_days': tier.min_delivery_days,
+                'max_delivery_days': tier.max_delivery_days,
+                'is_current': tier is rate,
+            }
+            for tier in (index.rates_by_zone.get(zone.pk, ()) if zone else ())
+        ]
+
+        return {
+            'zone': zone.name if zone else 'Default',
+            'order_value': order_value,
+            'weight_kg': str(weight_kg),
+            'methods': methods,
+            'tiers': tiers,
         }
     
     @staticmethod
@@ -198,7 +211,7 @@ class ShippingService:
         """
         Get all available shipping methods with estimated rates.
         """
-        methods = ShippingMethod.objects.filter(is_active=True).order_by('priority')
+        methods = get_shipping_index().methods
         
         return [
             {
@@ -211,29 +224,38 @@ class ShippingService:
             }
             for m in methods
         ]
+
+    @staticmethod
+    def item_weight(length, breadth, height) -> Decimal:
+        """
+        Chargeable weight (kg) of one unit from its dimensions in cm:
+        the courier volumetric weight L x B x H / divisor, never below the
+        minimum billable weight.
+        """
+        volume = Decimal(str(length)) * Decimal(str(breadth)) * Decimal(str(height))
+        weight = (volume / ShippingService.VOLUMETRIC_DIVISOR).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        return max(ShippingService.MIN_ITEM_WEIGHT_KG, weight)
+
+    @staticmethod
+    def cart_totals(cart):
+        """(order value, chargeable weight) of a cart"""
+        from apps.products.services import PricingService
+
+        total_value = Money.ZERO
+        total_weight = Decimal('0.00')
+        for item, unit_price in PricingService.price_items(cart.items.select_related('product')):
+            if unit_price is None:
+                unit_price = item.product.base_price
+            total_value += unit_price * item.quantity
+            total_weight += ShippingService.item_weight(item.length, item.breadth, item.height) * item.quantity
+        return total_value, total_weight
     
     @staticmethod
     def estimate_for_cart(cart, destination_state: str, pincode: str = None) -> Dict:
         """
         Estimate shipping for a cart.
         """
-        from apps.products.services import PricingService
-        
-        total_value = Decimal('0.00')
-        total_weight = Decimal('0.00')  # Would need weight on products
-        
-        for item in cart.items.all():
-            try:
-                price_info = PricingService.calculate_price(
-                    item.product, item.length, item.breadth, item.height
-                )
-                total_value += price_info['final_price'] * item.quantity
-            except Exception:
-                total_value += item.product.base_price * item.quantity
-            
-            # Estimate weight (would need actual weight field)
-            total_weight += Decimal('0.5') * item.quantity
-        
+        total_value, total_weight = ShippingService.cart_totals(cart)
         return ShippingService.calculate_shipping(
             order_value=total_value,
             destination_state=destination_state,
@@ -241,6 +263,125 @@ class ShippingService:
             pincode=pincode
         )
 
+    @staticmethod
+    def quote_for_cart(cart, destination_state: str, pincode: str = None) -> Dict:
+        """
+        Every shipping option for a cart (see quote()).
+        """
+        total_value, total_weight = ShippingService.cart_totals(cart)
+        return ShippingService.quote(
+            order_value=total_value,
+            destination_state=destination_state,
+            weight_kg=total_weight,
+            pincode=pincode
+        )
+
+class PincodeImportService:
+    """
+    Bulk load of pincode datasets into PincodeServiceability.
+
+    Expected CSV columns (header row, case-insensitive):
+        pincode, city, state[, zone][, cod_available][, prepaid_only][, is_serviceable]
+    `zone` is a ShippingZone name; when missing, the zone covering the row's
+    state is used. Boolean columns accept 1/0, true/false, yes/no, y/n.
+    """
+    TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+    FALSE_VALUES = {'0', 'false', 'no', 'n', 'f'}
+    DEFAULT_BATCH_SIZE = 2000
+
+    @classmethod
+    def _flag(cls, value, default: bool) -> bool:
+        value = (value or '').strip().lower()
+        if value in cls.TRUE_VALUES:
+            return True
+        if value in cls.FALSE_VALUES:
+            return False
+        return default
+
+    @classmethod
+    def parse_rows(cls, reader, zones_by_name: Dict, zone_for_state, default_zone=None):
+        """Yield (PincodeServiceability, None) or (None, error message) per CSV row"""
+        for line_number, row in enumerate(reader, start=2):
+            row = {(key or '').strip().lower(): (value or '').strip() for key, value in row.items()}
+            pincode = row.get('pincode', '').replace(' ', '')
+            if not (len(pincode) == 6 and pincode.isdigit() and pincode[0] != '0'):
+                yield None, f"line {line_number}: invalid pincode '{pincode}'"
+                continue
+
+            zone_name = row.get('zone')
+            if zone_name:
+                zone = zones_by_name.get(zone_name.lower())
+            else:
+                zone = zone_for_state(row.get('state', '')) or default_zone
+            if zone is None:
+                yield None, f"line {line_number}: no shipping zone for pincode {pincode}"
+                continue
+
+            yield PincodeServiceability(
+                pincode=pincode,
+                zone=zone,
+                city=row.get('city', '')[:100],
+                state=row.get('state', '')[:100],
+                cod_available=cls._flag(row.get('cod_available'), True),
+                prepaid_only=cls._flag(row.get('prepaid_only'), False),
+                is_serviceable=cls._flag(row.get('is_serviceable'), True),
+            ), None
 
-# Import models for Q object
-from django.db import models
+    @classmethod
+    def run(cls, file, default_zone_name: str = None, batch_size: int = None,
+            update_existing: bool = True, dry_run: bool = False) -> Dict:
+        """
+        Upsert pincodes from an open CSV text file in batches.
+        bulk_create bypasses post_save, so the shipping index version is
+        bumped once at the end instead of once per row.
+        """
+        import csv
+        from django.db import transaction
+        from .index import bump_version
+
+        batch_size = batch_size or cls.DEFAULT_BATCH_SIZE
+        zones_by_name = {zone.name.lower(): zone for zone in ShippingZone.objects.all()}
+        default_zone = None
+        if default_zone_name:
+            default_zone = zones_by_name.get(default_zone_name.lower())
+            if default_zone is None:
+                raise ValueError(f"Unknown shipping zone '{default_zone_name}'")
+
+        index = get_shipping_index()
+        result = {'imported': 0, 'skipped': 0, 'errors': [], 'dry_run': dry_run}
+        batch = {}
+
+        def flush():
+            if not dry_run and batch:
+                with transaction.atomic():
+                    if update_existing:
+                        PincodeServiceability.objects.bulk_create(
+                            batch.values(),
+                            update_conflicts=True,
+                            unique_fields=['pincode'],
+                            update_fields=['zone', 'city', 'state', 'cod_available', 'prepaid_only', 'is_serviceable'],
+                        )
+                    else:
+                        PincodeServiceability.objects.bulk_create(batch.values(), ignore_conflicts=True)
+            result['imported'] += len(batch)
+            batch.clear()
+
+        rows = cls.parse_rows(csv.DictReader(file), zones_by_name, index.zone_for_state, default_zone)
+        for service, error in rows:
+            if error:
+                result['skipped'] += 1
+                result['errors'].append(error)
+                continue
+            # Later rows for the same pincode win (and a batch must not hold duplicates)
+            batch[service.pincode] = service
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+
+        if not dry_run and result['imported']:
+            bump_version()
+        logger.info(
+            f"Pincode import {'(dry run) ' if dry_run else ''}"
+            f"{result['imported']} rows, {result['skipped']} skipped"
+        )
+        return result
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import ShippingZone, ShippingRate, ShippingMethod, PincodeServiceability
+from .index import bump_version
+
+@receiver([post_save, post_delete], sender=ShippingZone)
+@receiver([post_save, post_delete], sender=ShippingRate)
+@receiver([post_save, post_delete], sender=ShippingMethod)
+@receiver([post_save, post_delete], sender=PincodeServiceability)
+def invalidate_shipping_index(sender, instance, **kwargs):
+    # All workers rebuild their ShippingIndex on the next version check after commit
+    bump_version()
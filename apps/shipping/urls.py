@@ -4,7 +4,8 @@ Shipping URLs
 from django.urls import path
 from .views import (
     ShippingMethodListView, CheckPincodeView, 
-    EstimateShippingView, CartShippingEstimateView
+    EstimateShippingView, CartShippingEstimateView,
+    ShippingQuoteView, CartShippingQuoteView
 )
 
 urlpatterns = [
@@ -12,4 +13,6 @@ urlpatterns = [
     path('check-pincode/', CheckPincodeView.as_view(), name='check-pincode'),
     path('estimate/', EstimateShippingView.as_view(), name='shipping-estimate'),
     path('cart-estimate/', CartShippingEstimateView.as_view(), name='cart-shipping-estimate'),
+    path('quote/', ShippingQuoteView.as_view(), name='shipping-quote'),
+    path('cart-quote/', CartShippingQuoteView.as_view(), name='cart-shipping-quote'),
 ]
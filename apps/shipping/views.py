@@ -100,3 +100,59 @@ class CartShippingEstimateView(APIView):
         )
         
         return Response(estimate)
+
+
+class ShippingQuoteView(APIView):
+    """
+    Cost and delivery window for every active shipping method in one call
+    """
+    permission_classes = [AllowAny]
+    
+    def post(self, request):
+        serializer = ShippingEstimateRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        data = serializer.validated_data
+        if 'order_value' not in data:
+            return Response(
+                {"order_value": ["This field is required."]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        quote = ShippingService.quote(
+            order_value=data['order_value'],
+            destination_state=data['destination_state'],
+            weight_kg=data.get('weight_kg', 1),
+            pincode=data.get('pincode')
+        )
+        
+        return Response(quote)
+
+
+class CartShippingQuoteView(APIView):
+    """
+    Every shipping option for the authenticated user's cart, with weight
+    derived from the cart lines' dimensions
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        serializer = ShippingEstimateRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        data = serializer.validated_data
+        
+        cart = Cart.objects.filter(user=request.user).first()
+        if cart is None or not cart.items.exists():
+            return Response(
+                {"error": "Cart has no items"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        quote = ShippingService.quote_for_cart(
+            cart=cart,
+            destination_state=data['destination_state'],
+            pincode=data.get('pincode')
+        )
+        
+        return Response(quote)
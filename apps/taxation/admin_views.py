@@ -0,0 +1,32 @@
+"""
+Taxation Admin Views - GST return summaries
+"""
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.core.admin_views import IsAdminUser
+from .returns import GSTReturnService
+
+
+class GSTReturnView(APIView):
+    """
+    GSTR-1 style summary for a month.
+
+    GET /api/v1/taxation/admin/returns/<YYYY-MM>/<hsn|b2cs>/  -> JSON
+    Add ?output=csv to stream the same report as CSV.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, period, report):
+        try:
+            data = GSTReturnService.build_report(period, report)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.query_params.get('output') == 'csv':
+            response = StreamingHttpResponse(GSTReturnService.iter_csv(data), content_type='text/csv')
+            response['Content-Disposition'] = f'attachment; filename="gstr1_{report}_{period}.csv"'
+            return response
+
+        return Response(data)
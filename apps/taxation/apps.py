@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class TaxationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.taxation'
+
+    def ready(self):
+        import apps.taxation.signals
@@ -0,0 +1,190 @@
+"""
+Batch Tax Engine
+
+Vectorised GST computation over many lines at once, used for reports and
+bulk recomputation. Amounts are integer paise and rates integer basis points
+(9.00% -> 900), so every component is
+
+    round_half_up(amount_paise * rate_bp / 10000)
+
+which is exactly what `TaxCalculationService.calculate_item_tax` produces
+with Decimal quantize(0.01, ROUND_HALF_UP) for 2-decimal amounts and rates.
+NumPy is used when installed; otherwise a pure-Python loop gives the same
+results.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Sequence, Tuple
+
+from apps.core.money import Money
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+BP_DIVISOR = 10000
+COMPONENTS = ('cgst', 'sgst', 'igst', 'cess')
+
+
+def to_paise(amount) -> int:
+    """Money or Decimal/str/int rupees -> integer paise (half-up)"""
+    return Money.of(amount).paise
+
+
+def to_basis_points(rate) -> int:
+    """Decimal percentage -> integer basis points (9.00 -> 900)"""
+    return int((Decimal(str(rate)) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_paise(paise: int) -> Decimal:
+    return (Decimal(int(paise)) / 100).quantize(Decimal('0.01'))
+
+
+def rate_set_for(tax_category) -> Tuple[int, int, int, int]:
+    """(cgst, sgst, igst, cess) basis points for a TaxCategory"""
+    return (
+        to_basis_points(tax_category.cgst_rate),
+        to_basis_points(tax_category.sgst_rate),
+        to_basis_points(tax_category.igst_rate),
+        to_basis_points(tax_category.cess_rate),
+    )
+
+
+def apportion_discount(amounts: Sequence[int], discount: int) -> List[int]:
+    """
+    Spread an order-level discount (paise) over line amounts in proportion to
+    their value and return the discounted amounts. Shares are floored and the
+    leftover paise go to the largest remainders, so they add up exactly.
+    """
+    total = sum(amounts)
+    discount = max(0, min(int(discount), total))
+    if not discount:
+        return list(amounts)
+
+    shares = [amount * discount // total for amount in amounts]
+    leftover = discount - sum(shares)
+    by_remainder = sorted(range(len(amounts)), key=lambda i: (-(amounts[i] * discount % total), i))
+    for index in by_remainder[:leftover]:
+        shares[index] += 1
+    return [amount - share for amount, share in zip(amounts, shares)]
+
+
+def _round_half_up_python(numerator: int) -> int:
+    sign = -1 if numerator < 0 else 1
+    return sign * ((abs(numerator) + BP_DIVISOR // 2) // BP_DIVISOR)
+
+
+def _compute_python(amounts, rates, intra_flags) -> Dict[str, List[int]]:
+    result = {name: [] for name in COMPONENTS}
+    for amount, (cgst, sgst, igst, cess), intra in zip(amounts, rates, intra_flags):
+        if intra:
+            igst = 0
+        else:
+            cgst = sgst = 0
+        result['cgst'].append(_round_half_up_python(amount * cgst))
+        result['sgst'].append(_round_half_up_python(amount * sgst))
+        result['igst'].append(_round_half_up_python(amount * igst))
+        result['cess'].append(_round_half_up_python(amount * cess))
+    result['total_tax'] = [sum(parts) for parts in zip(*(result[c] for c in COMPONENTS))]
+    return result
+
+
+def _compute_numpy(amounts, rates, intra_flags) -> Dict[str, List[int]]:
+    amounts = np.asarray(amounts, dtype=np.int64)
+    rates = np.asarray(rates, dtype=np.int64).reshape(-1, 4)
+    intra = np.asarray(intra_flags, dtype=bool)
+
+    effective = {
+        'cgst': np.where(intra, rates[:, 0], 0),
+        'sgst': np.where(intra, rates[:, 1], 0),
+        'igst': np.where(intra, 0, rates[:, 2]),
+        'cess': rates[:, 3],
+    }
+    result = {}
+    for name, rate in effective.items():
+        numerator = amounts * rate
+        result[name] = np.sign(numerator) * ((np.abs(numerator) + BP_DIVISOR // 2) // BP_DIVISOR)
+    total = result['cgst'] + result['sgst'] + result['igst'] + result['cess']
+
+    output = {name: result[name].tolist() for name in COMPONENTS}
+    output['total_tax'] = total.tolist()
+    return output
+
+
+def compute_batch(
+    amounts_paise: Sequence[int],
+    rate_sets: Sequence[Tuple[int, int, int, int]],
+    intra_flags: Sequence[bool],
+    use_numpy: bool = None,
+) -> Dict[str, List[int]]:
+    """
+    Compute GST for many lines.
+
+    Args:
+        amounts_paise: taxable amount per line, integer paise
+        rate_sets: (cgst, sgst, igst, cess) basis points per line
+        intra_flags: True for intra-state (CGST+SGST), False for IGST
+
+    Returns:
+        {'cgst', 'sgst', 'igst', 'cess', 'total_tax'} -> list of paise per line
+    """
+    if not (len(amounts_paise) == len(rate_sets) == len(intra_flags)):
+        raise ValueError("amounts, rate sets and intra flags must have the same length")
+    if not amounts_paise:
+        return {name: [] for name in COMPONENTS + ('total_tax',)}
+
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise ImportError("NumPy is not installed")
+        return _compute_numpy(amounts_paise, rate_sets, intra_flags)
+    return _compute_python(amounts_paise, rate_sets, intra_flags)
+
+
+def summarize_order_items(items) -> Dict[str, Dict[str, Money]]:
+    """
+    Per-order tax totals for an iterable of order-item rows, in one batch.
+
+    Each row is a dict with 'order_id', 'unit_price', 'quantity',
+    'category_id' and 'destination_state' (e.g. from a .values() query).
+    Tax categories and business state come from the cached tax config.
+    """
+    from .config import get_tax_config
+
+    config = get_tax_config()
+    order_ids, amounts, rate_sets, intra_flags = [], [], [], []
+    rate_cache = {}
+    for row in items:
+        tax_category = config.tax_category_for(row['category_id'])
+        if tax_category.pk not in rate_cache:
+            rate_cache[tax_category.pk] = rate_set_for(tax_category)
+        order_ids.append(row['order_id'])
+        amounts.append(to_paise(row['unit_price']) * row['quantity'])
+        rate_sets.append(rate_cache[tax_category.pk])
+        state = row.get('destination_state')
+        if state is None:
+            state = config.business_state
+        intra_flags.append(state.lower().strip() == config.business_state_key)
+
+    lines = compute_batch(amounts, rate_sets, intra_flags)
+
+    totals = {}
+    for index, order_id in enumerate(order_ids):
+        entry = totals.setdefault(order_id, {'taxable': 0, 'cgst': 0, 'sgst': 0, 'igst': 0, 'cess': 0, 'total_tax': 0})
+        entry['taxable'] += amounts[index]
+        for name in COMPONENTS + ('total_tax',):
+            entry[name] += lines[name][index]
+
+    return {
+        order_id: {
+            'total_taxable_amount': Money(entry['taxable']),
+            'total_cgst': Money(entry['cgst']),
+            'total_sgst': Money(entry['sgst']),
+            'total_igst': Money(entry['igst']),
+            'total_cess': Money(entry['cess']),
+            'total_tax': Money(entry['total_tax']),
+            'grand_total': Money(entry['taxable'] + entry['total_tax']),
+        }
+        for order_id, entry in totals.items()
+    }
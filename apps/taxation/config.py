@@ -0,0 +1,107 @@
+"""
+Tax Configuration Snapshot
+
+Immutable, process-cached view of everything the tax engine needs from the
+database: business state, category -> TaxCategory map, default category and
+active exemptions. Workers share invalidation through a version key in the
+Django cache (bumped on commit by apps.taxation.signals, see
+apps.core.versioned_cache), so tax computation itself runs without config
+queries.
+"""
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+from django.utils import timezone
+from django.db.models import Q
+from apps.core.versioned_cache import VersionedProcessCache
+
+VERSION_KEY = "taxation_config_version"
+
+# Business state (source of supply) when BusinessTaxInfo is not configured
+DEFAULT_BUSINESS_STATE = "Telangana"
+
+
+@dataclass(frozen=True)
+class TaxConfigSnapshot:
+    version: int
+    built_on: date
+    business_state: str
+    category_tax: Mapping[int, object] = field(default_factory=lambda: MappingProxyType({}))
+    default_category: Optional[object] = None
+    exemptions: Tuple[object, ...] = ()
+
+    @property
+    def business_state_key(self) -> str:
+        return self.business_state.lower().strip()
+
+    def tax_category_for(self, category_id):
+        """TaxCategory for a product category id, falling back to the default"""
+        return self.category_tax.get(category_id, self.default_category)
+
+    def exemptions_for_state(self, state: str) -> tuple:
+        key = (state or '').lower().strip()
+        return tuple(
+            e for e in self.exemptions
+            if not e.applicable_states or key in [s.lower().strip() for s in e.applicable_states]
+        )
+
+
+def build_snapshot(version: int) -> TaxConfigSnapshot:
+    """Load the tax configuration from the database (a handful of queries)"""
+    from apps.products.models import Category
+    from .models import BusinessTaxInfo, TaxCategory, TaxExemption
+
+    business = BusinessTaxInfo.objects.only('state_name').first()
+
+    active_categories = {tc.pk: tc for tc in TaxCategory.objects.filter(is_active=True)}
+    category_tax = {
+        category_id: active_categories[tax_category_id]
+        for category_id, tax_category_id in Category.objects.filter(
+            tax_category__isnull=False
+        ).values_list('id', 'tax_category_id')
+        if tax_category_id in active_categories
+    }
+
+    default_category, _ = TaxCategory.objects.get_or_create(
+        name="Default (18%)",
+        defaults={
+            'hsn_code': '9999',
+            'cgst_rate': Decimal('9.00'),
+            'sgst_rate': Decimal('9.00'),
+            'igst_rate': Decimal('18.00'),
+        }
+    )
+
+    today = timezone.localdate()
+    exemptions = tuple(TaxExemption.objects.filter(
+        Q(valid_until__isnull=True) | Q(valid_until__gte=today),
+        is_active=True, valid_from__lte=today,
+    ))
+
+    return TaxConfigSnapshot(
+        version=version,
+        built_on=today,
+        business_state=business.state_name if business else DEFAULT_BUSINESS_STATE,
+        category_tax=MappingProxyType(category_tax),
+        default_category=default_category,
+        exemptions=exemptions,
+    )
+
+
+_cache = VersionedProcessCache(
+    VERSION_KEY, build_snapshot, "Tax config snapshot",
+    # Exemptions are filtered by date, so a new day also rebuilds
+    is_current=lambda snapshot: snapshot.built_on == timezone.localdate(),
+)
+
+
+def get_tax_config() -> TaxConfigSnapshot:
+    """Current snapshot; rebuilt when the shared version moves or the day changes"""
+    return _cache.get()
+
+
+def bump_version():
+    """Invalidate snapshots in every worker once the current transaction commits"""
+    _cache.invalidate()
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.10 on 2026-10-19 14:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0011_order_tax_totals'),
+        ('taxation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderItemTax',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_date', models.DateTimeField(db_index=True, help_text='Order.created_at (tax point)')),
+                ('hsn_code', models.CharField(max_length=10)),
+                ('tax_category_name', models.CharField(max_length=100)),
+                ('place_of_supply', models.CharField(help_text='Destination state', max_length=50)),
+                ('is_intra_state', models.BooleanField()),
+                ('taxable_amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('cgst_rate', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('cgst_amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('sgst_rate', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('sgst_amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('igst_rate', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('igst_amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('cess_rate', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('cess_amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('total_tax', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('order', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='item_taxes', to='orders.order')),
+                ('order_item', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='tax', to='orders.orderitem')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['order_date', 'hsn_code'], name='itemtax_date_hsn_idx')],
+            },
+        ),
+    ]
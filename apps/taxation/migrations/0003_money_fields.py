@@ -0,0 +1,44 @@
+# Generated by Django 5.2.10 on 2026-10-19 15:00
+
+import apps.core.money
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taxation', '0002_orderitemtax'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='orderitemtax',
+            name='taxable_amount',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=12),
+        ),
+        migrations.AlterField(
+            model_name='orderitemtax',
+            name='cgst_amount',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=12),
+        ),
+        migrations.AlterField(
+            model_name='orderitemtax',
+            name='sgst_amount',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=12),
+        ),
+        migrations.AlterField(
+            model_name='orderitemtax',
+            name='igst_amount',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=12),
+        ),
+        migrations.AlterField(
+            model_name='orderitemtax',
+            name='cess_amount',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=12),
+        ),
+        migrations.AlterField(
+            model_name='orderitemtax',
+            name='total_tax',
+            field=apps.core.money.MoneyField(decimal_places=2, max_digits=12),
+        ),
+    ]
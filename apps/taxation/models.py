@@ -5,6 +5,7 @@ Supports CGST+SGST (intra-state) and IGST (inter-state) calculations
 from django.db import models
 from decimal import Decimal
 import uuid
+from apps.core.money import MoneyField
 
 
 class TaxCategory(models.Model):
@@ -120,3 +121,48 @@ class BusinessTaxInfo(models.Model):
     
     def __str__(self):
         return f"{self.trade_name} - {self.gstin}"
+
+
+class OrderItemTax(models.Model):
+    """
+    Per-line GST captured at checkout.
+
+    Rows are the tax ledger: rates and amounts are frozen at the time of sale,
+    so invoices, order tax views and GST reports never recompute. The order
+    links are not DB-enforced so rows outlive order archival.
+    """
+    order = models.ForeignKey(
+        'orders.Order', related_name='item_taxes',
+        on_delete=models.DO_NOTHING, db_constraint=False
+    )
+    order_item = models.OneToOneField(
+        'orders.OrderItem', related_name='tax',
+        on_delete=models.DO_NOTHING, db_constraint=False
+    )
+    order_date = models.DateTimeField(db_index=True, help_text="Order.created_at (tax point)")
+
+    hsn_code = models.CharField(max_length=10)
+    tax_category_name = models.CharField(max_length=100)
+    place_of_supply = models.CharField(max_length=50, help_text="Destination state")
+    is_intra_state = models.BooleanField()
+
+    taxable_amount = MoneyField(max_digits=12)
+    cgst_rate = models.DecimalField(max_digits=5, decimal_places=2)
+    cgst_amount = MoneyField(max_digits=12)
+    sgst_rate = models.DecimalField(max_digits=5, decimal_places=2)
+    sgst_amount = MoneyField(max_digits=12)
+    igst_rate = models.DecimalField(max_digits=5, decimal_places=2)
+    igst_amount = MoneyField(max_digits=12)
+    cess_rate = models.DecimalField(max_digits=5, decimal_places=2)
+    cess_amount = MoneyField(max_digits=12)
+    total_tax = MoneyField(max_digits=12)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['order_date', 'hsn_code'], name='itemtax_date_hsn_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.hsn_code} {self.taxable_amount} + {self.total_tax}"
@@ -0,0 +1,247 @@
+"""
+GST Return Aggregation
+
+GSTR-1 style summaries built from the tax captured at checkout
+(`OrderItemTax`):
+- 'hsn':  HSN-wise summary (HSN code x rate)
+- 'b2cs': B2C supplies by place of supply x rate
+
+Lines are aggregated in SQL once, at the finest grain both reports need
+(HSN x place of supply x rate), and each report is rolled up from that.
+
+Caching:
+- Closed periods (months before the current one) are computed once and
+  cached without expiry. Later changes belong in a later return as
+  amendments, so a closed summary never changes.
+- The open period is kept as per-day buckets. Past days are cached and only
+  recomputed when an order created that day enters or leaves a supply status
+  (see `invalidate_gst_returns` in apps.orders.events); today is read live.
+"""
+from calendar import monthrange
+from datetime import date, datetime, time, timedelta
+import csv
+import logging
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.core.money import Money
+from .models import BusinessTaxInfo, OrderItemTax, TaxCategory
+
+logger = logging.getLogger(__name__)
+
+# Order statuses that make an order a taxable supply
+SUPPLY_STATUSES = ('PAID', 'SHIPPED', 'DELIVERED')
+
+GROUP_FIELDS = ('hsn_code', 'place_of_supply', 'rate')
+
+# Aggregate name -> OrderItemTax field
+AMOUNTS = {
+    'taxable': 'taxable_amount',
+    'cgst': 'cgst_amount',
+    'sgst': 'sgst_amount',
+    'igst': 'igst_amount',
+    'cess': 'cess_amount',
+}
+
+REPORTS = {
+    'hsn': ('hsn_code', 'rate'),
+    'b2cs': ('place_of_supply', 'rate'),
+}
+
+CSV_COLUMNS = {
+    'hsn': [
+        ('hsn_code', 'HSN'), ('description', 'Description'), ('rate', 'Rate'),
+        ('line_count', 'Lines'), ('taxable', 'Taxable Value'), ('igst', 'IGST'),
+        ('cgst', 'CGST'), ('sgst', 'SGST'), ('cess', 'Cess'), ('total_value', 'Total Value'),
+    ],
+    'b2cs': [
+        ('place_of_supply', 'Place Of Supply'), ('rate', 'Rate'), ('line_count', 'Lines'),
+        ('taxable', 'Taxable Value'), ('igst', 'IGST'), ('cgst', 'CGST'),
+        ('sgst', 'SGST'), ('cess', 'Cess'), ('total_value', 'Total Value'),
+    ],
+}
+
+
+class _Echo:
+    """File-like object for csv.writer that hands each row back for streaming."""
+
+    def write(self, value):
+        return value
+
+
+class GSTReturnService:
+    CACHE_PREFIX = "ecom:gst_return"
+    # Day buckets are only needed while their month is open
+    DAY_BUCKET_TTL = 60 * 60 * 24 * 40
+
+    @staticmethod
+    def parse_period(period: str):
+        """'YYYY-MM' -> (first day, first day of the next month)"""
+        try:
+            year, month = (int(part) for part in period.split('-'))
+            start = date(year, month, 1)
+        except (ValueError, AttributeError):
+            raise ValueError("period must be in YYYY-MM format")
+        return start, start + timedelta(days=monthrange(year, month)[1])
+
+    @classmethod
+    def is_closed(cls, period: str) -> bool:
+        _, end = cls.parse_period(period)
+        return end <= timezone.localdate()
+
+    @staticmethod
+    def supply_lines(start: date, end: date):
+        """Tax lines dated [start, end) whose order is a supply, in either order tier."""
+        from apps.orders.models import Order, ArchivedOrder
+
+        tz = timezone.get_current_timezone()
+        return OrderItemTax.objects.filter(
+            order_date__gte=timezone.make_aware(datetime.combine(start, time.min), tz),
+            order_date__lt=timezone.make_aware(datetime.combine(end, time.min), tz),
+        ).filter(
+            Q(order_id__in=Order.objects.filter(status__in=SUPPLY_STATUSES).values('id'))
+            | Q(order_id__in=ArchivedOrder.objects.filter(status__in=SUPPLY_STATUSES).values('id'))
+        )
+
+    @staticmethod
+    def _aggregate(queryset, extra_group=()) -> list:
+        """GROUP BY (extra_group + HSN, place of supply, rate) in SQL"""
+        return list(
+            queryset.annotate(rate=F('cgst_rate') + F('sgst_rate') + F('igst_rate'))
+            .values(*extra_group, *GROUP_FIELDS)
+            .annotate(
+                line_count=Count('id'),
+                **{name: Sum(field) for name, field in AMOUNTS.items()}
+            )
+            .order_by()
+        )
+
+    @staticmethod
+    def _rollup(lines, group_fields) -> list:
+        """Sum aggregated lines up to `group_fields`, sorted by them"""
+        totals = {}
+        for line in lines:
+            key = tuple(line[field] for field in group_fields)
+            entry = totals.get(key)
+            if entry is None:
+                entry = totals[key] = {field: line[field] for field in group_fields}
+                entry['line_count'] = 0
+                entry.update({name: Money.ZERO for name in AMOUNTS})
+            entry['line_count'] += line['line_count']
+            for name in AMOUNTS:
+                entry[name] += line[name] or Money.ZERO
+        return [totals[key] for key in sorted(totals)]
+
+    # ------------------------------------------------------------------
+    # Period lines (cached)
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _day_version_key(cls, day: date) -> str:
+        return f"{cls.CACHE_PREFIX}:day_version:{day.isoformat()}"
+
+    @classmethod
+    def invalidate_day(cls, day: date):
+        """Drop the cached bucket for one day of the open period"""
+        key = cls._day_version_key(day)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=cls.DAY_BUCKET_TTL)
+
+    @classmethod
+    def _closed_period_lines(cls, period: str) -> list:
+        key = f"{cls.CACHE_PREFIX}:period:{period}"
+        lines = cache.get(key)
+        if lines is None:
+            start, end = cls.parse_period(period)
+            lines = cls._aggregate(cls.supply_lines(start, end))
+            cache.set(key, lines, timeout=None)
+            logger.info(f"GST return period {period} aggregated and cached ({len(lines)} groups)")
+        return lines
+
+    @classmethod
+    def _open_period_lines(cls, period: str) -> list:
+        start, _ = cls.parse_period(period)
+        today = timezone.localdate()
+        if start > today:
+            return []
+
+        past_days = [start + timedelta(days=n) for n in range((today - start).days)]
+        versions = cache.get_many([cls._day_version_key(day) for day in past_days])
+        keys = {
+            day: f"{cls.CACHE_PREFIX}:day:{day.isoformat()}:v{versions.get(cls._day_version_key(day), 0)}"
+            for day in past_days
+        }
+        cached = cache.get_many(list(keys.values()))
+        buckets = {day: cached[key] for day, key in keys.items() if key in cached}
+        missing = [day for day in past_days if day not in buckets]
+
+        # One query covers every uncached day plus today
+        fresh = {}
+        queryset = cls.supply_lines(missing[0] if missing else today, today + timedelta(days=1))
+        for row in cls._aggregate(queryset.annotate(day=TruncDate('order_date')), extra_group=('day',)):
+            fresh.setdefault(row.pop('day'), []).append(row)
+
+        if missing:
+            cache.set_many({keys[day]: fresh.get(day, []) for day in missing}, timeout=cls.DAY_BUCKET_TTL)
+        for day in missing + [today]:
+            buckets[day] = fresh.get(day, [])
+
+        return [line for day in sorted(buckets) for line in buckets[day]]
+
+    @classmethod
+    def get_lines(cls, period: str) -> list:
+        """Finest-grain aggregates (HSN x place of supply x rate) for a period"""
+        if cls.is_closed(period):
+            return cls._closed_period_lines(period)
+        return cls._open_period_lines(period)
+
+    # ------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build_report(cls, period: str, kind: str) -> dict:
+        if kind not in REPORTS:
+            raise ValueError(f"report must be one of: {', '.join(REPORTS)}")
+
+        rows = cls._rollup(cls.get_lines(period), REPORTS[kind])
+        if kind == 'hsn':
+            descriptions = dict(
+                TaxCategory.objects.filter(hsn_code__in={row['hsn_code'] for row in rows})
+                .values_list('hsn_code', 'name')
+            )
+            for row in rows:
+                row['description'] = descriptions.get(row['hsn_code'], '')
+        for row in rows:
+            row['total_value'] = sum(row[name] for name in AMOUNTS)
+
+        summary = {'line_count': sum(row['line_count'] for row in rows)}
+        for name in list(AMOUNTS) + ['total_value']:
+            summary[name] = sum((row[name] for row in rows), Money.ZERO)
+
+        business = BusinessTaxInfo.objects.first()
+        return {
+            'period': period,
+            'report': kind,
+            'is_closed': cls.is_closed(period),
+            'gstin': business.gstin if business else None,
+            'legal_name': business.legal_name if business else None,
+            'rows': rows,
+            'totals': summary,
+        }
+
+    @staticmethod
+    def iter_csv(report: dict):
+        """Yield the report as CSV lines (for StreamingHttpResponse)"""
+        writer = csv.writer(_Echo())
+        columns = CSV_COLUMNS[report['report']]
+        yield writer.writerow([label for _, label in columns])
+        for row in report['rows']:
+            yield writer.writerow([row.get(field, '') for field, _ in columns])
+        totals = report['totals']
+        yield writer.writerow(['Total'] + [totals.get(field, '') for field, _ in columns[1:]])
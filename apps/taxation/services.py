@@ -2,10 +2,13 @@
 Tax Calculation Service
 Handles GST calculation for orders with intra/inter-state logic
 """
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from typing import Dict, List
 from django.conf import settings
-from .models import TaxCategory, BusinessTaxInfo
+from django.db import models
+from apps.core.money import Money
+from .models import TaxCategory
+from .config import get_tax_config, DEFAULT_BUSINESS_STATE
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,7 +18,7 @@ logger = logging.getLogger(__name__)
 DEFAULT_GST_RATE = Decimal('18.00')
 
 # Business state (source of supply)
-BUSINESS_STATE = "Telangana"
+BUSINESS_STATE = DEFAULT_BUSINESS_STATE
 
 
 class TaxCalculationService:
@@ -29,10 +32,9 @@ class TaxCalculationService:
     
     @staticmethod
     def get_business_state() -> str:
-        """Get the registered business state"""
+        """Get the registered business state (from the cached tax config snapshot)"""
         try:
-            business = BusinessTaxInfo.objects.first()
-            return business.state_name if business else BUSINESS_STATE
+            return get_tax_config().business_state
         except Exception:
             return BUSINESS_STATE
     
@@ -47,27 +49,13 @@ class TaxCalculationService:
         """
         Get tax category for a product.
         Falls back to default rates if not configured.
+        Resolved from the cached snapshot by category id, so no query is made.
         """
-        # Check if product's category has a linked tax category
-        if hasattr(product, 'category') and product.category:
-            if hasattr(product.category, 'tax_category') and product.category.tax_category:
-                return product.category.tax_category
-        
-        # Fallback: Get or create a default category
-        default_category, _ = TaxCategory.objects.get_or_create(
-            name="Default (18%)",
-            defaults={
-                'hsn_code': '9999',
-                'cgst_rate': Decimal('9.00'),
-                'sgst_rate': Decimal('9.00'),
-                'igst_rate': Decimal('18.00'),
-            }
-        )
-        return default_category
+        return get_tax_config().tax_category_for(getattr(product, 'category_id', None))
     
     @staticmethod
     def calculate_item_tax(
-        item_amount: Decimal,
+        item_amount: Money,
         tax_category: TaxCategory,
         destination_state: str
     ) -> Dict:
@@ -75,29 +63,22 @@ class TaxCalculationService:
         Calculate tax for a single item.
         
         Args:
-            item_amount: Taxable amount (price * quantity)
+            item_amount: Taxable amount (price * quantity), Money or rupee Decimal
             tax_category: TaxCategory instance
             destination_state: Delivery state
             
         Returns:
-            Dict with cgst, sgst, igst, cess, total_tax, and net_amount
+            Dict with cgst, sgst, igst, cess, total_tax, and net_amount (Money)
         """
+        item_amount = Money.of(item_amount)
         is_intra = TaxCalculationService.is_intra_state(destination_state)
         rates = tax_category.get_effective_rate(is_intra)
         
-        # Calculate individual tax components
-        cgst_amount = (item_amount * rates['cgst'] / 100).quantize(
-            Decimal('0.01'), rounding=ROUND_HALF_UP
-        )
-        sgst_amount = (item_amount * rates['sgst'] / 100).quantize(
-            Decimal('0.01'), rounding=ROUND_HALF_UP
-        )
-        igst_amount = (item_amount * rates['igst'] / 100).quantize(
-            Decimal('0.01'), rounding=ROUND_HALF_UP
-        )
-        cess_amount = (item_amount * rates['cess'] / 100).quantize(
-            Decimal('0.01'), rounding=ROUND_HALF_UP
-        )
+        # Calculate individual tax components (integer paise, half-up)
+        cgst_amount = item_amount.percent(rates['cgst'])
+        sgst_amount = item_amount.percent(rates['sgst'])
+        igst_amount = item_amount.percent(rates['igst'])
+        cess_amount = item_amount.percent(rates['cess'])
         
         total_tax = cgst_amount + sgst_amount + igst_amount + cess_amount
         
@@ -137,12 +118,12 @@ class TaxCalculationService:
                 destination_state = BUSINESS_STATE
         
         item_taxes = []
-        total_cgst = Decimal('0.00')
-        total_sgst = Decimal('0.00')
-        total_igst = Decimal('0.00')
-        total_cess = Decimal('0.00')
-        total_taxable = Decimal('0.00')
-        total_tax = Decimal('0.00')
+        total_cgst = Money.ZERO
+        total_sgst = Money.ZERO
+        total_igst = Money.ZERO
+        total_cess = Money.ZERO
+        total_taxable = Money.ZERO
+        total_tax = Money.ZERO
         
         # Calculate tax for each item
         for item in order.items.all():
@@ -188,6 +169,119 @@ class TaxCalculationService:
             }
         }
     
+    @staticmethod
+    def capture_order_tax(order, order_items, discount=None) -> List:
+        """
+        Freeze the GST breakdown of a new order (called inside checkout).
+
+        Computes every line in one batch, bulk-inserts OrderItemTax rows and
+        sets the order-level totals on `order` (the caller saves it).
+        `order_items` are the just-created OrderItem instances. An order-level
+        `discount` (promo code) reduces the taxable value: it is apportioned
+        across the lines by value before tax is computed.
+        """
+        from .batch import apportion_discount, compute_batch, rate_set_for
+        from .models import OrderItemTax
+
+        config = get_tax_config()
+        destination_state = (order.shipping_address or {}).get('state') or config.business_state
+        is_intra = TaxCalculationService.is_intra_state(destination_state)
+
+        categories = [config.tax_category_for(item.product.category_id) for item in order_items]
+        amounts = apportion_discount(
+            [(item.unit_price * item.quantity).paise for item in order_items],
+            Money.of(discount).paise if discount else 0,
+        )
+        lines = compute_batch(
+            amounts,
+            [rate_set_for(category) for category in categories],
+            [is_intra] * len(order_items),
+        )
+
+        rows = []
+        for index, (item, category) in enumerate(zip(order_items, categories)):
+            rates = category.get_effective_rate(is_intra)
+            rows.append(OrderItemTax(
+                order=order,
+                order_item=item,
+                order_date=order.created_at,
+                hsn_code=category.hsn_code,
+                tax_category_name=category.name,
+                place_of_supply=destination_state,
+                is_intra_state=is_intra,
+                taxable_amount=Money(amounts[index]),
+                cgst_rate=rates['cgst'],
+                cgst_amount=Money(lines['cgst'][index]),
+                sgst_rate=rates['sgst'],
+                sgst_amount=Money(lines['sgst'][index]),
+                igst_rate=rates['igst'],
+                igst_amount=Money(lines['igst'][index]),
+                cess_rate=rates['cess'],
+                cess_amount=Money(lines['cess'][index]),
+                total_tax=Money(lines['total_tax'][index]),
+            ))
+        OrderItemTax.objects.bulk_create(rows)
+
+        order.taxable_amount = Money(sum(amounts))
+        order.cgst_amount = Money(sum(lines['cgst']))
+        order.sgst_amount = Money(sum(lines['sgst']))
+        order.igst_amount = Money(sum(lines['igst']))
+        order.cess_amount = Money(sum(lines['cess']))
+        order.tax_amount = Money(sum(lines['total_tax']))
+        return rows
+
+    @staticmethod
+    def get_order_tax(order) -> Dict:
+        """
+        Tax breakdown for an order, read from the rows captured at checkout.
+        Orders placed before tax capture fall back to `calculate_order_tax`.
+        Same shape as `calculate_order_tax`.
+        """
+        if not order.has_stored_tax:
+            return TaxCalculationService.calculate_order_tax(order)
+
+        item_taxes = []
+        destination_state = (order.shipping_address or {}).get('state') or BUSINESS_STATE
+        is_intra = TaxCalculationService.is_intra_state(destination_state)
+        rows = order.item_taxes.select_related('order_item__product').order_by('order_item_id')
+        for row in rows:
+            item = row.order_item
+            destination_state, is_intra = row.place_of_supply, row.is_intra_state
+            item_taxes.append({
+                'taxable_amount': row.taxable_amount,
+                'cgst_rate': row.cgst_rate,
+                'cgst_amount': row.cgst_amount,
+                'sgst_rate': row.sgst_rate,
+                'sgst_amount': row.sgst_amount,
+                'igst_rate': row.igst_rate,
+                'igst_amount': row.igst_amount,
+                'cess_rate': row.cess_rate,
+                'cess_amount': row.cess_amount,
+                'total_tax': row.total_tax,
+                'net_amount': row.taxable_amount + row.total_tax,
+                'hsn_code': row.hsn_code,
+                'is_intra_state': row.is_intra_state,
+                'item_id': str(item.id),
+                'product_name': item.product.name if item.product else 'Unknown',
+                'quantity': item.quantity,
+            })
+
+        return {
+            'order_id': str(order.id),
+            'destination_state': destination_state,
+            'is_intra_state': is_intra,
+            'items': item_taxes,
+            'summary': {
+                'total_taxable_amount': order.taxable_amount,
+                'total_cgst': order.cgst_amount,
+                'total_sgst': order.sgst_amount,
+                'total_igst': order.igst_amount,
+                'total_cess': order.cess_amount,
+                'total_tax': order.tax_amount,
+                'grand_total': order.taxable_amount + order.tax_amount
+            }
+        }
+
     @staticmethod
     def calculate_cart_tax(cart, destination_state: str) -> Dict:
         """
@@ -197,12 +291,12 @@ class TaxCalculationService:
         from apps.products.services import PricingService
         
         item_taxes = []
-        total_cgst = Decimal('0.00')
-        total_sgst = Decimal('0.00')
-        total_igst = Decimal('0.00')
-        total_cess = Decimal('0.00')
-        total_taxable = Decimal('0.00')
-        total_tax = Decimal('0.00')
+        total_cgst = Money.ZERO
+        total_sgst = Money.ZERO
+        total_igst = Money.ZERO
+        total_cess = Money.ZERO
+        total_taxable = Money.ZERO
+        total_tax = Money.ZERO
         
         for item in cart.items.all():
             # Calculate item price using dimension pricing
@@ -247,3 +341,54 @@ class TaxCalculationService:
                 'grand_total': total_taxable + total_tax
             }
         }
+
+    @staticmethod
+    def calculate_orders_tax_batch(orders) -> Dict:
+        """
+        Order-level tax summaries for many orders at once (reports).
+        Orders with tax captured at checkout use the stored totals; older
+        orders are recomputed in one query with integer/vectorised tax maths
+        (totals match `calculate_order_tax` exactly).
+
+        Returns:
+            {order_id: summary dict}
+        """
+        from apps.orders.models import Order, OrderItem
+        from .batch import summarize_order_items
+
+        if not isinstance(orders, models.QuerySet):
+            orders = Order.objects.filter(pk__in=[order.pk for order in orders])
+
+        summaries = {}
+        stored = orders.filter(tax_amount__isnull=False).values(
+            'id', 'taxable_amount', 'cgst_amount', 'sgst_amount',
+            'igst_amount', 'cess_amount', 'tax_amount'
+        )
+        for row in stored.iterator(chunk_size=2000):
+            summaries[str(row['id'])] = {
+                'total_taxable_amount': row['taxable_amount'],
+                'total_cgst': row['cgst_amount'],
+                'total_sgst': row['sgst_amount'],
+                'total_igst': row['igst_amount'],
+                'total_cess': row['cess_amount'],
+                'total_tax': row['tax_amount'],
+                'grand_total': row['taxable_amount'] + row['tax_amount'],
+            }
+
+        rows = (
+            OrderItem.objects.filter(order__in=orders.filter(tax_amount__isnull=True))
+            .values('order_id', 'unit_price', 'quantity', 'order__shipping_address')
+            .annotate(category_id=models.F('product__category_id'))
+        )
+        items = (
+            {
+                'order_id': str(row['order_id']),
+                'unit_price': row['unit_price'],
+                'quantity': row['quantity'],
+                'category_id': row['category_id'],
+                'destination_state': (row['order__shipping_address'] or {}).get('state'),
+            }
+            for row in rows.iterator(chunk_size=2000)
+        )
+        summaries.update(summarize_order_items(items))
+        return summaries
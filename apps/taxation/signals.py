@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.products.models import Category
+from .models import TaxCategory, TaxExemption, BusinessTaxInfo
+from .config import bump_version
+
+@receiver([post_save, post_delete], sender=TaxCategory)
+@receiver([post_save, post_delete], sender=TaxExemption)
+@receiver([post_save, post_delete], sender=BusinessTaxInfo)
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_tax_config(sender, instance, **kwargs):
+    # All workers rebuild their TaxConfigSnapshot on the next version check after commit
+    bump_version()
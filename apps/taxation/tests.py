@@ -1,3 +1,93 @@
-from django.test import TestCase
+from decimal import Decimal
+from random import Random
+from unittest import mock, skipIf
+
+from django.test import SimpleTestCase
+
+from apps.core.money import Money
+
+from .batch import apportion_discount, compute_batch, np, rate_set_for, to_paise
+from .models import TaxCategory
+from .services import TaxCalculationService
+
+
+class BatchTaxEngineDifferentialTest(SimpleTestCase):
+    """The batch engine must agree with calculate_item_tax to the paisa."""
+
+    CATEGORIES = [
+        TaxCategory(name='GST 18', hsn_code='9403', cgst_rate=Decimal('9.00'), sgst_rate=Decimal('9.00'),
+                    igst_rate=Decimal('18.00'), cess_rate=Decimal('0.00')),
+        TaxCategory(name='GST 12', hsn_code='4421', cgst_rate=Decimal('6.00'), sgst_rate=Decimal('6.00'),
+                    igst_rate=Decimal('12.00'), cess_rate=Decimal('0.00')),
+        TaxCategory(name='GST 28 + cess', hsn_code='9401', cgst_rate=Decimal('14.00'), sgst_rate=Decimal('14.00'),
+                    igst_rate=Decimal('28.00'), cess_rate=Decimal('1.25')),
+        TaxCategory(name='GST 2.5', hsn_code='4802', cgst_rate=Decimal('1.25'), sgst_rate=Decimal('1.25'),
+                    igst_rate=Decimal('2.50'), cess_rate=Decimal('0.33')),
+    ]
+
+    def _random_lines(self, count=2000, seed=34):
+        rng = Random(seed)
+        lines = []
+        for _ in range(count):
+            unit_price = Decimal(rng.randint(1, 5_000_000)) / 100
+            quantity = rng.randint(1, 25)
+            lines.append((unit_price * quantity, rng.choice(self.CATEGORIES), rng.random() < 0.5))
+        # Exact half-paisa boundaries
+        lines.append((Decimal('0.50'), self.CATEGORIES[0], True))     # 0.045 -> 0.05
+        lines.append((Decimal('1.50'), self.CATEGORIES[3], False))    # 0.0375 -> 0.04
+        lines.append((Decimal('0.00'), self.CATEGORIES[2], True))
+        return lines
+
+    def _per_item(self, amount, category, intra):
+        with mock.patch.object(TaxCalculationService, 'is_intra_state', return_value=intra):
+            return TaxCalculationService.calculate_item_tax(amount, category, 'Somewhere')
+
+    def _assert_agree(self, use_numpy):
+        lines = self._random_lines()
+        batch = compute_batch(
+            [to_paise(amount) for amount, _, _ in lines],
+            [rate_set_for(category) for _, category, _ in lines],
+            [intra for _, _, intra in lines],
+            use_numpy=use_numpy,
+        )
+        for index, (amount, category, intra) in enumerate(lines):
+            expected = self._per_item(amount, category, intra)
+            for component in ('cgst', 'sgst', 'igst', 'cess'):
+                self.assertEqual(Money(batch[component][index]), expected[f'{component}_amount'],
+                                 f"{component} mismatch for {amount} @ {category.name} intra={intra}")
+            self.assertEqual(Money(batch['total_tax'][index]), expected['total_tax'])
+
+    def test_pure_python_path_matches_per_item(self):
+        self._assert_agree(use_numpy=False)
+
+    @skipIf(np is None, "NumPy not installed")
+    def test_numpy_path_matches_per_item(self):
+        self._assert_agree(use_numpy=True)
+
+    def test_length_mismatch_rejected(self):
+        with self.assertRaises(ValueError):
+            compute_batch([100], [], [True])
+
+
+class ApportionDiscountTest(SimpleTestCase):
+    """A promo discount lowers the taxable value of every line, in proportion and to the paisa."""
+
+    def test_shares_add_up_exactly(self):
+        amounts = [33333, 33333, 33334]
+        discounted = apportion_discount(amounts, 10001)
+        self.assertEqual(sum(amounts) - sum(discounted), 10001)
+        self.assertTrue(all(0 <= d <= a for a, d in zip(amounts, discounted)))
+
+    def test_proportional_to_line_value(self):
+        self.assertEqual(apportion_discount([30000, 10000], 4000), [27000, 9000])
+
+    def test_no_discount_and_over_discount(self):
+        self.assertEqual(apportion_discount([500, 700], 0), [500, 700])
+        self.assertEqual(apportion_discount([500, 700], 5000), [0, 0])
+
+    def test_tax_is_computed_on_discounted_value(self):
+        category = BatchTaxEngineDifferentialTest.CATEGORIES[0]  # 18%
+        [taxable] = apportion_discount([100000], 10000)
+        batch = compute_batch([taxable], [rate_set_for(category)], [False])
+        self.assertEqual(batch['igst'][0], 16200)
 
-# Create your tests here.
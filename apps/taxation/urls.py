@@ -4,6 +4,7 @@ Taxation URL patterns
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import TaxCategoryViewSet, CalculateCartTaxView, CalculateOrderTaxView
+from .admin_views import GSTReturnView
 
 router = DefaultRouter()
 router.register(r'categories', TaxCategoryViewSet, basename='tax-category')
@@ -12,4 +13,5 @@ urlpatterns = [
     path('', include(router.urls)),
     path('cart/calculate/', CalculateCartTaxView.as_view(), name='calculate-cart-tax'),
     path('order/<uuid:order_id>/breakdown/', CalculateOrderTaxView.as_view(), name='order-tax-breakdown'),
+    path('admin/returns/<str:period>/<str:report>/', GSTReturnView.as_view(), name='gst-return'),
 ]
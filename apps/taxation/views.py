@@ -75,5 +75,5 @@ class CalculateOrderTaxView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        tax_breakdown = TaxCalculationService.calculate_order_tax(order)
+        tax_breakdown = TaxCalculationService.get_order_tax(order)
         return Response(tax_breakdown)
@@ -40,6 +40,24 @@ MSG91_OTP_TEMPLATE_ID = env('MSG91_OTP_TEMPLATE_ID', default='')
 # Frontend URL for order tracking links in SMS
 FRONTEND_URL = env('FRONTEND_URL', default='http://localhost:8000')
 
+# Guest cart / session garbage collection (purge_guest_carts)
+GUEST_CART_RETENTION_DAYS = env.int('GUEST_CART_RETENTION_DAYS', default=30)
+GUEST_CART_PURGE_BATCH_SIZE = env.int('GUEST_CART_PURGE_BATCH_SIZE', default=500)
+
+# Cold archive tier for completed orders (archive_orders)
+ORDER_ARCHIVE_AFTER_DAYS = env.int('ORDER_ARCHIVE_AFTER_DAYS', default=180)
+ORDER_ARCHIVE_BATCH_SIZE = env.int('ORDER_ARCHIVE_BATCH_SIZE', default=200)
+
+# Location verification: offline boundary GeoJSON for reverse geocoding,
+# with Nominatim as fallback for points outside it
+LOCATION_BOUNDARY_FILE = env('LOCATION_BOUNDARY_FILE', default='')
+LOCATION_GEOCODER_FALLBACK = env.bool('LOCATION_GEOCODER_FALLBACK', default=True)
+# Geocode cache cell size: geohash characters (6 = ~1.2km x 0.6km)
+LOCATION_GEOHASH_PRECISION = env.int('LOCATION_GEOHASH_PRECISION', default=6)
+# Location attempt audit log: buffered bulk writes and raw-row retention
+LOCATION_ATTEMPT_FLUSH_BATCH_SIZE = env.int('LOCATION_ATTEMPT_FLUSH_BATCH_SIZE', default=500)
+LOCATION_ATTEMPT_RETENTION_DAYS = env.int('LOCATION_ATTEMPT_RETENTION_DAYS', default=30)
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -194,11 +212,11 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'apps.core.renderers.JSONRenderer',
     ),
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'apps.core.throttling.RedisAnonRateThrottle',
+        'apps.core.throttling.RedisUserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '1000/day',
@@ -258,6 +276,10 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Extra path prefixes where JWTCookieMiddleware skips the access_token cookie
+# (admin, health, static and media are always skipped)
+JWT_COOKIE_SKIP_PATHS = env.list('JWT_COOKIE_SKIP_PATHS', default=[])
+
 # =============================
 # CELERY CONFIGURATION
 # =============================
@@ -285,6 +307,25 @@ CELERY_TASK_ROUTES = {
 CELERY_TASK_ACKS_LATE = True  # Acknowledge tasks after completion (prevents task loss)
 CELERY_TASK_REJECT_ON_WORKER_LOST = True  # Requeue tasks if worker crashes
 
+# Periodic tasks (celery beat)
+CELERY_BEAT_SCHEDULE = {
+    # Safety net for order events whose on-commit kick was lost
+    'relay-order-events': {
+        'task': 'apps.orders.tasks.relay_order_events_async',
+        'schedule': 30.0,
+    },
+    # Drain buffered location attempts
+    'flush-location-attempts': {
+        'task': 'apps.location.tasks.flush_location_attempts_async',
+        'schedule': 15.0,
+    },
+    # Roll up complete days of location attempts and prune old raw rows
+    'location-attempt-retention': {
+        'task': 'apps.location.tasks.location_attempt_retention_async',
+        'schedule': 60.0 * 60,
+    },
+}
+
 # =============================
 # LOGGING CONFIGURATION
 # =============================
@@ -293,12 +334,18 @@ LOGGING = {
     'disable_existing_loggers': False,
     'formatters': {
         'verbose': {
-            'format': '{levelname} {asctime} {module} {message}',
+            'format': '{levelname} {asctime} {module} [{correlation_id}] {message}',
             'style': '{',
         },
     },
+    'filters': {
+        'request_context': {
+            '()': 'apps.core.request_context.RequestContextFilter',
+        },
+    },
     'handlers': {
         'console': {
+            'filters': ['request_context'],
             'level': 'INFO',
             'class': 'logging.StreamHandler',
             'formatter': 'verbose',
@@ -25,12 +25,18 @@ LOGGING = {
     "disable_existing_loggers": False,
     "formatters": {
         "verbose": {
-            "format": "{levelname} {asctime} {module} {message}",
+            "format": "{levelname} {asctime} {module} [{correlation_id}] {message}",
             "style": "{",
         },
     },
+    "filters": {
+        "request_context": {
+            "()": "apps.core.request_context.RequestContextFilter",
+        },
+    },
     "handlers": {
         "console": {
+            "filters": ["request_context"],
             "class": "logging.StreamHandler",
             "formatter": "verbose",
             "level": "INFO",
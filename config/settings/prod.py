@@ -36,15 +36,21 @@ LOGGING = {
     'disable_existing_loggers': False,
     'formatters': {
         'json': {
-            'format': '{"time":"%(asctime)s","level":"%(levelname)s","name":"%(name)s","message":"%(message)s"}',
+            'format': '{"time":"%(asctime)s","level":"%(levelname)s","name":"%(name)s","correlation_id":"%(correlation_id)s","user_id":"%(user_id)s","route":"%(route)s","message":"%(message)s"}',
         },
         'verbose': {
-            'format': '{levelname} {asctime} {module} {message}',
+            'format': '{levelname} {asctime} {module} [{correlation_id}] {message}',
             'style': '{',
         },
     },
+    'filters': {
+        'request_context': {
+            '()': 'apps.core.request_context.RequestContextFilter',
+        },
+    },
     'handlers': {
         'console': {
+            'filters': ['request_context'],
             'class': 'logging.StreamHandler',
             'formatter': 'json',
         },